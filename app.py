@@ -1,24 +1,25 @@
 # app.py
 
 import streamlit as st
-import joblib
-import numpy as np
 import pandas as pd
+from src.models.model_holder import get_serving_artifacts
 
-# Load trained model and preprocessing tools
-model = joblib.load("artifacts/model/model.pkl")
-scaler = joblib.load("artifacts/scaler/minmax_scaler.pkl")
-transaction_encoder = joblib.load("artifacts/encoders/transaction_encoder.pkl")
-furnishing_encoder = joblib.load("artifacts/encoders/furnishing_encoder.pkl")
-possession_encoder = joblib.load("artifacts/encoders/possession_status_encoder.pkl")
+# Trained model and preprocessing tools, cached process-wide by the artifact
+# registry so Streamlit reruns do not reload them
+artifacts = get_serving_artifacts()
+model = artifacts.model
+scaler = artifacts.scaler
+compiled_transaction = artifacts.encoders["Transaction"]
+compiled_furnishing = artifacts.encoders["Furnishing"]
+compiled_possession = artifacts.encoders["Possession_Status"]
 
 # Title
 st.title("Real Estate Price Predictor")
 
 # Input fields
-transaction = st.selectbox("Transaction", transaction_encoder.classes_)
-furnishing = st.selectbox("Furnishing", furnishing_encoder.classes_)
-possession_status = st.selectbox("Possession Status", possession_encoder.classes_)
+transaction = st.selectbox("Transaction", compiled_transaction.classes_)
+furnishing = st.selectbox("Furnishing", compiled_furnishing.classes_)
+possession_status = st.selectbox("Possession Status", compiled_possession.classes_)
 bhk = st.number_input("BHK", min_value=1, max_value=10, value=3)
 bathroom = st.number_input("Bathroom", min_value=0, max_value=10, value=2)
 covered_parking = st.number_input("Covered Parking", min_value=0, max_value=3, value=1)
@@ -29,9 +30,9 @@ price_per_sqft = st.number_input("Price per sqft", min_value=1000, max_value=200
 if st.button("Predict Price"):
 
     # Encode categorical variables
-    transaction_encoded = transaction_encoder.transform([transaction])[0]
-    furnishing_encoded = furnishing_encoder.transform([furnishing])[0]
-    possession_encoded = possession_encoder.transform([possession_status])[0]
+    transaction_encoded = compiled_transaction.encode(transaction)
+    furnishing_encoded = compiled_furnishing.encode(furnishing)
+    possession_encoded = compiled_possession.encode(possession_status)
 
     # Create input DataFrame
     input_data = pd.DataFrame([{
@@ -47,9 +48,10 @@ if st.button("Predict Price"):
     }])
 
     # Apply scaling without feature names to avoid mismatch
-    scaled_values = scaler.transform(input_data[["Total Area", "Price per Sqft"]].values)
-    input_data["Total Area"] = scaled_values[:, 0]
-    input_data["Price per Sqft"] = scaled_values[:, 1]
+    # (column order must match the scaler fit: Price per Sqft, Total Area)
+    scaled_values = scaler.transform(input_data[["Price per Sqft", "Total Area"]].values)
+    input_data["Price per Sqft"] = scaled_values[:, 0]
+    input_data["Total Area"] = scaled_values[:, 1]
 
 
     # Make prediction
@@ -0,0 +1,81 @@
+# benchmarks/bench_backends.py
+# Train time, single-row and batch inference latency, model size and RMSE
+# for each model backend in src/models/backends.py.
+#
+# Features are prepared the way train_model does (label-encoded categoricals,
+# MinMax-scaled continuous columns). Backends whose package is missing are skipped.
+#
+#   python -m benchmarks.bench_backends --backends linear ensemble hist_gb lightgbm
+
+import argparse
+import pickle
+import statistics
+import time
+import numpy as np
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import MinMaxScaler
+from src.config.model_config import CATEGORICAL_COLUMNS, CONTINUOUS_COLUMNS, FEATURE_COLUMNS
+from src.ml_pipeline.processed_data import load_training_data
+from src.models.backends import BACKENDS, fit_params, make_regressor
+
+
+def prepare(data_path: str):
+    df = load_training_data(data_path, columns=FEATURE_COLUMNS + ["Price_INR_Numeric"])
+    df = df.dropna(subset=["Price_INR_Numeric"])
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype(str).astype("category").cat.codes
+    X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    y = df["Price_INR_Numeric"].to_numpy(dtype=np.float64)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    scaled = [FEATURE_COLUMNS.index(col) for col in CONTINUOUS_COLUMNS]
+    scaler = MinMaxScaler().fit(X_train[:, scaled])
+    X_train[:, scaled] = scaler.transform(X_train[:, scaled])
+    X_test[:, scaled] = scaler.transform(X_test[:, scaled])
+    return X_train, X_test, y_train, y_test
+
+
+def latency_ms(model, X, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict(X)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model backends.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = prepare(args.data_path)
+    rng = np.random.default_rng(0)
+    batch = X_test[rng.integers(0, len(X_test), args.batch_size)]
+
+    print(f"{len(X_train)} train / {len(X_test)} test rows\n")
+    print(f"{'backend':<10}{'train (s)':>10}{'1 row (ms)':>12}{f'{args.batch_size} rows (ms)':>16}"
+          f"{'size (KiB)':>12}{'RMSE':>14}")
+    for backend in args.backends:
+        try:
+            model = make_regressor(backend)
+        except ImportError as e:
+            print(f"{backend:<10}  skipped: {e}")
+            continue
+        start = time.perf_counter()
+        model.fit(X_train, y_train, **fit_params(backend))
+        train_seconds = time.perf_counter() - start
+
+        one_row = latency_ms(model, X_test[:1], args.repeat)
+        many_rows = latency_ms(model, batch, max(args.repeat // 10, 5))
+        size_kib = len(pickle.dumps(model)) / 1024
+        rmse = float(np.sqrt(mean_squared_error(y_test, model.predict(X_test))))
+        print(f"{backend:<10}{train_seconds:>10.2f}{one_row:>12.3f}{many_rows:>16.2f}{size_kib:>12.1f}{rmse:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
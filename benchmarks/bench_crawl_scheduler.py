@@ -0,0 +1,62 @@
+# benchmarks/bench_crawl_scheduler.py
+# Pages/min and cards/min of the crawl scheduler against a local stand-in
+# site (several search URLs x paginated infinite-scroll result pages built
+# from saved cards), at growing driver pool sizes.
+#
+# Every pool size gets a fresh scheduler, so driver launches are part of the
+# timing; the chromedriver path is resolved once up front and cached, as it
+# is in production after the first run.
+#
+#   python -m benchmarks.bench_crawl_scheduler --pool-sizes 1 2 4 --searches 4 --pages 3
+
+import argparse
+import os
+import tempfile
+from src.scraping.crawl_scheduler import CrawlScheduler
+from src.scraping.scroll_magicbricks import (
+    CardSink,
+    harvest_property_cards,
+    make_driver,
+    resolve_chromedriver,
+)
+from src.scraping.testing.results_server import build_site, load_saved_cards, serve_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crawl throughput against driver pool size.")
+    parser.add_argument("--html-dir", default="data/raw/html")
+    parser.add_argument("--pool-sizes", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--searches", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--per-page", type=int, default=60)
+    parser.add_argument("--delay-ms", type=int, default=300)
+    parser.add_argument("--host-interval", type=float, default=0.0,
+                        help="politeness delay between loads on the stand-in host")
+    args = parser.parse_args()
+
+    cards = load_saved_cards(args.html_dir)
+    site = build_site(cards, args.searches, args.pages, args.per_page, delay_ms=args.delay_ms)
+    server, base_url = serve_pages(site)
+    urls = [base_url + path for path in site]
+    resolve_chromedriver()
+
+    print(f"{len(urls)} pages x {args.per_page} cards, {len(cards)} saved cards\n")
+    print(f"{'pool':>5}{'seconds':>10}{'pages/min':>12}{'cards/min':>12}{'drivers':>9}{'failed':>8}")
+    try:
+        for size in args.pool_sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                sink = CardSink(os.path.join(tmp, "html"), os.path.join(tmp, "json"))
+
+                def fetch(driver, url):
+                    return harvest_property_cards(url, scroll_limit=10_000, timeout=5, driver=driver, sink=sink)
+
+                with CrawlScheduler(fetch, make_driver, pool_size=size, host_interval=args.host_interval) as scheduler:
+                    stats = scheduler.run(urls)
+            print(f"{size:>5}{stats['seconds']:>10.1f}{stats['pages_per_min']:>12.1f}"
+                  f"{stats['cards_per_min']:>12.0f}{stats['drivers_launched']:>9}{stats['failed']:>8}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_db_writer.py
+# Rows/s writing parsed cards: the old to_sql(if_exists="replace") path vs the
+# chunked multi-row upsert in src/database/bulk_writer.py.
+#
+# Runs against a SQLite file by default; pass --url to target MySQL.
+#
+#   python -m benchmarks.bench_db_writer --scale 50
+#   python -m benchmarks.bench_db_writer --url mysql+pymysql://user:pw@localhost/realestate
+
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from sqlalchemy import create_engine, text
+from src.config.data_config import HTML_DATA_CSV
+from src.database.bulk_writer import keyed_rows, upsert_dataframe
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark to_sql replace vs chunked upserts.")
+    parser.add_argument("--input", default=HTML_DATA_CSV)
+    parser.add_argument("--scale", type=int, default=50, help="replicate the sample crawl this many times")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--url", help="SQLAlchemy URL; defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    raw, _ = keyed_rows(pd.read_csv(args.input))
+    copies = []
+    for i in range(args.scale):
+        copy = raw.copy()
+        copy["listing_id"] = copy["listing_id"].astype(str) + f"-{i}"  # distinct listings per replica
+        copies.append(copy)
+    df = pd.concat(copies, ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        with engine.begin() as conn:
+            for table in ("bench_replace", "bench_upsert"):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+        scenarios = {
+            "to_sql replace": lambda: df.to_sql("bench_replace", engine, if_exists="replace", index=False),
+            "upsert (insert)": lambda: upsert_dataframe(df, "bench_upsert", engine, args.chunk_size),
+            "upsert (update)": lambda: upsert_dataframe(df, "bench_upsert", engine, args.chunk_size),
+        }
+        print(f"{len(df)} rows on {engine.dialect.name}\n")
+        print(f"{'path':<18}{'seconds':>10}{'rows/s':>12}")
+        for name, fn in scenarios.items():
+            elapsed = timed(fn)
+            print(f"{name:<18}{elapsed:>10.2f}{len(df) / elapsed:>12,.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
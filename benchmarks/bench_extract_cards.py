@@ -0,0 +1,78 @@
+# benchmarks/bench_extract_cards.py
+# Cards/sec of the single-pass extractor vs the three-pass flow it replaces,
+# both ending with the html_data and cleaned_property_data frames in memory.
+#
+# Three-pass: BeautifulSoup per card to find the JSON-LD script (as
+# scroll_magicbricks does), extract_json_from_html on str(card) with the
+# JSON written to disk (indent=4), extract_features_from_html, then
+# parse_clean_cards reloading every JSON file. Single pass: extract_card
+# (one lxml tree per card) split into the two frames by listing id.
+#
+#   python -m benchmarks.bench_extract_cards --repeat 3
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from bs4 import BeautifulSoup
+from src.scraping.extract_cards import HTML_COLUMNS, JSON_COLUMNS, extract_card
+from src.scraping.extract_from_html_cards import extract_features_from_html, list_html_cards
+from src.scraping.extract_save_cards import extract_json_from_html
+from src.scraping.parse_clean_cards import load_all_json_files, parse_property_data
+
+
+def three_pass(cards, json_dir):
+    html_records = []
+    for idx, html in enumerate(cards):
+        card = BeautifulSoup(html, "html.parser")
+        card.find("script", type="application/ld+json")
+        json_data = extract_json_from_html(str(card))
+        if json_data:
+            with open(os.path.join(json_dir, f"card_{idx}.json"), "w", encoding="utf-8") as f:
+                json.dump(json_data, f, indent=4)
+        html_records.append(extract_features_from_html(html))
+    return pd.DataFrame(html_records), parse_property_data(load_all_json_files(json_dir))
+
+
+def single_pass(cards):
+    records = [extract_card(html) for html in cards]
+    html_df = pd.DataFrame([{"listing_id": r["listing_id"], **{c: r[c] for c in HTML_COLUMNS}} for r in records])
+    json_df = pd.DataFrame([{"listing_id": r["listing_id"], **{c: r[c] for c in JSON_COLUMNS}}
+                            for r in records if r["has_json_ld"]])
+    return html_df, json_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-pass card extraction.")
+    parser.add_argument("--input-dir", default="data/raw/html")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cards = []
+    for path in list_html_cards(args.input_dir)[:args.limit]:
+        with open(path, encoding="utf-8") as f:
+            cards.append(f.read())
+
+    timings = {"three-pass (bs4 x3 + JSON files)": [], "single pass (lxml)": []}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            old_html, old_json = three_pass(cards, tmp)
+            timings["three-pass (bs4 x3 + JSON files)"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        new_html, new_json = single_pass(cards)
+        timings["single pass (lxml)"].append(time.perf_counter() - start)
+
+    html_same = old_html[HTML_COLUMNS].fillna("").astype(str).equals(new_html[HTML_COLUMNS].fillna("").astype(str))
+    print(f"{len(cards)} cards, best of {args.repeat}; html_data identical: {html_same}, "
+          f"cleaned_property_data rows: {len(old_json)} vs {len(new_json)}\n")
+    print(f"{'flow':<36}{'seconds':>9}{'cards/s':>10}")
+    for flow, seconds in timings.items():
+        print(f"{flow:<36}{min(seconds):>9.2f}{len(cards) / min(seconds):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_fetcher.py
+# Listing-detail fetch + parse throughput against a local stand-in server:
+# one blocking request at a time on a fresh connection (the old scraper's
+# pattern) vs the asyncio fetcher at several concurrency levels on a shared
+# keep-alive pool, and a re-crawl that revalidates a warm response cache.
+#
+# The stand-in serves one detail page per saved card (its JSON-LD plus card
+# markup padded to --page-kb), delays every response by --latency seconds
+# and answers If-None-Match with 304. Every mode parses each page with
+# parse_detail_page. Politeness spacing is off (one local host).
+#
+#   python -m benchmarks.bench_fetcher --pages 300 --latency 0.1 --concurrency 1 8 32
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import urllib.request
+from src.scraping.fetcher import AsyncFetcher, FetchResult, ResponseCache, parse_detail_page
+from src.scraping.testing.results_server import build_detail_site, load_saved_cards, serve_pages
+
+
+def blocking(urls) -> int:
+    records = 0
+    for url in urls:
+        with urllib.request.urlopen(url) as response:
+            result = FetchResult(url, response.status, response.read())
+        records += parse_detail_page(result) is not None
+    return records
+
+
+async def concurrent(urls, concurrency: int, cache=None) -> int:
+    records = 0
+    async with AsyncFetcher(concurrency=concurrency, per_host=concurrency, host_interval=0, cache=cache) as fetcher:
+        async for _, record in fetcher.stream(urls, parse_detail_page):
+            records += record is not None
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the async fetcher against blocking requests.")
+    parser.add_argument("--html-dir", default="data/raw/html")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--page-kb", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds the server waits before answering")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    args = parser.parse_args()
+
+    site = build_detail_site(load_saved_cards(args.html_dir, args.pages), args.page_kb)
+    server, base_url = serve_pages(site, latency=args.latency)
+    urls = [base_url + path for path in site]
+    print(f"{len(urls)} detail pages of ~{args.page_kb} KiB, {args.latency * 1000:.0f} ms server latency\n")
+    print(f"{'mode':<26}{'seconds':>9}{'pages/s':>10}{'records':>9}{'200s':>7}{'304s':>7}")
+
+    def report(mode, run):
+        before = dict(server.counts)
+        start = time.perf_counter()
+        records = run()
+        seconds = time.perf_counter() - start
+        sent = {status: server.counts.get(status, 0) - before.get(status, 0) for status in (200, 304)}
+        print(f"{mode:<26}{seconds:>9.2f}{len(urls) / seconds:>10.1f}{records:>9}{sent[200]:>7}{sent[304]:>7}")
+
+    try:
+        report("blocking, sequential", lambda: blocking(urls))
+        for concurrency in args.concurrency:
+            report(f"async, concurrency {concurrency}", lambda: asyncio.run(concurrent(urls, concurrency)))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "http"))
+            top = max(args.concurrency)
+            report(f"async {top}, cold cache", lambda: asyncio.run(concurrent(urls, top, cache)))
+            report(f"async {top}, warm cache", lambda: asyncio.run(concurrent(urls, top, cache)))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
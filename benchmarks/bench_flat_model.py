@@ -0,0 +1,68 @@
+# benchmarks/bench_flat_model.py
+# Flat (array-walk) tree predictor vs sklearn's predict for the tree backends:
+# parity, load time, and latency across batch sizes.
+#
+# The crossover batch size is what FLAT_MODEL_MAX_BATCH should be set to.
+#
+#   python -m benchmarks.bench_flat_model --backends ensemble --batch-sizes 1 8 64 256 1024
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+from benchmarks.bench_backends import latency_ms, prepare
+from src.models.backends import BACKENDS, fit_params, make_regressor
+from src.models.flat_model import FlatTreeModel, can_flatten, check_parity, export_flat_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flat tree predictor.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["ensemble", "hist_gb"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 64, 256, 1024])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = prepare(args.data_path)
+    rng = np.random.default_rng(0)
+
+    for backend in args.backends:
+        model = make_regressor(backend).fit(X_train, y_train, **fit_params(backend))
+        if not can_flatten(model):
+            print(f"{backend}: skipped, {type(model).__name__} cannot be flattened\n")
+            continue
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "flat_model.bin")
+            pickle_path = os.path.join(tmp, "model.pkl")
+            export_flat_model(model, path)
+            with open(pickle_path, "wb") as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            start = time.perf_counter()
+            flat = FlatTreeModel.load(path)
+            flat_load = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(pickle_path, "rb") as f:
+                pickle.load(f)
+            pickle_load = time.perf_counter() - start
+
+            print(f"{backend}: {len(flat.roots)} trees, {len(flat.value)} nodes, "
+                  f"{os.path.getsize(path) / 1024:.0f} KiB flat vs {os.path.getsize(pickle_path) / 1024:.0f} KiB pickled")
+            print(f"  max relative difference: {check_parity(flat, model, X_test):.2e}")
+            print(f"  load: flat {flat_load * 1000:.2f} ms, pickle {pickle_load * 1000:.2f} ms")
+            print(f"  {'rows':>6}{'sklearn (ms)':>14}{'flat (ms)':>12}{'speedup':>10}")
+            for size in args.batch_sizes:
+                batch = X_test[rng.integers(0, len(X_test), size)]
+                repeat = max(args.repeat // max(size // 64, 1), 5)
+                sk_ms = latency_ms(model, batch, repeat)
+                flat_ms = latency_ms(flat, batch, repeat)
+                print(f"  {size:>6}{sk_ms:>14.3f}{flat_ms:>12.3f}{sk_ms / flat_ms:>9.1f}x")
+            del flat
+        print()
+
+
+if __name__ == "__main__":
+    main()
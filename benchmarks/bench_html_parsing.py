@@ -0,0 +1,47 @@
+# benchmarks/bench_html_parsing.py
+# Throughput of HTML card parsing: html.parser vs lxml, serial vs process pool.
+#
+# Also checks that both extractors produce identical records for every card.
+#
+#   python -m benchmarks.bench_html_parsing --workers 4 --chunk-size 64
+
+import argparse
+import os
+import time
+from src.scraping.extract_from_html_cards import list_html_cards, parse_html_files
+
+
+def time_parse(paths, parser, workers, chunk_size):
+    start = time.perf_counter()
+    records = parse_html_files(paths, parser, workers, chunk_size)
+    return records, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML card parsing.")
+    parser.add_argument("--input-dir", default="data/raw/extracted_html")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    paths = list_html_cards(args.input_dir)
+    print(f"{len(paths)} cards, {args.workers} worker(s), chunk size {args.chunk_size}\n")
+
+    results = {}
+    print(f"{'scenario':<24}{'seconds':>10}{'records/s':>12}")
+    for name in ("html.parser", "lxml"):
+        for workers in sorted({1, args.workers}):
+            label = f"{name} x{workers}"
+            records, elapsed = time_parse(paths, name, workers, args.chunk_size)
+            results[label] = records
+            print(f"{label:<24}{elapsed:>10.3f}{len(paths) / elapsed:>12.1f}")
+
+    baseline = results["html.parser x1"]
+    mismatches = sum(1 for a, b in zip(baseline, results["lxml x1"]) if a != b)
+    print(f"\nlxml vs html.parser record mismatches: {mismatches}")
+    if mismatches:
+        raise SystemExit("Extractors disagree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+
+# benchmarks/bench_import_time.py
+# Startup cost of the serving modules: lazy registry vs loading every artifact up front.
+#
+#   python -m benchmarks.bench_import_time --repeat 5
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = {
+    # what importing the serving modules costs now (nothing is loaded yet)
+    "lazy import": (
+        "import src.models.predict_model, src.utils.preprocess_input"
+    ),
+    # the previous behaviour: every artifact joblib.load-ed during import
+    "eager import (import + warm)": (
+        "import src.models.predict_model, src.utils.preprocess_input\n"
+        "from src.models.model_holder import warm; warm()"
+    ),
+}
+
+TIMER = (
+    "import time, warnings; warnings.filterwarnings('ignore'); t0 = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - t0)"
+)
+
+
+def time_snippet(code: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True, text=True, check=True,
+        )
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serving-module startup cost, lazy vs eager.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<32}{'median (ms)':>14}{'min (ms)':>12}")
+    for name, code in SNIPPETS.items():
+        timings = time_snippet(code, args.repeat)
+        print(f"{name:<32}{statistics.median(timings) * 1000:>14.1f}{min(timings) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
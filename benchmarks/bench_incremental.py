@@ -0,0 +1,89 @@
+# benchmarks/bench_incremental.py
+# Incremental update vs full retrain when a batch of new listings arrives,
+# at growing dataset sizes.
+#
+# The cleaned dataset is resampled (with small jitter on the continuous
+# columns and the target) to each size and written as an append-only CSV.
+# Full retrain = read the whole file + fit encoders, scaler and model from
+# scratch. Incremental = read only the appended rows from the byte offset +
+# update(). Both are scored on the same held-out rows.
+#
+#   python -m benchmarks.bench_incremental --sizes 2000 8000 32000 --new-rows 500
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error
+from src.config.model_config import CATEGORICAL_COLUMNS, CONTINUOUS_COLUMNS, FEATURE_COLUMNS
+from src.ml_pipeline.normalize import TARGET_COLUMN
+from src.models.incremental import (
+    INCREMENTAL_BACKENDS,
+    SCALED_COLUMNS,
+    _features,
+    append_rows,
+    fit_full,
+    read_new_rows,
+    start_position,
+    update,
+)
+
+COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+DTYPE = {col: str for col in CATEGORICAL_COLUMNS}
+
+
+def synthetic(source: pd.DataFrame, n_rows: int, rng) -> pd.DataFrame:
+    df = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+    for col in CONTINUOUS_COLUMNS + [TARGET_COLUMN]:
+        df[col] = df[col] * rng.normal(1.0, 0.02, n_rows)
+    return df
+
+
+def rmse(artifacts, holdout: pd.DataFrame) -> float:
+    X = _features(holdout, artifacts.encoders)
+    X[:, SCALED_COLUMNS] = artifacts.scaler.transform(X[:, SCALED_COLUMNS])
+    return float(np.sqrt(mean_squared_error(holdout[TARGET_COLUMN], artifacts.model.predict(X))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental updates against full retrains.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[2000, 8000, 32000])
+    parser.add_argument("--new-rows", type=int, default=500)
+    parser.add_argument("--backends", nargs="+", choices=INCREMENTAL_BACKENDS, default=list(INCREMENTAL_BACKENDS))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    source = pd.read_csv(args.data_path, usecols=COLUMNS, dtype=DTYPE).dropna()
+    holdout = synthetic(source, 1000, rng)
+
+    print(f"{'backend':<10}{'rows':>8}{'full (s)':>10}{'incr (s)':>10}{'speedup':>9}"
+          f"{'full RMSE':>14}{'incr RMSE':>14}")
+    for backend in args.backends:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "clean_df.csv")
+                append_rows(synthetic(source, size, rng), path)
+                base, position = read_new_rows(path, start_position(path), COLUMNS, DTYPE)
+                artifacts = fit_full(base, backend)
+                append_rows(synthetic(source, args.new_rows, rng), path)
+
+                start = time.perf_counter()
+                new, _ = read_new_rows(path, position, COLUMNS, DTYPE)
+                update(artifacts, new, len(base))
+                incremental_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                everything, _ = read_new_rows(path, start_position(path), COLUMNS, DTYPE)
+                retrained = fit_full(everything, backend)
+                full_seconds = time.perf_counter() - start
+
+                print(f"{backend:<10}{size:>8}{full_seconds:>10.2f}{incremental_seconds:>10.3f}"
+                      f"{full_seconds / incremental_seconds:>8.0f}x"
+                      f"{rmse(retrained, holdout):>14,.0f}{rmse(artifacts, holdout):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
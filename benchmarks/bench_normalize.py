@@ -0,0 +1,110 @@
+# benchmarks/bench_normalize.py
+# Throughput of the vectorized card normalization vs the row-wise apply
+# functions from notebooks/data_cleaning.ipynb, on synthetic scraped columns.
+#
+# The apply baseline is slow, so by default it runs on a subsample and is
+# reported as rows/s like the vectorized path.
+#
+#   python -m benchmarks.bench_normalize --rows 1000000 --apply-rows 100000
+
+import argparse
+import re
+import time
+import numpy as np
+import pandas as pd
+from src.ml_pipeline.normalize import parse_area, parse_price, parse_price_per_sqft, split_parking
+
+
+def synthetic_cards(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    price_unit = rng.choice(["Cr", "Lac"], size=n_rows, p=[0.7, 0.3])
+    price_value = np.where(price_unit == "Cr", rng.uniform(0.3, 5, n_rows), rng.uniform(20, 99, n_rows))
+    area_unit = rng.choice(["sqft", "sqyrd", "sqm"], size=n_rows, p=[0.9, 0.08, 0.02])
+    covered = rng.integers(0, 4, n_rows)
+    open_ = rng.integers(0, 3, n_rows)
+    parking = np.where(open_ > 0,
+                       pd.Series(covered).astype(str) + " Covered, " + pd.Series(open_).astype(str) + " Open",
+                       pd.Series(covered).astype(str) + " Covered")
+    return pd.DataFrame({
+        "Price (INR)": pd.Series(price_value.round(2)).astype(str) + " " + price_unit,
+        "Total Area": pd.Series(rng.integers(300, 5000, n_rows)).astype(str) + " " + area_unit,
+        "Price per Sqft": pd.Series(rng.integers(2000, 20000, n_rows)).astype(str) + " per sqft",
+        "Car Parking": parking,
+    })
+
+
+# --- row-wise baseline, as written in the cleaning notebook ---
+
+def apply_price(price_str):
+    if isinstance(price_str, str):
+        match = re.match(r"([\d.]+)\s*(Cr|Lacs?)", price_str.replace(",", "").strip(), re.IGNORECASE)
+        if match:
+            value, unit = match.groups()
+            return float(value) * (1e7 if unit.lower().startswith("cr") else 1e5)
+    return None
+
+
+def apply_area(area_str):
+    if isinstance(area_str, str):
+        match = re.match(r"([\d.]+)\s*(\w+)", area_str)
+        if match:
+            value, unit = match.groups()
+            return float(value) * {"sqft": 1.0, "sqyrd": 9.0, "sqm": 10.7639}.get(unit, np.nan)
+    return None
+
+
+def apply_parking(value):
+    covered, open_ = 0, 0
+    if isinstance(value, str):
+        for count, kind in re.findall(r"(\d+)\s*(Covered|Open)", value):
+            if kind == "Covered":
+                covered += int(count)
+            else:
+                open_ += int(count)
+    return pd.Series([covered, open_])
+
+
+def run_apply(df: pd.DataFrame):
+    out = pd.DataFrame(index=df.index)
+    out["price"] = df["Price (INR)"].apply(apply_price)
+    out["area"] = df["Total Area"].apply(apply_area)
+    out["ppsf"] = df["Price per Sqft"].str.extract(r"(\d+)", expand=False).astype(float)
+    out[["Covered_parking", "Open_parking"]] = df["Car Parking"].apply(apply_parking)
+    return out
+
+
+def run_vectorized(df: pd.DataFrame):
+    out = pd.DataFrame(index=df.index)
+    out["price"] = parse_price(df["Price (INR)"])
+    out["area"] = parse_area(df["Total Area"])
+    out["ppsf"] = parse_price_per_sqft(df["Price per Sqft"])
+    out[["Covered_parking", "Open_parking"]] = split_parking(df["Car Parking"])
+    return out
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized vs row-wise card normalization.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--apply-rows", type=int, default=100_000, help="rows for the slow apply baseline")
+    args = parser.parse_args()
+
+    df = synthetic_cards(args.rows)
+    sample = df.head(args.apply_rows)
+
+    expected, apply_seconds = timed(run_apply, sample)
+    actual, vector_seconds = timed(run_vectorized, df)
+    assert np.allclose(actual.head(len(sample)).to_numpy(float), expected.to_numpy(float), equal_nan=True)
+
+    print(f"{'path':<14}{'rows':>10}{'seconds':>10}{'rows/s':>14}")
+    print(f"{'apply':<14}{len(sample):>10}{apply_seconds:>10.2f}{len(sample) / apply_seconds:>14,.0f}")
+    print(f"{'vectorized':<14}{len(df):>10}{vector_seconds:>10.2f}{len(df) / vector_seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
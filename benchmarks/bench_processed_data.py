@@ -0,0 +1,81 @@
+# benchmarks/bench_processed_data.py
+# Load time and memory of the training columns: raw CSV + string conversion
+# vs the typed, column-projected Parquet dataset.
+#
+# The sample crawl is replicated --scale times; each scenario runs in a fresh
+# interpreter and reports resident memory growth over the post-import baseline
+# (Linux, via /proc/self/statm).
+#
+#   python -m benchmarks.bench_processed_data --scale 200
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+from src.config.data_config import HTML_DATA_CSV
+from src.ml_pipeline.processed_data import normalize_cards, write_processed_dataset
+
+TRAINING_COLUMNS = ["Transaction", "Furnishing", "Bathroom", "Price per Sqft", "Total Area",
+                    "Covered_parking", "Open_parking", "Possession_Status", "BHK", "Price_INR_Numeric"]
+
+SNIPPETS = {
+    # the current path: every consumer re-reads the strings and re-converts them
+    "csv + convert": (
+        "import pandas as pd\n"
+        "from src.ml_pipeline.processed_data import normalize_cards\n"
+        "df = normalize_cards(pd.read_csv({csv!r}, dtype=str))[{columns!r}]\n"
+    ),
+    "parquet (all columns)": (
+        "from src.ml_pipeline.processed_data import load_processed_data\n"
+        "df = load_processed_data({root!r})\n"
+    ),
+    "parquet (projected)": (
+        "from src.ml_pipeline.processed_data import load_processed_data\n"
+        "df = load_processed_data({root!r}, columns={columns!r})\n"
+    ),
+}
+
+RUNNER = (
+    "import os, time\n"
+    "import pandas, pyarrow.dataset, src.ml_pipeline.processed_data\n"
+    "rss = lambda: int(open('/proc/self/statm').read().split()[1]) * os.sysconf('SC_PAGE_SIZE')\n"
+    "base = rss()\n"
+    "t0 = time.perf_counter()\n"
+    "{body}"
+    "elapsed = time.perf_counter() - t0\n"
+    "print(elapsed, rss() - base, df.memory_usage(deep=True).sum(), len(df))\n"
+)
+
+
+def run(snippet: str) -> tuple:
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True).stdout
+    elapsed, rss_bytes, frame_bytes, rows = out.split()
+    return float(elapsed), int(rss_bytes) / 2**20, int(frame_bytes) / 2**20, int(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV vs Parquet loading of the training columns.")
+    parser.add_argument("--input", default=HTML_DATA_CSV)
+    parser.add_argument("--scale", type=int, default=100, help="replicate the sample crawl this many times")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = pd.read_csv(args.input, dtype=str)
+        raw = pd.concat([raw] * args.scale, ignore_index=True)
+        csv_path = os.path.join(tmp, "html_data.csv")
+        root = os.path.join(tmp, "properties")
+        raw.to_csv(csv_path, index=False)
+        write_processed_dataset(normalize_cards(raw), root, crawl_date="2024-01-01")
+
+        print(f"{len(raw)} rows; CSV {os.path.getsize(csv_path) / 2**20:.1f} MiB\n")
+        print(f"{'scenario':<24}{'seconds':>10}{'RSS growth (MiB)':>18}{'frame (MiB)':>13}")
+        for name, body in SNIPPETS.items():
+            body = body.format(csv=csv_path, root=root, columns=TRAINING_COLUMNS)
+            elapsed, rss, frame, _ = run(RUNNER.format(body=body))
+            print(f"{name:<24}{elapsed:>10.3f}{rss:>18.1f}{frame:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_raw_store.py
+# Per-card files vs the sharded raw card store at crawl volume: write,
+# sequential read (what the parse stages do), random access by listing id,
+# and disk footprint (files = inodes, allocated bytes).
+#
+# The saved cards are replicated --copies times (each copy under new
+# listing ids) to reach a realistic volume. Per-card files are written the
+# way extract_save_cards does (card_<n>.html + card_<n>.json, indent=4) and
+# read back with os.listdir + open/read per file. Page cache is warm for
+# both.
+#
+#   python -m benchmarks.bench_raw_store --copies 20
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from src.scraping.raw_store import RawCardStore, _numbered_files
+
+
+def footprint(directory: str) -> tuple:
+    files, allocated = 0, 0
+    for base, _, names in os.walk(directory):
+        for name in names:
+            files += 1
+            allocated += os.stat(os.path.join(base, name)).st_blocks * 512
+    return files, allocated
+
+
+def load_cards(html_dir: str, json_dir: str) -> list:
+    html_files, json_files = _numbered_files(html_dir), _numbered_files(json_dir)
+    cards = []
+    for n in sorted(html_files):
+        with open(html_files[n], encoding="utf-8") as f:
+            html = f.read()
+        json_ld = None
+        if n in json_files:
+            with open(json_files[n], encoding="utf-8") as f:
+                json_ld = json.load(f)
+        cards.append((html, json_ld))
+    return cards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the raw card store against per-card files.")
+    parser.add_argument("--html-dir", default="data/raw/html")
+    parser.add_argument("--json-dir", default="data/raw/json")
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--codec", default="gzip")
+    args = parser.parse_args()
+
+    base = load_cards(args.html_dir, args.json_dir)
+    cards = [(f"{copy:04d}{n:08d}", html, json_ld) for copy in range(args.copies)
+             for n, (html, json_ld) in enumerate(base)]
+    rng = random.Random(0)
+    lookups = rng.sample(range(len(cards)), min(args.lookups, len(cards)))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        html_dir, json_dir = os.path.join(tmp, "html"), os.path.join(tmp, "json")
+        os.makedirs(html_dir)
+        os.makedirs(json_dir)
+        start = time.perf_counter()
+        for n, (_, html, json_ld) in enumerate(cards):
+            with open(os.path.join(html_dir, f"card_{n}.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+            if json_ld is not None:
+                with open(os.path.join(json_dir, f"card_{n}.json"), "w", encoding="utf-8") as f:
+                    json.dump(json_ld, f, indent=4)
+        write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read = 0
+        for directory in (html_dir, json_dir):
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    data = f.read()
+                if name.endswith(".json"):
+                    json.loads(data)
+                read += 1
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for n in lookups:
+            with open(os.path.join(html_dir, f"card_{n}.html"), encoding="utf-8") as f:
+                f.read()
+        lookup = time.perf_counter() - start
+        results["per-card files"] = (write, scan, lookup, *footprint(tmp))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with RawCardStore(tmp, args.codec) as store:
+            for key, html, json_ld in cards:
+                store.append_card(html, json_ld, listing_id=key)
+        write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read = sum(1 for _ in RawCardStore(tmp).scan())
+        scan = time.perf_counter() - start
+
+        store = RawCardStore(tmp)
+        start = time.perf_counter()
+        for n in lookups:
+            store.get(cards[n][0])
+        lookup = time.perf_counter() - start
+        results[f"store ({args.codec})"] = (write, scan, lookup, *footprint(tmp))
+        assert read == len(cards)
+
+    print(f"{len(cards)} cards ({args.copies} x {len(base)}), {len(lookups)} random lookups\n")
+    print(f"{'layout':<18}{'write (s)':>10}{'scan (s)':>10}{'lookup (ms)':>13}{'files':>8}{'on disk (MiB)':>15}")
+    for layout, (write, scan, lookup, files, allocated) in results.items():
+        print(f"{layout:<18}{write:>10.2f}{scan:>10.2f}{lookup / len(lookups) * 1000:>13.3f}"
+              f"{files:>8}{allocated / 2**20:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
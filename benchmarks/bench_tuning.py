@@ -0,0 +1,47 @@
+# benchmarks/bench_tuning.py
+# Wall-clock time vs achieved RMSE for each ensemble tuning strategy
+# (untuned, exhaustive grid, randomized, successive halving).
+#
+# Every strategy starts from an empty fit cache; --rerun repeats the whole
+# comparison on the warm cache to show what fold caching saves.
+#
+#   python -m benchmarks.bench_tuning --n-jobs 4 --budget 10 --rerun
+
+import argparse
+import tempfile
+from sklearn.model_selection import train_test_split
+from src.config.model_config import FEATURE_COLUMNS
+from src.ml_pipeline.processed_data import load_training_data
+from src.models.tuning import STRATEGIES, compare_strategies
+
+
+def print_report(title: str, report: list):
+    print(f"\n{title}")
+    print(f"{'strategy':<10}{'fits':>6}{'seconds':>10}{'CV RMSE':>14}{'test RMSE':>14}")
+    for row in report:
+        cv_rmse = f"{row['cv_rmse']:,.0f}" if row["cv_rmse"] is not None else "-"
+        print(f"{row['strategy']:<10}{row['n_fits']:>6}{row['seconds']:>10.1f}{cv_rmse:>14}{row['test_rmse']:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ensemble tuning strategies.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--budget", type=int, default=10)
+    parser.add_argument("--rerun", action="store_true", help="repeat with the fit cache warm")
+    args = parser.parse_args()
+
+    df = load_training_data(args.data_path, columns=FEATURE_COLUMNS + ["Price_INR_Numeric"])
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[FEATURE_COLUMNS], df["Price_INR_Numeric"], test_size=0.2, random_state=42)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        options = dict(strategies=args.strategies, n_jobs=args.n_jobs, budget=args.budget, cache_dir=cache_dir)
+        print_report("cold cache", compare_strategies(X_train, y_train, X_test, y_test, **options))
+        if args.rerun:
+            print_report("warm cache", compare_strategies(X_train, y_train, X_test, y_test, **options))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_worker_memory.py
+# Per-worker memory of the serving model with N workers alive at once:
+# private joblib.load copies vs mmap_mode="r" vs the memory-mapped flat export.
+#
+# Each mode starts --workers interpreters that load the model the way
+# load_bundle does and score one row, then wait. While they are all alive
+# the parent reads /proc/<pid>/smaps_rollup (Linux) and reports, above an
+# interpreter that imported the same modules but loaded nothing:
+#   unique (USS)  Private_Clean + Private_Dirty, what the worker alone costs
+#   PSS           its share of pages it maps together with the other workers
+#
+#   python -m benchmarks.bench_worker_memory --workers 4
+#   python -m benchmarks.bench_worker_memory --fit-ensemble 300   # demo on a fitted tree ensemble
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from src.config.model_config import FLAT_MODEL_PATH, MODEL_PATH
+
+MODES = {
+    "baseline": "model = None\n",
+    "joblib.load": "model = joblib.load({model!r})\n",
+    "mmap_mode=r": "model = mmap_load({model!r})\n",
+    "flat only": "model = FlatTreeModel.load({flat!r})\n",
+}
+
+WORKER = (
+    "import sys, warnings; warnings.filterwarnings('ignore')\n"
+    "import joblib, numpy as np, sklearn.ensemble, sklearn.linear_model\n"
+    "from src.models.flat_model import FlatTreeModel\n"
+    "from src.models.registry import mmap_load\n"
+    "{body}"
+    "if model is not None:\n"
+    "    model.predict(np.zeros((1, {n_features})))\n"
+    "print('ready', flush=True)\n"
+    "sys.stdin.read()\n"
+)
+
+
+def smaps_rollup(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        next(f)
+        for line in f:
+            name, value = line.split(":", 1)
+            fields[name] = int(value.split()[0])
+    return fields
+
+
+def measure(code: str, workers: int) -> tuple:
+    """
+    Median (USS, PSS, RSS) in KiB over `workers` concurrent processes.
+    """
+    procs = [subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE,
+                              stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+    try:
+        for proc in procs:
+            if proc.stdout.readline().strip() != "ready":
+                raise RuntimeError("worker failed to load the model")
+        stats = [smaps_rollup(proc.pid) for proc in procs]
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    uss = statistics.median(s["Private_Clean"] + s["Private_Dirty"] for s in stats)
+    pss = statistics.median(s["Pss"] for s in stats)
+    rss = statistics.median(s["Rss"] for s in stats)
+    return uss, pss, rss
+
+
+def fit_ensemble(n_trees: int, directory: str) -> tuple:
+    from benchmarks.bench_backends import prepare
+    from src.models.flat_model import export_flat_model
+    from src.models.registry import publish_artifact
+    from src.models.tuning import build_ensemble
+
+    X_train, _, y_train, _ = prepare("notebooks/data/processed/clean_df.csv")
+    model = build_ensemble(rf_n_estimators=n_trees).fit(X_train, y_train)
+    model_path = os.path.join(directory, "model.pkl")
+    flat_path = os.path.join(directory, "flat_model.bin")
+    publish_artifact(model, model_path)
+    export_flat_model(model, flat_path)
+    return model_path, flat_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-worker memory of the serving model.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--flat", default=FLAT_MODEL_PATH)
+    parser.add_argument("--fit-ensemble", type=int, default=0, metavar="N_TREES",
+                        help="fit a voting ensemble with this many forest trees and measure it instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.fit_ensemble:
+            args.model, args.flat = fit_ensemble(args.fit_ensemble, tmp)
+
+        print(f"{args.model}: {os.path.getsize(args.model) / 2**20:.1f} MiB, {args.workers} workers\n")
+        print(f"{'mode':<14}{'unique (MiB)':>14}{'PSS (MiB)':>12}{'RSS (MiB)':>12}")
+        base = None
+        for mode, body in MODES.items():
+            if mode == "flat only" and not os.path.exists(args.flat):
+                print(f"{mode:<14}  skipped: no flat export at {args.flat}")
+                continue
+            code = WORKER.format(body=body.format(model=args.model, flat=args.flat), n_features=9)
+            uss, pss, rss = measure(code, args.workers)
+            if base is None:
+                base = (uss, pss, rss)
+                continue
+            print(f"{mode:<14}" + "".join(f"{(value - b) / 1024:>{width}.1f}"
+                                          for value, b, width in zip((uss, pss, rss), base, (14, 12, 12))))
+
+
+if __name__ == "__main__":
+    main()
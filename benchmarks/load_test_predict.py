@@ -0,0 +1,109 @@
+
+# benchmarks/load_test_predict.py
+# Load test for POST /predict with micro-batching off vs on.
+#
+# Starts a uvicorn server per scenario (or targets --url), fires --requests
+# concurrent single-row requests and reports p50/p99 latency and throughput.
+#
+#   python -m benchmarks.load_test_predict --requests 2000 --concurrency 64
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+ROW = {
+    "Transaction": "1", "Furnishing": "2", "Bathroom": 2,
+    "Price_per_Sqft": 6500.0, "Total_Area": 1200.0,
+    "Covered_parking": 1, "Open_parking": 0,
+    "Possession_Status": "0", "BHK": 3,
+}
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(f"{url}/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready in {timeout}s")
+
+
+async def run_load(url: str, n_requests: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await wait_ready(client, url)
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await client.post(f"{url}/predict", json=ROW)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "throughput_rps": n_requests / elapsed,
+    }
+
+
+def start_server(port: int, batching: bool, max_size: int, max_wait_ms: float) -> subprocess.Popen:
+    env = dict(os.environ,
+               MICROBATCH_ENABLED="true" if batching else "false",
+               MICROBATCH_MAX_SIZE=str(max_size),
+               MICROBATCH_MAX_WAIT_MS=str(max_wait_ms),
+               ARTIFACT_POLL_SECONDS="0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /predict with micro-batching off vs on.")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.url:
+        scenarios = {args.url: None}
+    else:
+        scenarios = {"batching off": False, "batching on": True}
+
+    print(f"{'scenario':<16}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>10}")
+    for name, batching in scenarios.items():
+        server = None
+        url = args.url
+        if batching is not None:
+            server = start_server(args.port, batching, args.max_batch_size, args.max_wait_ms)
+            url = f"http://127.0.0.1:{args.port}"
+        try:
+            stats = asyncio.run(run_load(url, args.requests, args.concurrency))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        print(f"{name:<16}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['throughput_rps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
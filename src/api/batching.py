@@ -0,0 +1,80 @@
+# src/api/batching.py
+import asyncio
+from src.config.model_config import MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS
+from src.models.encoding import UnseenCategoryError
+from src.models.predict_model import predict_records
+from src.models.schemas import PropertyFeatures
+from src.utils.logger import logger
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent /predict calls into one vectorized prediction.
+
+    Handlers put (features, future) pairs on an asyncio queue. A single
+    consumer collects up to `max_batch_size` items or waits at most
+    `max_wait_ms` after the first one, scores the batch on a worker thread
+    and resolves each handler's future with its own row.
+    """
+
+    def __init__(self, max_batch_size: int = MICROBATCH_MAX_SIZE,
+                 max_wait_ms: float = MICROBATCH_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Micro-batching on (max {self.max_batch_size} rows / {self.max_wait * 1000:.1f} ms)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, data: PropertyFeatures) -> float:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((data, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            records = [data for data, _ in batch]
+            try:
+                predictions, errors = await asyncio.to_thread(predict_records, records)
+            except Exception as e:
+                logger.exception("Micro-batch prediction failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            failed = {err["index"]: err for err in errors}
+            for i, (_, future) in enumerate(batch):
+                if future.done():  # handler went away (client disconnected)
+                    continue
+                if i in failed:
+                    future.set_exception(UnseenCategoryError(failed[i]["field"], failed[i]["value"]))
+                else:
+                    future.set_result(predictions[i])
@@ -1,24 +1,123 @@
 # src/api/main.py
-from fastapi import FastAPI
-from src.models.schemas import PropertyFeatures
-from src.models.predict_model import predict_price
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import List, Union
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from src.models.schemas import PropertyFeatures, PropertyColumns
+from src.models.predict_model import predict_price, predict_price_batch, records_to_columns
+from src.models.encoding import UnseenCategoryError
+from src.models.model_holder import holder, warm, refresh, BundleValidationError
+from src.models.prediction_cache import prediction_cache
+from src.api.batching import MicroBatcher
+from src.config.model_config import ARTIFACT_POLL_SECONDS, MICROBATCH_ENABLED
 from src.utils.logger import logger
-from src.models.train_model_ensemble import train_ensemble_model
 
-app = FastAPI(title="Real Estate Price Predictor")
+
+async def warm_artifacts(app: FastAPI):
+    try:
+        await asyncio.to_thread(warm)
+        app.state.ready = True
+        logger.info("MODEL WARMED, SERVER READY...")
+    except Exception:
+        logger.exception("Failed to load serving artifacts")
+
+
+async def poll_artifacts(app: FastAPI):
+    # Pick up artifacts published by the training job without a restart;
+    # until the first load succeeds, retry the warm-up instead
+    while True:
+        await asyncio.sleep(ARTIFACT_POLL_SECONDS)
+        if not app.state.ready:
+            await warm_artifacts(app)
+            continue
+        try:
+            await asyncio.to_thread(refresh)
+        except Exception:
+            logger.exception("Artifact refresh failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the prebuilt model in the background; /ready goes green once it is warm.
+    # Training is a separate job: python -m src.models.train_model_ensemble --publish
+    app.state.ready = False
+    app.state.batcher = MicroBatcher() if MICROBATCH_ENABLED else None
+    if app.state.batcher is not None:
+        await app.state.batcher.start()
+    tasks = [asyncio.create_task(warm_artifacts(app))]
+    if ARTIFACT_POLL_SECONDS > 0:
+        tasks.append(asyncio.create_task(poll_artifacts(app)))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+
+app = FastAPI(title="Real Estate Price Predictor", lifespan=lifespan)
 
 @app.get("/")
 def read_root():
     return {"message": "Real Estate Price Predictor is live. Use /docs to interact."}
 
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    if not app.state.ready:
+        raise HTTPException(status_code=503, detail="Model is still loading")
+    return {"status": "ready"}
+
+@app.get("/model")
+def model_info():
+    if not holder.loaded:
+        raise HTTPException(status_code=503, detail="Model is still loading")
+    return holder.current.info()
+
+@app.get("/cache")
+def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@app.post("/admin/reload")
+async def admin_reload():
+    # Load + validate in a worker thread; /predict keeps using the old bundle meanwhile
+    logger.info("MODEL RELOAD REQUESTED...")
+    try:
+        bundle = await asyncio.to_thread(holder.reload, True)
+    except BundleValidationError as e:
+        raise HTTPException(status_code=409, detail=f"New model rejected: {e}")
+    except Exception as e:
+        logger.exception("Model reload failed")
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+    app.state.ready = True
+    return bundle.info()
+
 @app.post("/predict")
-def predict(data: PropertyFeatures):
+async def predict(data: PropertyFeatures):
     logger.info("MODEL PREDICT STARTED...")
-    prediction = predict_price(data)
+    try:
+        if app.state.batcher is not None:
+            prediction = await app.state.batcher.submit(data)
+        else:
+            prediction = await run_in_threadpool(predict_price, data)
+    except UnseenCategoryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     logger.info("MODEL PREDICT COMPLETED...")
     return {"predicted_price": prediction}
 
-train_ensemble_model()
+@app.post("/predict/batch")
+def predict_batch(data: Union[List[PropertyFeatures], PropertyColumns]):
+    columns = records_to_columns(data) if isinstance(data, list) else dict(data)
+    logger.info(f"BATCH PREDICT STARTED for {len(columns['Transaction'])} rows...")
+    predictions, errors = predict_price_batch(columns)
+    logger.info(f"BATCH PREDICT COMPLETED with {len(errors)} row errors...")
+    return {"predicted_prices": predictions, "errors": errors}
 
 # DO NOT place any route inside a function or block like `if __name__ == "__main__"`
 # DO NOT place `logger.info(...)` at the module level if it's unrelated to startup
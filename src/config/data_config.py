@@ -0,0 +1,13 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Raw card fields as written by src/scraping/extract_from_html_cards.py
+# (or, with listing_id, by the single-pass src/scraping/extract_cards.py)
+HTML_DATA_CSV = os.getenv("HTML_DATA_CSV", "data/processed/html_data.csv")
+
+# Typed Parquet dataset, partitioned by crawl_date / city
+PROCESSED_DATASET_DIR = os.getenv("PROCESSED_DATASET_DIR", "data/processed/properties")
+PARTITION_COLUMNS = ["crawl_date", "city"]
@@ -12,6 +12,19 @@ DB_PORT = os.getenv("DB_PORT")
 DB_NAME=os.getenv("DB_NAME")
 
 
-SQLALCHEMY_DATABASE_URL = (
-     f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
\ No newline at end of file
+# One driver everywhere (PyMySQL supports server-side cursors for streaming
+# reads); DATABASE_URL overrides it, e.g. sqlite:///data/local.db for tests.
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+)
+
+# Connection pool shared by every engine user in the process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Rows per DataFrame chunk in src/database/data_loader.iter_table_chunks
+DB_READ_CHUNK_SIZE = int(os.getenv("DB_READ_CHUNK_SIZE", "50000"))
+# Rows per INSERT/LOAD DATA statement in src/database/bulk_writer.py
+DB_WRITE_CHUNK_SIZE = int(os.getenv("DB_WRITE_CHUNK_SIZE", "5000"))
@@ -0,0 +1,96 @@
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Model column order and the PropertyFeatures field feeding each column
+FEATURE_FIELDS = {
+    "Transaction": "Transaction",
+    "Furnishing": "Furnishing",
+    "Bathroom": "Bathroom",
+    "Price per Sqft": "Price_per_Sqft",
+    "Total Area": "Total_Area",
+    "Covered_parking": "Covered_parking",
+    "Open_parking": "Open_parking",
+    "Possession_Status": "Possession_Status",
+    "BHK": "BHK",
+}
+FEATURE_COLUMNS = list(FEATURE_FIELDS)
+CATEGORICAL_COLUMNS = ["Transaction", "Furnishing", "Possession_Status"]
+
+# Continuous columns in the order the scaler was fitted on
+CONTINUOUS_COLUMNS = ["Price per Sqft", "Total Area"]
+
+# What to do with a category the encoders never saw during training:
+#   "error"         -> reject the row
+#   "unknown"       -> map it to UNKNOWN_CATEGORY_CODE
+#   "most_frequent" -> map it to the most frequent training category
+UNSEEN_CATEGORY_POLICY = os.getenv("UNSEEN_CATEGORY_POLICY", "error")
+UNKNOWN_CATEGORY_CODE = int(os.getenv("UNKNOWN_CATEGORY_CODE", "-1"))
+
+# Serving artifacts (written by src/models/train_model.py)
+MODEL_PATH = os.getenv("MODEL_PATH", "artifacts/model/model.pkl")
+SCALER_PATH = "artifacts/scaler/minmax_scaler.pkl"
+ENCODER_PATHS = {
+    "Transaction": "artifacts/encoders/transaction_encoder.pkl",
+    "Furnishing": "artifacts/encoders/furnishing_encoder.pkl",
+    "Possession_Status": "artifacts/encoders/possession_status_encoder.pkl",
+}
+CATEGORY_COUNTS_PATH = "artifacts/encoders/category_counts.json"
+# Written last by every trainer: one version id plus the digest of each
+# serving artifact, so a half-published bundle is never loaded
+MANIFEST_PATH = "artifacts/model/manifest.json"
+
+# Linear model with the MinMaxScaler folded into its coefficients
+FUSED_MODEL_PATH = "artifacts/model/fused_model.npz"
+
+# Tree/ensemble models flattened into one memory-mappable array file
+FLAT_MODEL_PATH = "artifacts/model/flat_model.bin"
+# Batches larger than this go through model.predict, whose per-tree loop
+# overtakes the all-trees-at-once flat walk at a few hundred rows
+FLAT_MODEL_MAX_BATCH = int(os.getenv("FLAT_MODEL_MAX_BATCH", "256"))
+
+# Load model.pkl with joblib mmap_mode="r": its numpy arrays are mapped from
+# the page cache and shared by every API/Streamlit worker on the host.
+# sklearn copies tree nodes on unpickling, so tree models only share fully
+# with FLAT_MODEL_ONLY, which serves the memory-mapped flat export and drops
+# the pickled model once the export is verified to match it.
+MODEL_MMAP = os.getenv("MODEL_MMAP", "true").lower() in ("1", "true", "yes")
+FLAT_MODEL_ONLY = os.getenv("FLAT_MODEL_ONLY", "false").lower() in ("1", "true", "yes")
+
+# Incremental retraining (src/models/incremental.py): ingestion watermark and
+# counters of the full-retrain policy. A full retrain is forced after
+# INCREMENTAL_MAX_UPDATES updates, or once the rows added since the last full
+# retrain exceed INCREMENTAL_MAX_GROWTH times the rows it was trained on
+INCREMENTAL_STATE_PATH = "artifacts/model/incremental_state.json"
+INCREMENTAL_MAX_UPDATES = int(os.getenv("INCREMENTAL_MAX_UPDATES", "20"))
+INCREMENTAL_MAX_GROWTH = float(os.getenv("INCREMENTAL_MAX_GROWTH", "1.0"))
+
+# How the artifact registry decides a file changed: "mtime" (mtime + size)
+# or "hash" (also compare a sha256 of the content before reloading)
+ARTIFACT_FINGERPRINT = os.getenv("ARTIFACT_FINGERPRINT", "mtime")
+
+# Seconds between background checks for newly published artifacts (0 disables)
+ARTIFACT_POLL_SECONDS = float(os.getenv("ARTIFACT_POLL_SECONDS", "30"))
+
+# Opt-in micro-batching of /predict: requests are coalesced for up to
+# MICROBATCH_MAX_SIZE rows or MICROBATCH_MAX_WAIT_MS milliseconds
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "5"))
+
+# In-process LRU cache of predictions (size 0 disables it). Total_Area and
+# Price_per_Sqft can be bucketed to the given step so near-identical
+# listings share an entry (0 keeps exact values).
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600"))
+PREDICTION_CACHE_AREA_STEP = float(os.getenv("PREDICTION_CACHE_AREA_STEP", "0"))
+PREDICTION_CACHE_PPSF_STEP = float(os.getenv("PREDICTION_CACHE_PPSF_STEP", "0"))
+# Optional SQLite file shared by all workers on the host ("" disables it)
+PREDICTION_CACHE_SQLITE_PATH = os.getenv("PREDICTION_CACHE_SQLITE_PATH", "")
+# The shared file is pruned of expired and other-version rows every
+# PRUNE_EVERY writes (per worker) and capped at MAX_ROWS, oldest first
+PREDICTION_CACHE_SQLITE_MAX_ROWS = int(os.getenv("PREDICTION_CACHE_SQLITE_MAX_ROWS", "100000"))
+PREDICTION_CACHE_SQLITE_PRUNE_EVERY = int(os.getenv("PREDICTION_CACHE_SQLITE_PRUNE_EVERY", "1000"))
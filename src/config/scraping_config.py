@@ -0,0 +1,44 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# chromedriver binary: an explicit path wins; otherwise the path
+# webdriver_manager resolved on the first run is cached here and reused
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")
+CHROMEDRIVER_CACHE_PATH = os.getenv("CHROMEDRIVER_CACHE_PATH", "data/cache/chromedriver.json")
+
+# Crawl scheduler (src/scraping/crawl_scheduler.py): headless drivers kept
+# alive and shared by the workers, minimum seconds between two page loads on
+# the same host, and retries (with exponential backoff) per page
+CRAWL_POOL_SIZE = int(os.getenv("CRAWL_POOL_SIZE", "2"))
+CRAWL_HOST_INTERVAL_SECONDS = float(os.getenv("CRAWL_HOST_INTERVAL_SECONDS", "2"))
+CRAWL_MAX_RETRIES = int(os.getenv("CRAWL_MAX_RETRIES", "3"))
+CRAWL_BACKOFF_SECONDS = float(os.getenv("CRAWL_BACKOFF_SECONDS", "2"))
+
+SCRAPER_USER_AGENT = os.getenv(
+    "SCRAPER_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/114.0.5735.199 Safari/537.36",
+)
+
+# Async HTTP fetcher (src/scraping/fetcher.py) for pages that need no
+# browser: requests in flight overall and per host on the shared keep-alive
+# pool, minimum seconds between request starts on one host, and the on-disk
+# cache of bodies + ETag/Last-Modified used for conditional re-fetches.
+# Retries use CRAWL_MAX_RETRIES / CRAWL_BACKOFF_SECONDS.
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "16"))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "8"))
+FETCH_HOST_INTERVAL_SECONDS = float(os.getenv("FETCH_HOST_INTERVAL_SECONDS", "0.25"))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "30"))
+FETCH_CACHE_DIR = os.getenv("FETCH_CACHE_DIR", "data/cache/http")
+
+# Raw card store (src/scraping/raw_store.py): cards appended to compressed
+# shard files of at most RAW_STORE_SHARD_MB, in independently compressed
+# blocks of ~RAW_STORE_BLOCK_KB uncompressed JSONL. "gzip" needs nothing
+# extra; "zstd" needs the zstandard package.
+RAW_STORE_DIR = os.getenv("RAW_STORE_DIR", "data/raw/cards")
+RAW_STORE_CODEC = os.getenv("RAW_STORE_CODEC", "gzip")
+RAW_STORE_SHARD_MB = int(os.getenv("RAW_STORE_SHARD_MB", "64"))
+RAW_STORE_BLOCK_KB = int(os.getenv("RAW_STORE_BLOCK_KB", "256"))
@@ -0,0 +1,216 @@
+import csv
+import os
+import re
+import tempfile
+import pandas as pd
+from sqlalchemy import BigInteger, Column, Float, Index, MetaData, String, Table, Text, inspect, text
+from sqlalchemy.dialects import mysql, sqlite
+from src.config.db_config import DB_WRITE_CHUNK_SIZE
+from src.database.connection import get_engine
+from src.utils.logger import logger
+
+KEY_COLUMN = "listing_id"
+
+# Columns the dashboards and data_loader filter on
+DEFAULT_INDEXES = ["Transaction", "Furnishing", "Society", "locality", "region"]
+
+_LISTING_ID = re.compile(r"[?&]id=([0-9A-Za-z]+)")
+
+
+def listing_id_from_url(url):
+    """
+    ".../propertyDetails/3-BHK-...-in-Hyderabad&id=4d4238..." -> "4d4238...".
+    """
+    if not isinstance(url, str):
+        return None
+    match = _LISTING_ID.search(url)
+    return match.group(1) if match else None
+
+
+def with_listing_id(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the upsert key: the JSON-LD listing id the card extractors emit as
+    listing_id, filled from the listing `url` where that is missing. Rows
+    with neither keep a null key (see keyed_rows).
+    """
+    df = df.copy()
+    if KEY_COLUMN not in df:
+        df[KEY_COLUMN] = None
+    if "url" in df:
+        df[KEY_COLUMN] = df[KEY_COLUMN].fillna(df["url"].map(listing_id_from_url))
+    return df
+
+
+def keyed_rows(df: pd.DataFrame) -> tuple:
+    """
+    (rows with a listing id, last copy of each id; count of rows without one).
+    Rows without an id are never merged on their content: two listings in
+    the same society with the same area are still different listings.
+    """
+    df = with_listing_id(df)
+    missing = df[KEY_COLUMN].isna()
+    return df[~missing].drop_duplicates(KEY_COLUMN, keep="last"), int(missing.sum())
+
+
+def _column_type(name, dtype, indexed):
+    if name == KEY_COLUMN or indexed:
+        return String(255)
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return BigInteger()
+    if pd.api.types.is_float_dtype(dtype):
+        return Float()
+    return Text()
+
+
+def _is_keyed(engine, table_name: str) -> bool:
+    # listing_id must be the primary key or carry a unique index for the upsert to match rows
+    inspector = inspect(engine)
+    if inspector.get_pk_constraint(table_name).get("constrained_columns") == [KEY_COLUMN]:
+        return True
+    unique = [u["column_names"] for u in inspector.get_unique_constraints(table_name)]
+    unique += [i["column_names"] for i in inspector.get_indexes(table_name) if i.get("unique")]
+    return [KEY_COLUMN] in unique
+
+
+def _migrate_legacy_table(engine, df: pd.DataFrame, table_name: str, indexes) -> Table:
+    """
+    Rebuild a table written by the old to_sql(if_exists="replace") path,
+    which has no listing_id key: its rows are keyed with keyed_rows, copied
+    into a new keyed table of the same name, and the old table is dropped
+    once the copy succeeded - unless some rows had no listing id, which are
+    then left in the {table}_legacy backup rather than lost.
+    """
+    legacy, unkeyed = keyed_rows(pd.read_sql_table(table_name, engine))
+    template = pd.concat([df.iloc[:0], legacy.iloc[:0].drop(columns=[c for c in legacy if c in df])], axis=1)
+    backup = f"{table_name}_legacy"
+    quote = engine.dialect.identifier_preparer.quote
+    logger.warning(f"Table {table_name} has no {KEY_COLUMN} key; migrating {len(legacy)} rows "
+                   f"(old table kept as {backup} until the copy completes)")
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {quote(table_name)} RENAME TO {quote(backup)}"))
+    table = _create_table(engine, template, table_name, indexes)
+    _write(engine, table, legacy[[c for c in legacy if c in table.columns]], DB_WRITE_CHUNK_SIZE, "multi")
+    if unkeyed:
+        logger.warning(f"{unkeyed} rows of {table_name} have no {KEY_COLUMN}; they stay in {backup}")
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {quote(backup)}"))
+    logger.info(f"Migrated {table_name} to a {KEY_COLUMN}-keyed table")
+    return table
+
+
+def ensure_table(engine, df: pd.DataFrame, table_name: str, indexes=DEFAULT_INDEXES) -> Table:
+    """
+    Create `table_name` with a primary key on listing_id and secondary
+    indexes on the filter columns, unless it already exists. An existing
+    table without that key (the legacy to_sql layout) is migrated first.
+    """
+    if inspect(engine).has_table(table_name):
+        if _is_keyed(engine, table_name):
+            return Table(table_name, MetaData(), autoload_with=engine)
+        return _migrate_legacy_table(engine, df, table_name, indexes)
+    return _create_table(engine, df, table_name, indexes)
+
+
+def _create_table(engine, df: pd.DataFrame, table_name: str, indexes) -> Table:
+    metadata = MetaData()
+    indexed = [c for c in indexes if c in df.columns]
+    columns = [Column(name, _column_type(name, dtype, name in indexed), primary_key=(name == KEY_COLUMN))
+               for name, dtype in df.dtypes.items()]
+    table = Table(table_name, metadata, *columns)
+    for name in indexed:
+        Index(f"ix_{table_name}_{name.lower()}", table.c[name])
+    metadata.create_all(engine)
+    logger.info(f"Created table {table_name} (key {KEY_COLUMN}, indexes {indexed})")
+    return table
+
+
+def _upsert_statement(engine, table: Table):
+    # built once per table and executed with a list of row dicts; SQLAlchemy's
+    # "insertmanyvalues" batching renders each chunk as multi-row VALUES
+    if engine.dialect.name == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({c.name: stmt.inserted[c.name] for c in table.columns
+                                             if c.name != KEY_COLUMN})
+    if engine.dialect.name == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(index_elements=[KEY_COLUMN],
+                                          set_={c.name: stmt.excluded[c.name] for c in table.columns
+                                                if c.name != KEY_COLUMN})
+    # any other dialect: delete-then-insert per chunk (see _write)
+    return None
+
+
+def _delete_insert(conn, table: Table, records: list):
+    # portable upsert: both statements run in the caller's transaction
+    conn.execute(table.delete().where(table.c[KEY_COLUMN].in_([r[KEY_COLUMN] for r in records])))
+    conn.execute(table.insert(), records)
+
+
+def _records(chunk: pd.DataFrame) -> list:
+    # column-wise NaN/NA -> NULL, then zip into row dicts (much cheaper than to_dict("records"))
+    names = list(chunk.columns)
+    values = [chunk[c].astype(object).where(chunk[c].notna(), None).tolist() for c in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _load_data_infile(conn, table: Table, chunk: pd.DataFrame):
+    """
+    MySQL bulk path: stream the chunk through a temporary CSV and LOAD DATA
+    LOCAL INFILE ... REPLACE, which upserts on the primary key. Needs
+    local_infile enabled on both the server and the driver.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8") as f:
+        chunk.to_csv(f, index=False, header=False, na_rep="\\N", quoting=csv.QUOTE_MINIMAL)
+        path = f.name
+    try:
+        columns = ", ".join(f"`{c}`" for c in chunk.columns)
+        conn.execute(text(
+            f"LOAD DATA LOCAL INFILE '{path}' REPLACE INTO TABLE `{table.name}` "
+            f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            f"LINES TERMINATED BY '\\n' ({columns})"
+        ))
+    finally:
+        os.remove(path)
+
+
+def _write(engine, table: Table, df: pd.DataFrame, chunk_size: int, method: str):
+    stmt = _upsert_statement(engine, table) if method == "multi" else None
+    with engine.begin() as conn:
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            if method == "load_data":
+                _load_data_infile(conn, table, chunk)
+            elif stmt is None:
+                _delete_insert(conn, table, _records(chunk))
+            else:
+                conn.execute(stmt, _records(chunk))
+
+
+def upsert_dataframe(df: pd.DataFrame, table_name: str = "properties", engine=None,
+                     chunk_size: int = DB_WRITE_CHUNK_SIZE, method: str = "multi") -> int:
+    """
+    Insert-or-update `df` into `table_name` keyed on listing_id, in chunks.
+    Rows without a listing id are skipped with a warning.
+
+    method="multi" sends one multi-row INSERT ... ON DUPLICATE KEY UPDATE
+    (ON CONFLICT DO UPDATE on SQLite, DELETE + INSERT on other databases)
+    per chunk; method="load_data" uses
+    LOAD DATA LOCAL INFILE on MySQL. Returns the number of rows written.
+    """
+    engine = engine or get_engine()
+    if method == "load_data" and engine.dialect.name != "mysql":
+        raise ValueError("method='load_data' is only available on MySQL")
+
+    df, unkeyed = keyed_rows(df)
+    if unkeyed:
+        logger.warning(f"Skipped {unkeyed} rows without a {KEY_COLUMN} (cards with no JSON-LD listing url)")
+    table = ensure_table(engine, df, table_name)
+    unknown = [c for c in df.columns if c not in table.columns]
+    if unknown:
+        logger.warning(f"Columns not in {table_name}, skipped: {unknown}")
+    df = df[[c.name for c in table.columns if c.name in df.columns]]
+
+    _write(engine, table, df, chunk_size, method)
+    logger.info(f"Upserted {len(df)} rows into {table_name} in chunks of {chunk_size}")
+    return len(df)
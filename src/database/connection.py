@@ -1,7 +1,47 @@
-
+import threading
 from sqlalchemy import create_engine
-from src.config.db_config import SQLALCHEMY_DATABASE_URL
+from src.config.db_config import (
+    SQLALCHEMY_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+)
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def get_engine(url: str = SQLALCHEMY_DATABASE_URL):
+    """
+    Return the process-wide engine for `url`, creating it on first use.
+
+    Server databases get a bounded connection pool with pre-ping (drops dead
+    connections before handing them out) and recycling (stays under the
+    server's wait_timeout). SQLite keeps SQLAlchemy's default pool.
+    """
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _lock:
+        if url not in _engines:
+            options = {"pool_pre_ping": True}
+            if not url.startswith("sqlite"):
+                options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                               pool_recycle=DB_POOL_RECYCLE)
+            _engines[url] = create_engine(url, **options)
+        return _engines[url]
+
 
+def dispose_engines():
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
+def __getattr__(name):
+    # `from src.database.connection import engine` keeps working, but the
+    # engine is only built when first asked for
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
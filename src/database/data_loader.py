@@ -1,25 +1,56 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
+from sqlalchemy import MetaData, Table, select
+from src.config.db_config import DB_READ_CHUNK_SIZE
+from src.database.connection import get_engine
 
-load_dotenv()  # Load DB credentials from .env
+# (column, op, value) predicates, same shape as pyarrow filters
+_OPERATORS = {
+    "=": lambda col, v: col == v,
+    "==": lambda col, v: col == v,
+    "!=": lambda col, v: col != v,
+    "<": lambda col, v: col < v,
+    "<=": lambda col, v: col <= v,
+    ">": lambda col, v: col > v,
+    ">=": lambda col, v: col >= v,
+    "in": lambda col, v: col.in_(list(v)),
+    "not in": lambda col, v: col.not_in(list(v)),
+}
 
-def load_data_from_mysql(table_name: str) -> pd.DataFrame:
+
+def build_query(table_name: str, columns: list = None, filters: list = None, engine=None):
     """
-    Load data from a specified MySQL table and return as a DataFrame.
+    SELECT only `columns` from `table_name` with `filters` pushed into the
+    WHERE clause, e.g. filters=[("locality", "in", ["Kondapur", "Gachibowli"]),
+    ("Price_INR_Numeric", "<", 2e7)]. Values are sent as bound parameters.
     """
-    user = os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    host = os.getenv("DB_HOST")
-    port = os.getenv("DB_PORT")
-    db = os.getenv("DB_NAME")
+    engine = engine or get_engine()
+    table = Table(table_name, MetaData(), autoload_with=engine)
+    query = select(*(table.c[c] for c in columns)) if columns else select(table)
+    for column, op, value in filters or []:
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported filter operator {op!r}; use one of {list(_OPERATORS)}")
+        query = query.where(_OPERATORS[op](table.c[column], value))
+    return query
 
 
+def iter_table_chunks(table_name: str, columns: list = None, filters: list = None,
+                      chunksize: int = DB_READ_CHUNK_SIZE, engine=None):
+    """
+    Yield the table as DataFrames of at most `chunksize` rows.
+
+    Rows are fetched through a server-side cursor (stream_results), so only
+    one chunk is held in memory at a time and tables larger than RAM can be
+    consumed.
+    """
+    engine = engine or get_engine()
+    query = build_query(table_name, columns, filters, engine)
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        yield from pd.read_sql(query, conn, chunksize=chunksize)
 
-    connection_string = f"mysql+pymysql://{user}:{password}@{host}:{port}/{db}"
-    engine = create_engine(connection_string)
-    
-    df = pd.read_sql(f"SELECT * FROM {table_name}", engine)
-    return df
 
+def load_data_from_mysql(table_name: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+    """
+    Load data from a specified MySQL table and return as a DataFrame.
+    """
+    return pd.read_sql(build_query(table_name, columns, filters), get_engine())
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from src.config.model_config import CATEGORICAL_COLUMNS, FEATURE_COLUMNS
+
+TARGET_COLUMN = "Price_INR_Numeric"
+
+# Multipliers to INR and to square feet, keyed by the lower-cased unit token
+PRICE_UNITS = {
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "lac": 1e5, "lacs": 1e5, "lakh": 1e5, "lakhs": 1e5,
+    "k": 1e3, "thousand": 1e3,
+}
+AREA_UNITS = {
+    "sqft": 1.0, "sq.ft": 1.0, "sq-ft": 1.0,
+    "sqyrd": 9.0, "sqyd": 9.0, "sq.yd": 9.0,
+    "sqm": 10.7639, "sq.m": 10.7639,
+    "acre": 43560.0, "acres": 43560.0,
+}
+
+_AMOUNT_WITH_UNIT = r"([\d.]+)\s*([A-Za-z][A-Za-z.\-]*)?"
+_POSSESSION_DATE = r"Poss\. by (\w{3}) '(\d{2})"
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def _on_uniques(series: pd.Series, parse) -> pd.Series:
+    """
+    Apply a vectorized parser to the distinct values only and broadcast the
+    result back. Scraped columns repeat heavily ("1 Covered", "Resale", ...),
+    so the regex work shrinks from one pass per row to one per distinct string.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = parse(pd.Series(uniques, dtype="string"))
+    values = np.asarray(parsed, dtype=np.float64)
+    out = np.full(len(codes), np.nan)
+    known = codes >= 0
+    out[known] = values[codes[known]]
+    return pd.Series(out, index=series.index)
+
+
+def _amount(uniques: pd.Series, units: dict) -> pd.Series:
+    parts = uniques.str.replace(",", "", regex=False).str.replace("₹", "", regex=False).str.extract(_AMOUNT_WITH_UNIT)
+    value = pd.to_numeric(parts[0], errors="coerce")
+    return value * parts[1].str.lower().map(units).astype(float)
+
+
+def parse_price(series: pd.Series) -> pd.Series:
+    """
+    "1.17 Cr" -> 11700000.0, "85 Lac" -> 8500000.0, "950 K" -> 950000.0.
+    Amounts without a known unit become NaN.
+    """
+    return _on_uniques(series, lambda u: _amount(u, PRICE_UNITS))
+
+
+def parse_area(series: pd.Series) -> pd.Series:
+    """
+    "1680 sqft" -> 1680.0, "156 sqyrd" -> 1404.0, "100 sqm" -> 1076.39, in square feet.
+    """
+    return _on_uniques(series, lambda u: _amount(u, AREA_UNITS))
+
+
+def parse_price_per_sqft(series: pd.Series) -> pd.Series:
+    # "6,999 per sqft" -> 6999.0
+    return _on_uniques(series, lambda u: pd.to_numeric(
+        u.str.replace(",", "", regex=False).str.extract(r"(\d+)", expand=False), errors="coerce"))
+
+
+def parse_count(series: pd.Series, pattern: str = r"(\d+)") -> pd.Series:
+    return _on_uniques(series, lambda u: pd.to_numeric(u.str.extract(pattern, expand=False), errors="coerce"))
+
+
+def split_parking(series: pd.Series) -> pd.DataFrame:
+    """
+    "1 Covered, 2 Open" -> Covered_parking=1, Open_parking=2 (0 when absent).
+
+    Covered counts above 10 are society-wide totals scraped into the card;
+    as in the cleaning notebook they are treated as a single spot.
+    """
+    covered = parse_count(series, r"(\d+)\s*Covered").fillna(0)
+    open_ = parse_count(series, r"(\d+)\s*Open").fillna(0)
+    return pd.DataFrame({
+        "Covered_parking": covered.where(covered <= 10, 1).astype(np.int16),
+        "Open_parking": open_.astype(np.int16),
+    })
+
+
+def parse_possession(possession: pd.Series, transaction: pd.Series) -> pd.DataFrame:
+    """
+    "Poss. by Dec '25" -> Possession "2025-12", Possession_Status "future".
+    Cards without a possession date are "old" (Resale) or "new" (New Property).
+    """
+    codes, uniques = pd.factorize(possession, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype="string")
+    parts = uniques.str.extract(_POSSESSION_DATE)
+    month = parts[0].str.lower().map(_MONTHS).astype("Int64").astype("string").str.zfill(2)
+    parsed = ("20" + parts[1] + "-" + month).fillna(uniques).to_numpy(dtype=object)
+
+    dates = np.where(codes >= 0, parsed[codes] if len(parsed) else None, None)
+    no_date = possession.isna().to_numpy()
+    status = np.select(
+        [~no_date, transaction.to_numpy() == "Resale", transaction.to_numpy() == "New Property"],
+        ["future", "old", "new"], default="future",
+    )
+    dates = np.where(no_date & (status != "future"), status, dates)
+    return pd.DataFrame({"Possession": dates, "Possession_Status": status}, index=possession.index)
+
+
+def normalize_cards(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn the raw card strings from extract_features_from_html into typed
+    columns, whole columns at a time. Mirrors notebooks/data_cleaning.ipynb
+    up to (not including) label encoding and scaling.
+    """
+    df = pd.DataFrame(index=raw.index)
+    df["Title"] = raw["Title"].astype("string")
+    df["Description"] = raw["Description"].astype("string")
+    df["Society"] = raw["Society"].fillna("No Data")
+    df["Transaction"] = raw["Transaction"].fillna("No Data")
+    df["Furnishing"] = raw["Furnishing"].fillna("No data")
+
+    possession = parse_possession(raw["Possession"], raw["Transaction"])
+    df["Possession"] = possession["Possession"].astype("string")
+    df["Possession_Status"] = possession["Possession_Status"]
+
+    price = parse_price(raw["Price (INR)"])
+    area = parse_area(raw["Carpet Area"].combine_first(raw["Super Area"]))
+    price_per_sqft = parse_price_per_sqft(raw["Price per Sqft"])
+    # a card missing its area or its price per sqft still has the other two;
+    # whatever cannot be derived stays NaN (training_rows drops those rows)
+    area = area.where(area > 0, price / price_per_sqft.where(price_per_sqft > 0))
+    price_per_sqft = price_per_sqft.where(price_per_sqft > 0, price / area.where(area > 0))
+
+    df[TARGET_COLUMN] = price.round().astype("Int64")
+    df["Total Area"] = area.astype(np.float32)
+    df["Price per Sqft"] = price_per_sqft.round().astype(np.float32)
+    df["Bathroom"] = parse_count(raw["Bathroom"]).fillna(0).astype(np.int16)
+    df[["Covered_parking", "Open_parking"]] = split_parking(raw["Car Parking"])
+    df["BHK"] = parse_count(raw["Title"], r"(\d+)\s*BHK").fillna(0).astype(np.int16)
+    return df
+
+
+# dtypes of notebooks/data/processed/clean_df.csv as pd.read_csv returns them
+TRAINING_DTYPES = {
+    "Transaction": np.int64,
+    "Furnishing": np.int64,
+    "Bathroom": np.float64,
+    "Price per Sqft": np.float64,
+    "Total Area": np.float64,
+    "Covered_parking": np.int64,
+    "Open_parking": np.int64,
+    "Possession_Status": np.int64,
+    "BHK": np.float64,
+    TARGET_COLUMN: np.float64,
+}
+
+
+def training_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed cards -> the frame the trainers read from clean_df.csv: rows
+    without a price, area or price per sqft dropped, categoricals as
+    LabelEncoder codes (sorted string values) and clean_df.csv's dtypes.
+    Only the columns present in `df` are converted.
+    """
+    required = [c for c in (TARGET_COLUMN, "Total Area", "Price per Sqft") if c in df.columns]
+    df = df.dropna(subset=required)
+    if "Total Area" in df.columns:
+        df = df[df["Total Area"] > 0]
+    df = df.reset_index(drop=True)
+
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            values = np.unique(values.astype(str).to_numpy(), return_inverse=True)[1]
+        out[col] = np.asarray(values, dtype=TRAINING_DTYPES.get(col, object))
+    return pd.DataFrame(out, columns=df.columns)
+
+
+def training_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Exactly the columns and dtypes train_model reads: the model features plus the target.
+    """
+    return training_rows(normalize_cards(raw)[FEATURE_COLUMNS + [TARGET_COLUMN]])
@@ -0,0 +1,95 @@
+import argparse
+import os
+from datetime import date
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from src.config.data_config import HTML_DATA_CSV, PROCESSED_DATASET_DIR, PARTITION_COLUMNS
+from src.ml_pipeline.normalize import normalize_cards, training_rows
+from src.utils.logger import logger
+
+# Arrow schema of the processed dataset (partition columns excluded)
+PROCESSED_SCHEMA = pa.schema([
+    ("Title", pa.string()),
+    ("Description", pa.string()),
+    ("Society", pa.dictionary(pa.int32(), pa.string())),
+    ("Transaction", pa.dictionary(pa.int8(), pa.string())),
+    ("Furnishing", pa.dictionary(pa.int8(), pa.string())),
+    ("Possession", pa.string()),
+    ("Possession_Status", pa.dictionary(pa.int8(), pa.string())),
+    ("Price_INR_Numeric", pa.int64()),
+    ("Total Area", pa.float32()),
+    ("Price per Sqft", pa.float32()),
+    ("Bathroom", pa.int16()),
+    ("Covered_parking", pa.int16()),
+    ("Open_parking", pa.int16()),
+    ("BHK", pa.int16()),
+])
+
+
+def city_from_title(titles: pd.Series) -> pd.Series:
+    # "3 BHK Apartment for Sale in Peeramcheru Hyderabad" -> "Hyderabad"
+    return titles.astype("string").str.strip().str.rsplit(" ", n=1).str[-1].fillna("unknown")
+
+
+def write_processed_dataset(df: pd.DataFrame, root: str = PROCESSED_DATASET_DIR, crawl_date: str = None,
+                            city: str = None):
+    """
+    Write typed cards as Parquet under root/crawl_date=.../city=.../.
+    Partitions being written are replaced, so re-processing a crawl is idempotent.
+    """
+    table = pa.Table.from_pandas(df, schema=PROCESSED_SCHEMA, preserve_index=False)
+    crawl_date = crawl_date or date.today().isoformat()
+    cities = pd.Series([city] * len(df)) if city else city_from_title(df["Title"])
+    table = table.append_column("crawl_date", pa.array([crawl_date] * len(df), pa.string()))
+    table = table.append_column("city", pa.array(cities.astype(object).tolist(), pa.string()))
+
+    pq.write_to_dataset(table, root, partition_cols=PARTITION_COLUMNS,
+                        existing_data_behavior="delete_matching")
+    logger.info(f"💾 Wrote {len(df)} typed rows to {root} (crawl_date={crawl_date})")
+
+
+def build_processed_dataset(input_csv: str = HTML_DATA_CSV, root: str = PROCESSED_DATASET_DIR,
+                            crawl_date: str = None, city: str = None):
+    raw = pd.read_csv(input_csv, dtype=str)
+    df = normalize_cards(raw)
+    write_processed_dataset(df, root, crawl_date, city)
+    return df
+
+
+def load_processed_data(root: str = PROCESSED_DATASET_DIR, columns: list = None, filters=None) -> pd.DataFrame:
+    """
+    Read only `columns` from a Parquet file or dataset, memory-mapping the files.
+
+    `filters` is passed to pyarrow (e.g. [("city", "=", "Hyderabad")]), so
+    partitions and row groups that cannot match are never read.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive",
+                         filesystem=pafs.LocalFileSystem(use_mmap=True))
+    expression = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas(self_destruct=True, split_blocks=True)
+
+
+def load_training_data(data_path: str, columns: list = None) -> pd.DataFrame:
+    """
+    Load a training frame from a CSV file or a Parquet file/dataset, reading
+    only `columns` when given. Parquet input comes back as clean_df.csv
+    would: label-encoded categoricals, the same dtypes and no incomplete rows.
+    """
+    if os.path.isdir(data_path) or data_path.endswith(".parquet"):
+        return training_rows(load_processed_data(data_path, columns))
+    return pd.read_csv(data_path, usecols=columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the typed Parquet dataset from parsed HTML cards.")
+    parser.add_argument("--input", default=HTML_DATA_CSV)
+    parser.add_argument("--output", default=PROCESSED_DATASET_DIR)
+    parser.add_argument("--crawl-date", default=None, help="defaults to today")
+    parser.add_argument("--city", default=None, help="defaults to the last word of each title")
+    args = parser.parse_args()
+
+    df = build_processed_dataset(args.input, args.output, args.crawl_date, args.city)
+    print(df.dtypes)
@@ -0,0 +1,69 @@
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+from src.config.model_config import CATEGORICAL_COLUMNS, FEATURE_COLUMNS
+from src.models.tuning import build_ensemble
+
+
+def _categorical_mask(feature_columns, categorical_columns):
+    return [col in categorical_columns for col in feature_columns]
+
+
+def _linear(feature_columns, categorical_columns, random_state):
+    return LinearRegression()
+
+
+def _ensemble(feature_columns, categorical_columns, random_state):
+    return build_ensemble(random_state=random_state)
+
+
+def _hist_gb(feature_columns, categorical_columns, random_state):
+    # label-encoded codes are used as native categories; negative codes
+    # (the "unknown" unseen-category policy) are treated as missing
+    return HistGradientBoostingRegressor(
+        categorical_features=_categorical_mask(feature_columns, categorical_columns),
+        max_iter=300, learning_rate=0.1, early_stopping=False, random_state=random_state,
+    )
+
+
+def _lightgbm(feature_columns, categorical_columns, random_state):
+    try:
+        from lightgbm import LGBMRegressor
+    except ImportError as e:
+        raise ImportError("The 'lightgbm' backend needs the lightgbm package (pip install lightgbm)") from e
+
+    # categorical_feature is a fit() argument in LightGBM, see fit_params()
+    return LGBMRegressor(n_estimators=300, learning_rate=0.05, num_leaves=31,
+                         min_child_samples=10, random_state=random_state, verbose=-1)
+
+
+# Regressor factories selectable from the training modules (--backend)
+BACKENDS = {
+    "linear": _linear,
+    "ensemble": _ensemble,
+    "hist_gb": _hist_gb,
+    "lightgbm": _lightgbm,
+}
+
+
+def make_regressor(backend: str = "linear", feature_columns=FEATURE_COLUMNS,
+                   categorical_columns=CATEGORICAL_COLUMNS, random_state: int = 42):
+    """
+    Unfitted regressor for `backend`. Boosted backends treat the
+    label-encoded categorical columns as native categories.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {list(BACKENDS)}, got {backend!r}")
+    return BACKENDS[backend](feature_columns, categorical_columns, random_state)
+
+
+def fit_params(backend: str = "linear", feature_columns=FEATURE_COLUMNS,
+               categorical_columns=CATEGORICAL_COLUMNS) -> dict:
+    """
+    Keyword arguments to pass to `backend`'s fit(X, y). LightGBM takes its
+    native categorical columns there rather than in the constructor, which
+    keeps the fitted model a plain, picklable LGBMRegressor.
+    """
+    if backend == "lightgbm":
+        mask = _categorical_mask(feature_columns, categorical_columns)
+        return {"categorical_feature": [i for i, is_cat in enumerate(mask) if is_cat]}
+    return {}
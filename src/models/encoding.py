@@ -0,0 +1,138 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.config.model_config import (
+    UNSEEN_CATEGORY_POLICY,
+    UNKNOWN_CATEGORY_CODE,
+    CATEGORY_COUNTS_PATH,
+)
+from src.utils.logger import logger
+
+UNSEEN_POLICIES = ("error", "unknown", "most_frequent")
+
+
+class UnseenCategoryError(ValueError):
+    """Raised when a value is not in the encoder vocabulary and the policy is "error"."""
+
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
+        super().__init__(f"Unknown category for {name}: {value!r}")
+
+
+class CompiledEncoder:
+    """
+    Constant-time replacement for LabelEncoder.transform.
+
+    The fitted classes_ are compiled once into a dict for scalar lookups and
+    reused as the category index of a pd.Categorical for whole columns.
+    """
+
+    def __init__(self, name: str, classes, policy: str = UNSEEN_CATEGORY_POLICY,
+                 unknown_code: int = UNKNOWN_CATEGORY_CODE, counts: dict = None):
+        if policy not in UNSEEN_POLICIES:
+            raise ValueError(f"policy must be one of {UNSEEN_POLICIES}, got {policy!r}")
+
+        self.name = name
+        self.classes_ = np.asarray(classes)
+        self.lookup = {str(c): i for i, c in enumerate(self.classes_)}
+        self.policy = policy
+        self.fallback_code = None
+
+        if policy == "unknown":
+            self.fallback_code = unknown_code
+        elif policy == "most_frequent":
+            known_counts = {c: n for c, n in (counts or {}).items() if c in self.lookup}
+            if known_counts:
+                self.fallback_code = self.lookup[max(known_counts, key=known_counts.get)]
+            else:
+                logger.warning(f"No category counts for {name}; falling back to first class.")
+                self.fallback_code = 0
+
+    def encode(self, value) -> int:
+        code = self.lookup.get(str(value))
+        if code is not None:
+            return code
+        if self.fallback_code is None:
+            raise UnseenCategoryError(self.name, value)
+        return self.fallback_code
+
+    def encode_many(self, values) -> tuple:
+        """
+        Encode a whole column. Returns (codes, known_mask); with the "error"
+        policy unknown rows keep code -1 and it is up to the caller to reject them.
+        """
+        if isinstance(values, (pd.Series, np.ndarray)):
+            values = pd.Series(values).astype(str)
+            codes = pd.Categorical(values, categories=self.classes_).codes.astype(np.int64)
+        else:
+            # plain Python sequences (request payloads): dict lookups beat building
+            # a Categorical, which carries ~1 ms of fixed overhead per column
+            lookup = self.lookup
+            codes = np.fromiter((lookup.get(str(v), -1) for v in values),
+                                dtype=np.int64, count=len(values))
+        known = codes >= 0
+        if self.fallback_code is not None:
+            codes[~known] = self.fallback_code
+        return codes, known
+
+
+class VocabularyEncoder:
+    """
+    LabelEncoder with codes that never change once assigned: classes_ is in
+    code order and extend() gives new categories the next free codes
+    instead of sorting them in. transform goes through a dict, so it stays
+    correct on the unsorted classes_ where LabelEncoder's searchsorted would
+    not. Incremental training uses it, as its model was fitted on the old codes.
+    """
+
+    def __init__(self, classes=()):
+        self.classes_ = np.asarray([str(c) for c in classes], dtype=object)
+
+    def fit(self, values) -> "VocabularyEncoder":
+        self.classes_ = np.asarray(sorted({str(v) for v in values}), dtype=object)
+        return self
+
+    def extend(self, values) -> list:
+        """
+        Append the categories not seen yet (sorted among themselves); returns them.
+        """
+        known = set(self.classes_.tolist())
+        new = sorted({str(v) for v in values} - known)
+        if new:
+            self.classes_ = np.concatenate([self.classes_, np.asarray(new, dtype=object)])
+        return new
+
+    def transform(self, values) -> np.ndarray:
+        lookup = {c: i for i, c in enumerate(self.classes_.tolist())}
+        unseen = sorted({str(v) for v in values} - lookup.keys())
+        if unseen:
+            raise ValueError(f"y contains previously unseen labels: {unseen}")
+        return np.fromiter((lookup[str(v)] for v in values), dtype=np.int64, count=len(values))
+
+    def fit_transform(self, values) -> np.ndarray:
+        return self.fit(values).transform(values)
+
+    def inverse_transform(self, codes) -> np.ndarray:
+        return self.classes_[np.asarray(codes, dtype=np.int64)]
+
+
+def load_category_counts(path: str = CATEGORY_COUNTS_PATH) -> dict:
+    """
+    Load the per-column category frequencies written by train_model, if present.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_encoder(label_encoder, name: str, policy: str = UNSEEN_CATEGORY_POLICY,
+                    counts: dict = None) -> CompiledEncoder:
+    """
+    Compile a fitted LabelEncoder (or VocabularyEncoder) into a CompiledEncoder.
+    """
+    if counts is None and policy == "most_frequent":
+        counts = load_category_counts().get(name)
+    return CompiledEncoder(name, label_encoder.classes_, policy=policy, counts=counts)
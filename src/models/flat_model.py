@@ -0,0 +1,288 @@
+import argparse
+import hashlib
+import json
+import os
+import joblib
+import numpy as np
+from src.config.model_config import FEATURE_COLUMNS, FLAT_MODEL_PATH
+from src.models.fused_model import SCALED_COLUMNS, sample_raw_features
+from src.utils.logger import logger
+
+_MAGIC = b"FLATMDL1"
+_ALIGN = 64
+
+
+def save_arrays(path: str, arrays: dict, meta: dict):
+    """
+    Write named arrays into one file: magic, header length, JSON header, then
+    each array's raw bytes at a 64-byte aligned offset. The file is published
+    atomically (temp file + os.replace).
+    """
+    header = {"meta": meta, "arrays": {}}
+    offset = 0
+    for name, arr in arrays.items():
+        header["arrays"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = -(-(len(_MAGIC) + 8 + len(header_bytes)) // _ALIGN) * _ALIGN
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name, arr in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_arrays(path: str, mmap: bool = True) -> tuple:
+    """
+    Read a file written by save_arrays. With mmap=True the arrays are
+    read-only views on a shared memory map, so every process loading the
+    same file shares its pages through the OS page cache.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a flat model file")
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length))
+    data_start = -(-(len(_MAGIC) + 8 + header_length) // _ALIGN) * _ALIGN
+    buffer = np.memmap(path, mode="r") if mmap else np.fromfile(path, dtype=np.uint8)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        start = data_start + spec["offset"]
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+    return arrays, header["meta"]
+
+
+class _Collector:
+    """Accumulates trees (with their output weight) and linear terms while flattening."""
+
+    def __init__(self, n_features: int):
+        self.trees = []
+        self.coef = np.zeros(n_features, dtype=np.float64)
+        self.bias = 0.0
+
+    def add_tree(self, tree, weight: float):
+        self.trees.append((tree.tree_, weight))
+
+    def add(self, model, weight: float = 1.0):
+        # sklearn is only imported once a model is actually being flattened
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import (
+            ExtraTreesRegressor,
+            GradientBoostingRegressor,
+            RandomForestRegressor,
+            VotingRegressor,
+        )
+        from sklearn.tree import DecisionTreeRegressor
+
+        if isinstance(model, VotingRegressor):
+            members = [est for est in model.estimators_]
+            weights = model.weights if model.weights is not None else [1.0] * len(members)
+            total = float(np.sum(weights))
+            for est, w in zip(members, weights):
+                self.add(est, weight * w / total)
+        elif isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+            for tree in model.estimators_:
+                self.add_tree(tree, weight / len(model.estimators_))
+        elif isinstance(model, GradientBoostingRegressor):
+            if isinstance(model.init_, DummyRegressor):
+                self.bias += weight * float(np.ravel(model.init_.constant_)[0])
+            elif model.init_ != "zero":
+                raise TypeError(f"Unsupported GradientBoosting init: {type(model.init_).__name__}")
+            for tree in model.estimators_[:, 0]:
+                self.add_tree(tree, weight * model.learning_rate)
+        elif isinstance(model, DecisionTreeRegressor):
+            self.add_tree(model, weight)
+        elif hasattr(model, "coef_") and hasattr(model, "intercept_"):
+            self.coef += weight * np.ravel(model.coef_)
+            self.bias += weight * float(np.ravel(model.intercept_)[0])
+        else:
+            raise TypeError(f"Cannot flatten {type(model).__name__}")
+
+
+def model_signature(model, n_features: int = len(FEATURE_COLUMNS)) -> str:
+    """
+    Fingerprint of the trees and linear terms a flat export is built from.
+    Hashes the arrays themselves, so it survives pickling and mmap loading.
+    """
+    collector = _Collector(n_features)
+    collector.add(model)
+    h = hashlib.sha256()
+    for tree, weight in collector.trees:
+        for arr in (tree.feature, tree.threshold, tree.children_left, tree.children_right, tree.value):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        h.update(np.float64(weight).tobytes())
+    h.update(np.ascontiguousarray(collector.coef, dtype=np.float64).tobytes())
+    h.update(np.float64(collector.bias).tobytes())
+    return h.hexdigest()
+
+
+def can_flatten(model) -> bool:
+    try:
+        _Collector(len(FEATURE_COLUMNS)).add(model)
+    except (TypeError, AttributeError):
+        return False
+    return True
+
+
+class FlatTreeModel:
+    """
+    Trees (and linear terms) of a fitted regressor as contiguous arrays.
+
+    All nodes of all trees live in one set of arrays (feature, threshold,
+    left, right, value); leaves point to themselves, so a batch walks every
+    tree at once with one vectorized gather step per level. Trees are stored
+    deepest first, so level d only touches the trees that are deeper than d
+    (shallow boosting stages drop out after a few steps). The result is
+    bias + coef . x + sum(tree_weight * leaf_value).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, tree_weights, depths,
+                 coef, bias: float, signature: str = ""):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.tree_weights = tree_weights
+        self.depths = depths
+        self.coef_ = coef
+        self.bias = float(bias)
+        self.signature = signature
+        # number of trees still descending at each level
+        self._active = [int(np.count_nonzero(depths > d)) for d in range(int(depths[0]) if len(depths) else 0)]
+
+    @classmethod
+    def from_model(cls, model, n_features: int = len(FEATURE_COLUMNS)) -> "FlatTreeModel":
+        collector = _Collector(n_features)
+        collector.add(model)
+        trees = sorted(collector.trees, key=lambda item: -item[0].max_depth)
+
+        sizes = [tree.node_count for tree, _ in trees]
+        offsets = np.cumsum([0] + sizes[:-1]).astype(np.int64) if trees else np.empty(0, dtype=np.int64)
+        parts = {"feature": [], "threshold": [], "left": [], "right": [], "value": []}
+        for (tree, _), offset in zip(trees, offsets):
+            node_ids = np.arange(tree.node_count, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+            parts["feature"].append(np.where(is_leaf, 0, tree.feature))
+            parts["threshold"].append(np.where(is_leaf, np.inf, tree.threshold))
+            parts["left"].append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            parts["right"].append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            parts["value"].append(tree.value[:, 0, 0])
+
+        def concat(name, dtype):
+            if not parts[name]:
+                return np.empty(0, dtype=dtype)
+            return np.ascontiguousarray(np.concatenate(parts[name]), dtype=dtype)
+
+        return cls(
+            feature=concat("feature", np.int64),
+            threshold=concat("threshold", np.float64),
+            left=concat("left", np.int64),
+            right=concat("right", np.int64),
+            value=concat("value", np.float64),
+            roots=offsets,
+            tree_weights=np.array([w for _, w in trees], dtype=np.float64),
+            depths=np.array([tree.max_depth for tree, _ in trees], dtype=np.int64),
+            coef=collector.coef,
+            bias=collector.bias,
+            signature=model_signature(model),
+        )
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        out = X @ self.coef_ + self.bias
+        if len(self.roots) == 0:
+            return out
+
+        # sklearn compares float32 inputs against float64 thresholds
+        n_rows, n_features = X.shape
+        flat_x = X.astype(np.float32).astype(np.float64).ravel()
+        row_base = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        node = np.tile(self.roots, (n_rows, 1))
+        for k in self._active:
+            current = node[:, :k]
+            go_left = flat_x.take(row_base + self.feature.take(current)) <= self.threshold.take(current)
+            node[:, :k] = np.where(go_left, self.left.take(current), self.right.take(current))
+        return out + self.value.take(node) @ self.tree_weights
+
+    def predict_one(self, values) -> float:
+        return float(self.predict(np.asarray(values, dtype=np.float64)[None, :])[0])
+
+    def matches(self, model) -> bool:
+        return self.signature == model_signature(model)
+
+    def save(self, path: str = FLAT_MODEL_PATH):
+        arrays = {name: getattr(self, name) for name in
+                  ("feature", "threshold", "left", "right", "value", "roots", "tree_weights", "depths")}
+        arrays["coef"] = self.coef_
+        save_arrays(path, arrays, {"bias": self.bias, "signature": self.signature})
+
+    @classmethod
+    def load(cls, path: str = FLAT_MODEL_PATH, mmap: bool = True) -> "FlatTreeModel":
+        arrays, meta = load_arrays(path, mmap=mmap)
+        return cls(arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"], arrays["value"],
+                   arrays["roots"], arrays["tree_weights"], arrays["depths"], arrays["coef"],
+                   meta["bias"], meta["signature"])
+
+
+def export_flat_model(model, path: str = FLAT_MODEL_PATH) -> FlatTreeModel:
+    """
+    Flatten and save a tree/ensemble model for the serving fast path.
+    """
+    flat = FlatTreeModel.from_model(model)
+    flat.save(path)
+    logger.info(f"💾 Flat model ({len(flat.roots)} trees, {len(flat.value)} nodes) saved to: {path}")
+    return flat
+
+
+def load_flat_model(model, path: str = FLAT_MODEL_PATH):
+    """
+    Memory-map the flat export if it exists and was built from `model`.
+    Returns None otherwise so callers fall back to model.predict.
+    """
+    if not os.path.exists(path) or hasattr(model, "coef_") or not can_flatten(model):
+        return None
+    flat = FlatTreeModel.load(path)
+    if not flat.matches(model):
+        logger.warning(f"Flat model at {path} is stale; using the pickled model instead.")
+        return None
+    return flat
+
+
+def check_parity(flat: FlatTreeModel, model, X: np.ndarray) -> float:
+    """
+    Max relative difference between the flat predictor and model.predict.
+    """
+    expected = model.predict(X)
+    scale = np.maximum(np.abs(expected), 1.0)
+    return float(np.max(np.abs(flat.predict(X) - expected) / scale))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the flat tree model and check parity.")
+    parser.add_argument("--model", default="artifacts/model/model.pkl")
+    parser.add_argument("--scaler", default="artifacts/scaler/minmax_scaler.pkl")
+    parser.add_argument("--output", default=FLAT_MODEL_PATH)
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+    flat = export_flat_model(model, args.output)
+
+    X = sample_raw_features(scaler)
+    X[:, SCALED_COLUMNS] = scaler.transform(X[:, SCALED_COLUMNS])
+    diff = check_parity(FlatTreeModel.load(args.output), model, X)
+    print(f"Max relative difference vs model.predict: {diff:.3e}")
+    if diff > args.rtol:
+        raise SystemExit(f"Parity check failed (> {args.rtol})")
@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import os
+import threading
+import joblib
+import numpy as np
+from src.config.model_config import FEATURE_COLUMNS, CONTINUOUS_COLUMNS, FUSED_MODEL_PATH
+from src.utils.logger import logger
+
+SCALED_COLUMNS = [FEATURE_COLUMNS.index(col) for col in CONTINUOUS_COLUMNS]
+
+
+def source_signature(model, scaler) -> str:
+    """
+    Fingerprint of the (model, scaler) pair a fused artifact was built from,
+    so a stale export is never paired with a retrained model.
+    """
+    h = hashlib.sha256()
+    for arr in (model.coef_, np.atleast_1d(model.intercept_), scaler.scale_, scaler.min_):
+        h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def fuse_linear_model(model, scaler) -> tuple:
+    """
+    Fold MinMaxScaler into the linear coefficients.
+
+    The scaler computes x' = x * scale_ + min_ on the continuous columns, so
+    w . x' + b == w' . x + b' with w'_j = w_j * scale_ and b' = b + sum(w_j * min_).
+    """
+    if not hasattr(model, "coef_"):
+        raise TypeError(f"Only linear models can be fused, got {type(model).__name__}")
+
+    coef = np.array(model.coef_, dtype=np.float64).ravel()
+    intercept = float(np.ravel(model.intercept_)[0])
+    for k, j in enumerate(SCALED_COLUMNS):
+        intercept += coef[j] * scaler.min_[k]
+        coef[j] *= scaler.scale_[k]
+    return coef, intercept
+
+
+class FusedLinearModel:
+    """
+    Raw features in -> price out, as a single dot product.
+
+    predict_one takes a float64 row array as is; any other row (the
+    request path's encoded list) is copied element-wise into a per-thread
+    float64 buffer, so no new array is built per call, but the copy is.
+    """
+
+    def __init__(self, coef, intercept: float, signature: str = ""):
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.signature = signature
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _buffer(self) -> np.ndarray:
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = np.empty(len(self.coef_), dtype=np.float64)
+        return buf
+
+    def predict_one(self, values) -> float:
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            row = values
+        else:
+            row = self._buffer()
+            row[:] = values
+        return float(row.dot(self.coef_)) + self.intercept_
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def matches(self, model, scaler) -> bool:
+        return self.signature == source_signature(model, scaler)
+
+    def save(self, path: str = FUSED_MODEL_PATH):
+        # temp file + os.replace, like every other artifact, so a reader never sees a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, coef=self.coef_, intercept=self.intercept_, signature=self.signature)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = FUSED_MODEL_PATH) -> "FusedLinearModel":
+        with np.load(path) as data:
+            return cls(data["coef"], float(data["intercept"]), str(data["signature"]))
+
+
+def export_fused_model(model, scaler, path: str = FUSED_MODEL_PATH) -> FusedLinearModel:
+    """
+    Build and save the fused inference artifact for a linear model + scaler pair.
+    """
+    coef, intercept = fuse_linear_model(model, scaler)
+    fused = FusedLinearModel(coef, intercept, source_signature(model, scaler))
+    fused.save(path)
+    logger.info(f"💾 Fused linear model saved to: {path}")
+    return fused
+
+
+def load_fused_model(model, scaler, path: str = FUSED_MODEL_PATH):
+    """
+    Load the fused artifact if it exists and was built from this model/scaler.
+    Returns None otherwise so callers fall back to the two-step pipeline.
+    """
+    if not os.path.exists(path) or not hasattr(model, "coef_"):
+        return None
+    fused = FusedLinearModel.load(path)
+    if not fused.matches(model, scaler):
+        logger.warning(f"Fused model at {path} is stale; using scaler + model instead.")
+        return None
+    return fused
+
+
+def check_parity(fused: FusedLinearModel, model, scaler, X_raw: np.ndarray) -> float:
+    """
+    Max relative difference between the fused predictor and scaler.transform + model.predict.
+    """
+    X_scaled = np.array(X_raw, dtype=np.float64)
+    X_scaled[:, SCALED_COLUMNS] = scaler.transform(X_scaled[:, SCALED_COLUMNS])
+    expected = model.predict(X_scaled)
+    actual = fused.predict(X_raw)
+    single = np.array([fused.predict_one(row) for row in X_raw])
+    scale = np.maximum(np.abs(expected), 1.0)
+    return float(max(np.max(np.abs(actual - expected) / scale),
+                     np.max(np.abs(single - expected) / scale)))
+
+
+def sample_raw_features(scaler, n_rows: int = 1000, seed: int = 42) -> np.ndarray:
+    """
+    Random raw feature rows spanning the scaler's fitted range (and a bit beyond).
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 5, size=(n_rows, len(FEATURE_COLUMNS))).astype(np.float64)
+    for k, j in enumerate(SCALED_COLUMNS):
+        lo, hi = scaler.data_min_[k], scaler.data_max_[k]
+        span = (hi - lo) or 1.0
+        X[:, j] = rng.uniform(lo - 0.1 * span, hi + 0.1 * span, size=n_rows)
+    return X
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the fused linear model and check parity.")
+    parser.add_argument("--model", default="artifacts/model/model.pkl")
+    parser.add_argument("--scaler", default="artifacts/scaler/minmax_scaler.pkl")
+    parser.add_argument("--output", default=FUSED_MODEL_PATH)
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+    fused = export_fused_model(model, scaler, args.output)
+
+    diff = check_parity(fused, model, scaler, sample_raw_features(scaler))
+    print(f"Max relative difference vs scaler + model: {diff:.3e}")
+    if diff > args.rtol:
+        raise SystemExit(f"Parity check failed (> {args.rtol})")
@@ -0,0 +1,430 @@
+import argparse
+import io
+import json
+import math
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, VotingRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.preprocessing import MinMaxScaler
+from src.config.model_config import (
+    MANIFEST_PATH,
+    CATEGORICAL_COLUMNS,
+    CATEGORY_COUNTS_PATH,
+    CONTINUOUS_COLUMNS,
+    ENCODER_PATHS,
+    FEATURE_COLUMNS,
+    INCREMENTAL_MAX_GROWTH,
+    INCREMENTAL_MAX_UPDATES,
+    INCREMENTAL_STATE_PATH,
+    MODEL_PATH,
+    SCALER_PATH,
+)
+from src.ml_pipeline.normalize import TARGET_COLUMN
+from src.models.encoding import VocabularyEncoder, load_category_counts
+from src.models.flat_model import can_flatten, export_flat_model
+from src.models.fused_model import export_fused_model
+from src.models.model_holder import BundleValidationError, check_manifest, publish_bundle_manifest
+from src.models.registry import publish_artifact, read_manifest
+from src.models.tuning import build_ensemble
+from src.utils.logger import logger
+
+INCREMENTAL_BACKENDS = ("linear", "ensemble")
+
+SCALED_COLUMNS = [FEATURE_COLUMNS.index(col) for col in CONTINUOUS_COLUMNS]
+
+
+class SourceRewrittenError(ValueError):
+    """Raised when the training data was rewritten instead of appended to."""
+
+
+class StreamingLinearRegression(RegressorMixin, BaseEstimator):
+    """
+    Ordinary least squares kept as running sums Z'Z and Z'y (Z = [X, 1]).
+
+    partial_fit on new rows gives the coefficients a LinearRegression refit
+    on every row seen so far would, without touching the old rows again.
+    """
+
+    def fit(self, X, y):
+        for attr in ("gram_", "moment_", "n_samples_"):
+            self.__dict__.pop(attr, None)
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        Z = np.column_stack([np.asarray(X, dtype=np.float64), np.ones(len(X))])
+        y = np.asarray(y, dtype=np.float64)
+        if not hasattr(self, "gram_"):
+            self.gram_ = np.zeros((Z.shape[1], Z.shape[1]))
+            self.moment_ = np.zeros(Z.shape[1])
+            self.n_samples_ = 0
+            self.n_features_in_ = Z.shape[1] - 1
+        self.gram_ += Z.T @ Z
+        self.moment_ += Z.T @ y
+        self.n_samples_ += len(y)
+        self._solve()
+        return self
+
+    def rescale(self, columns, a, b):
+        """
+        Re-express the sums after feature j changed to a[j] * x + b[j].
+        """
+        T = np.eye(len(self.moment_))
+        T[columns, columns] = a
+        T[-1, columns] = b
+        self.gram_ = T.T @ self.gram_ @ T
+        self.moment_ = T.T @ self.moment_
+        self._solve()
+
+    def _solve(self):
+        w = np.linalg.lstsq(self.gram_, self.moment_, rcond=None)[0]
+        self.coef_ = w[:-1]
+        self.intercept_ = float(w[-1])
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+def incremental_regressor(backend: str = "linear", random_state: int = 42):
+    """
+    Unfitted regressor for `backend` whose parts can all be updated in place.
+    """
+    if backend == "linear":
+        return StreamingLinearRegression()
+    if backend == "ensemble":
+        return build_ensemble(random_state=random_state).set_params(lr=StreamingLinearRegression())
+    raise ValueError(f"backend must be one of {INCREMENTAL_BACKENDS}, got {backend!r}")
+
+
+def rescale_model(model, columns, a, b):
+    """
+    Keep a fitted model consistent after the scaler's range moved, so that
+    scaled feature j of a row is now a[j] * (its old value) + b[j]: the
+    linear sums are transformed and tree thresholds are moved with the data.
+
+    The linear part is exact. Trees compare float32 inputs, so a row whose
+    value is within float32 rounding of a split (forests do split between
+    near-duplicate values) can land on the other side afterwards.
+    """
+    if isinstance(model, StreamingLinearRegression):
+        model.rescale(columns, a, b)
+    elif isinstance(model, VotingRegressor):
+        for est in model.estimators_:
+            rescale_model(est, columns, a, b)
+    elif isinstance(model, (RandomForestRegressor, GradientBoostingRegressor)):
+        trees = model.estimators_ if isinstance(model, RandomForestRegressor) else model.estimators_[:, 0]
+        for tree in trees:
+            threshold, feature = tree.tree_.threshold, tree.tree_.feature
+            for col, scale, shift in zip(columns, a, b):
+                nodes = feature == col
+                threshold[nodes] = threshold[nodes] * scale + shift
+    else:
+        raise TypeError(f"Cannot rescale {type(model).__name__}")
+
+
+def grow_model(model, X, y, share: float):
+    """
+    Update a fitted model with new rows. `share` is the new rows' fraction
+    of all rows seen: forests get that fraction of extra trees and boosting
+    that fraction of extra stages, trained on the new rows (warm_start).
+    """
+    if isinstance(model, StreamingLinearRegression):
+        model.partial_fit(X, y)
+    elif isinstance(model, VotingRegressor):
+        for est in model.estimators_:
+            grow_model(est, X, y, share)
+    elif isinstance(model, (RandomForestRegressor, GradientBoostingRegressor)):
+        n_estimators = len(model.estimators_)
+        extra = max(1, math.ceil(n_estimators * share))
+        model.set_params(warm_start=True, n_estimators=n_estimators + extra).fit(X, y)
+    else:
+        raise TypeError(f"Cannot update {type(model).__name__} incrementally")
+
+
+def extend_vocabulary(encoder, values) -> VocabularyEncoder:
+    """
+    Add categories the encoder has not seen, keeping every existing code.
+    A LabelEncoder (from a full train_model run) is converted to a
+    VocabularyEncoder with the same codes first, since appending to its
+    sorted classes_ would break LabelEncoder.transform.
+    """
+    if not isinstance(encoder, VocabularyEncoder):
+        encoder = VocabularyEncoder(encoder.classes_)
+    encoder.extend(values)
+    return encoder
+
+
+class TrainedArtifacts:
+    """
+    Model plus the preprocessing fitted alongside it.
+    """
+
+    def __init__(self, model, scaler: MinMaxScaler, encoders: dict, category_counts: dict):
+        self.model = model
+        self.scaler = scaler
+        self.encoders = encoders
+        self.category_counts = category_counts
+
+
+def _features(df: pd.DataFrame, encoders: dict) -> np.ndarray:
+    X = np.empty((len(df), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        if col in encoders:
+            lookup = {c: i for i, c in enumerate(encoders[col].classes_.tolist())}
+            X[:, j] = df[col].astype(str).map(lookup).to_numpy(dtype=np.float64)
+        else:
+            X[:, j] = df[col].to_numpy(dtype=np.float64)
+    return X
+
+
+def fit_preprocessing(df: pd.DataFrame) -> tuple:
+    """
+    Fit encoders and scaler on every row of `df`. Returns (X, artifacts):
+    the feature matrix encoded and scaled the way the serving path does it,
+    and a TrainedArtifacts holding the preprocessing (model still None).
+    """
+    encoders, counts = {}, {}
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col].astype(str)
+        encoders[col] = VocabularyEncoder().fit(values)
+        counts[col] = values.value_counts().to_dict()
+    X = _features(df, encoders)
+    scaler = MinMaxScaler().fit(X[:, SCALED_COLUMNS])
+    X[:, SCALED_COLUMNS] = scaler.transform(X[:, SCALED_COLUMNS])
+    return X, TrainedArtifacts(None, scaler, encoders, counts)
+
+
+def fit_full(df: pd.DataFrame, backend: str = "linear") -> TrainedArtifacts:
+    """
+    Encoders, scaler and model from scratch on every row of `df`.
+    """
+    X, artifacts = fit_preprocessing(df)
+    artifacts.model = incremental_regressor(backend).fit(X, df[TARGET_COLUMN].to_numpy(dtype=np.float64))
+    return artifacts
+
+
+def update(artifacts: TrainedArtifacts, df: pd.DataFrame, rows_seen: int) -> float:
+    """
+    Fold new rows into `artifacts` in place: grow the vocabularies and the
+    scaler range (remapping the model when the range moves), then update
+    the model. Returns the RMSE on the new rows before they were learned.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col].astype(str)
+        artifacts.encoders[col] = extend_vocabulary(artifacts.encoders[col], values.unique())
+        counts = artifacts.category_counts.setdefault(col, {})
+        for value, n in values.value_counts().items():
+            counts[value] = counts.get(value, 0) + int(n)
+
+    X = _features(df, artifacts.encoders)
+    y = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    scaler = artifacts.scaler
+    old_scale, old_min = scaler.scale_.copy(), scaler.min_.copy()
+    X_old = X.copy()
+    X_old[:, SCALED_COLUMNS] = scaler.transform(X[:, SCALED_COLUMNS])
+    rmse = float(np.sqrt(mean_squared_error(y, artifacts.model.predict(X_old))))
+
+    scaler.partial_fit(X[:, SCALED_COLUMNS])
+    if not (np.array_equal(old_scale, scaler.scale_) and np.array_equal(old_min, scaler.min_)):
+        a = scaler.scale_ / old_scale
+        rescale_model(artifacts.model, SCALED_COLUMNS, a, scaler.min_ - old_min * a)
+        logger.info(f"Scaler range moved to {scaler.data_min_} - {scaler.data_max_}; model remapped.")
+    X[:, SCALED_COLUMNS] = scaler.transform(X[:, SCALED_COLUMNS])
+    grow_model(artifacts.model, X, y, share=len(df) / (rows_seen + len(df)))
+    return rmse
+
+
+def append_rows(df: pd.DataFrame, data_path: str):
+    """
+    Append cleaned rows to the CSV training store (writing the header for a
+    new file). The store is append-only, which is what lets read_new_rows
+    pick up exactly the rows after its watermark.
+    """
+    if os.path.exists(data_path):
+        header = pd.read_csv(data_path, nrows=0).columns
+        df.reindex(columns=header).to_csv(data_path, mode="a", header=False, index=False)
+    else:
+        os.makedirs(os.path.dirname(data_path) or ".", exist_ok=True)
+        df.to_csv(data_path, index=False)
+
+
+def start_position(data_path: str) -> dict:
+    if os.path.isdir(data_path) or data_path.endswith(".parquet"):
+        return {"files": []}
+    return {"offset": 0}
+
+
+def read_new_rows(data_path: str, position: dict, columns: list = None, dtype: dict = None) -> tuple:
+    """
+    Rows added to `data_path` after `position`, and the position after them.
+
+    CSV files are read from a byte offset (only whole lines, so a row being
+    appended right now is left for the next run); Parquet datasets by the
+    files not read before.
+    """
+    if "files" in position:
+        seen = set(position["files"])
+        files = sorted(ds.dataset(data_path, format="parquet").files)
+        if not seen.issubset(files):
+            raise SourceRewrittenError(f"Parquet files under {data_path} were removed or replaced")
+        new_files = [f for f in files if f not in seen]
+        df = (ds.dataset(new_files, format="parquet").to_table(columns=columns).to_pandas()
+              if new_files else pd.DataFrame(columns=columns))
+        return df, {"files": files}
+
+    with open(data_path, "rb") as f:
+        header = f.readline()
+        offset = max(position["offset"], len(header))
+        if os.fstat(f.fileno()).st_size < offset:
+            raise SourceRewrittenError(f"{data_path} is shorter than the last read position")
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        return pd.DataFrame(columns=columns), {"offset": offset}
+    df = pd.read_csv(io.BytesIO(header + data[:end]), usecols=columns, dtype=dtype)
+    return df, {"offset": offset + end}
+
+
+def load_state(path: str = INCREMENTAL_STATE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = INCREMENTAL_STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def full_retrain_reason(state, data_path: str, backend: str, n_new: int = 0,
+                        max_updates: int = INCREMENTAL_MAX_UPDATES, max_growth: float = INCREMENTAL_MAX_GROWTH):
+    """
+    Why the next run must retrain from scratch, or None when an incremental
+    update is allowed. Updates stack new trees/stages on top of old ones and
+    never revisit old splits, so the policy bounds how far they can drift.
+    """
+    if state is None:
+        return "no incremental state"
+    if state["data_path"] != data_path or state["backend"] != backend:
+        return "data path or backend changed"
+    if state["updates_since_full"] >= max_updates:
+        return f"{max_updates} incremental updates since the last full retrain"
+    if state["rows_since_full"] + n_new > max_growth * state["rows_at_full"]:
+        return f"data grew more than {max_growth:.0%} since the last full retrain"
+    return None
+
+
+def published_bundle_reason(state):
+    """
+    Why the artifacts on disk cannot be updated in place, or None. They must
+    be exactly the bundle the state was saved with: a run that died between
+    publishing and saving its state, or halfway through publishing, leaves
+    a model and encoders that do not belong together.
+    """
+    manifest = read_manifest(MANIFEST_PATH)
+    if manifest is None or manifest["version"] != state.get("bundle"):
+        return "the published bundle is not the one the incremental state was saved with"
+    try:
+        check_manifest(manifest)
+    except BundleValidationError as e:
+        return f"the published bundle is incomplete ({e})"
+    return None
+
+
+def publish(artifacts: TrainedArtifacts, model_path: str = MODEL_PATH) -> dict:
+    """
+    Publish model, encoders, category counts and scaler, then the manifest
+    that makes them one bundle (servers load nothing before it). Returns the manifest.
+    """
+    publish_artifact(artifacts.model, model_path)
+    for col, encoder in artifacts.encoders.items():
+        publish_artifact(encoder, ENCODER_PATHS[col])
+    with open(CATEGORY_COUNTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(artifacts.category_counts, f, indent=4)
+    publish_artifact(artifacts.scaler, SCALER_PATH)
+    if hasattr(artifacts.model, "coef_"):
+        export_fused_model(artifacts.model, artifacts.scaler)
+    elif can_flatten(artifacts.model):
+        export_flat_model(artifacts.model)
+    return publish_bundle_manifest()
+
+
+def train_incremental(data_path: str = "notebooks/data/processed/clean_df.csv", model_path: str = MODEL_PATH,
+                      backend: str = "linear", full: bool = False, state_path: str = INCREMENTAL_STATE_PATH) -> dict:
+    """
+    Update the published model with the rows appended to `data_path` since
+    the last run, or retrain from scratch when asked to or when
+    full_retrain_reason says so. Returns a summary of what was done.
+    """
+    start = time.perf_counter()
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    # categories are read as text, so a chunk with missing values cannot turn "2" into "2.0"
+    dtype = {col: str for col in CATEGORICAL_COLUMNS}
+    state = load_state(state_path)
+    reason = "requested" if full else full_retrain_reason(state, data_path, backend)
+    if reason is None and not os.path.exists(model_path):
+        reason = f"{model_path} is missing"
+    if reason is None:
+        reason = published_bundle_reason(state)
+
+    new = None
+    if reason is None:
+        try:
+            new, position = read_new_rows(data_path, state["position"], columns, dtype)
+        except SourceRewrittenError as e:
+            reason = str(e)
+    if reason is None:
+        new = new.dropna()
+        if new.empty:
+            logger.info(f"No new rows in {data_path}; model unchanged.")
+            return {"mode": "none", "new_rows": 0, "seconds": time.perf_counter() - start}
+        reason = full_retrain_reason(state, data_path, backend, len(new))
+
+    if reason is None:
+        artifacts = TrainedArtifacts(
+            model=joblib.load(model_path),
+            scaler=joblib.load(SCALER_PATH),
+            encoders={col: joblib.load(path) for col, path in ENCODER_PATHS.items()},
+            category_counts=load_category_counts(),
+        )
+        rmse = update(artifacts, new, state["rows_total"])
+        state.update(position=position, rows_total=state["rows_total"] + len(new),
+                     rows_since_full=state["rows_since_full"] + len(new),
+                     updates_since_full=state["updates_since_full"] + 1)
+        info = {"mode": "incremental", "new_rows": len(new), "rmse_new_rows": rmse}
+        logger.info(f"➕ Incremental update with {len(new)} rows (RMSE on them before the update: {rmse:,.0f}).")
+    else:
+        logger.info(f"🔁 Full retrain: {reason}.")
+        df, position = read_new_rows(data_path, start_position(data_path), columns, dtype)
+        df = df.dropna()
+        artifacts = fit_full(df, backend)
+        state = {"data_path": data_path, "backend": backend, "position": position, "rows_total": len(df),
+                 "rows_at_full": len(df), "rows_since_full": 0, "updates_since_full": 0}
+        info = {"mode": "full", "reason": reason, "new_rows": len(df)}
+
+    state["bundle"] = publish(artifacts, model_path)["version"]
+    save_state(state, state_path)
+    info["seconds"] = time.perf_counter() - start
+    logger.info(f"✅ {info['mode'].capitalize()} training done in {info['seconds']:.2f}s.")
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the serving model with newly appended training rows.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--backend", choices=INCREMENTAL_BACKENDS, default="linear")
+    parser.add_argument("--full", action="store_true", help="retrain from scratch regardless of the policy")
+    args = parser.parse_args()
+
+    print(train_incremental(args.data_path, args.model_path, args.backend, args.full))
@@ -0,0 +1,262 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+import joblib
+import numpy as np
+from src.config.model_config import (
+    MODEL_PATH,
+    SCALER_PATH,
+    ENCODER_PATHS,
+    FUSED_MODEL_PATH,
+    FLAT_MODEL_PATH,
+    MANIFEST_PATH,
+    FEATURE_FIELDS,
+    MODEL_MMAP,
+    FLAT_MODEL_ONLY,
+)
+from src.models.encoding import compile_encoder
+from src.models.flat_model import load_flat_model
+from src.models.fused_model import load_fused_model
+from src.models.registry import registry, file_digest, mmap_load, publish_manifest, read_manifest
+from src.utils.logger import logger
+
+SERVING_PATHS = (MODEL_PATH, SCALER_PATH, *ENCODER_PATHS.values(), FUSED_MODEL_PATH, FLAT_MODEL_PATH)
+
+
+class BundleValidationError(ValueError):
+    """Raised when a freshly loaded bundle fails the canned-input check."""
+
+
+class ModelBundle:
+    """
+    One consistent version of everything the prediction path needs:
+    model, scaler, compiled encoders and (optionally) the fused linear model
+    or the memory-mapped flat tree model.
+    """
+
+    def __init__(self, model, scaler, encoders: dict, fused=None, version: str = "",
+                 stamp: tuple = (), load_seconds: float = 0.0, flat=None):
+        self.model = model
+        self.scaler = scaler
+        self.encoders = encoders
+        self.fused = fused
+        self.flat = flat
+        self.version = version
+        self.stamp = stamp
+        self.loaded_at = datetime.now(timezone.utc)
+        self.load_seconds = load_seconds
+        self.memory_bytes = estimate_memory(model, scaler, encoders, fused)
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "model_type": type(self.model).__name__,
+            "fused": self.fused is not None,
+            "flat": self.flat is not None,
+            "loaded_at": self.loaded_at.isoformat(),
+            "load_seconds": round(self.load_seconds, 4),
+            "memory_bytes": self.memory_bytes,
+        }
+
+
+def estimate_memory(*objects) -> int:
+    """
+    Approximate in-memory footprint: the nbytes of every numpy array
+    reachable from the bundle parts (tree nodes, coefficients, classes).
+    Nothing is copied or serialized, so it is cheap on every reload.
+    """
+    total = 0
+    # id -> object: holding on to the visited objects (some are temporary
+    # __getstate__ dicts) keeps their ids from being reused during the walk
+    seen = {}
+    pending = list(objects)
+    while pending:
+        obj = pending.pop()
+        if obj is None or isinstance(obj, (str, bytes, int, float)) or id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        if isinstance(obj, np.ndarray):
+            total += obj.nbytes
+            if obj.dtype == object:
+                pending.extend(obj.ravel().tolist())
+        elif isinstance(obj, dict):
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            pending.extend(obj)
+        else:
+            # estimators keep their arrays in __dict__; sklearn's Cython trees
+            # expose theirs through __getstate__ (views, not copies)
+            try:
+                state = obj.__getstate__()
+            except Exception:
+                continue
+            pending.append(state)
+    return total
+
+
+def bundle_stamp(paths=SERVING_PATHS) -> tuple:
+    return tuple(registry.stamp(p) for p in (*paths, MANIFEST_PATH))
+
+
+def publish_bundle_manifest(paths=SERVING_PATHS) -> dict:
+    """
+    Mark the artifacts now on disk as one bundle; trainers call this after
+    their last artifact is published.
+    """
+    return publish_manifest(paths, MANIFEST_PATH)
+
+
+def bundle_version(paths=SERVING_PATHS) -> str:
+    """
+    Short content hash over every artifact in the bundle.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        if registry.stamp(path) is not None:
+            h.update(file_digest(path).encode())
+    return h.hexdigest()[:12]
+
+
+def check_manifest(manifest: dict, paths=SERVING_PATHS):
+    """
+    Raise BundleValidationError unless every artifact on disk is the one
+    the manifest was published with (otherwise a trainer is mid-publish).
+    """
+    for path in paths:
+        expected = manifest["files"].get(path)
+        actual = file_digest(path) if registry.stamp(path) is not None else None
+        if actual != expected:
+            raise BundleValidationError(f"{path} does not match bundle {manifest['version']} "
+                                        f"(publish in progress?)")
+
+
+def load_bundle() -> ModelBundle:
+    """
+    Load every serving artifact as one version. With a manifest the files
+    must match it; either way, artifacts replaced while loading make the
+    load fail (and the poller retry) rather than mix two versions.
+    """
+    start = time.perf_counter()
+    stamp = bundle_stamp()
+    manifest = read_manifest(MANIFEST_PATH)
+    model = registry.load(MODEL_PATH, loader=mmap_load if MODEL_MMAP else joblib.load)
+    scaler = registry.load(SCALER_PATH)
+    encoders = {col: compile_encoder(registry.load(path), col) for col, path in ENCODER_PATHS.items()}
+    fused = load_fused_model(model, scaler)
+    flat = None if fused is not None else load_flat_model(model)
+    if flat is not None and FLAT_MODEL_ONLY:
+        # the flat export is shared page cache; the unpickled trees would be private per worker
+        registry.discard(MODEL_PATH)
+        model = flat
+
+    if bundle_stamp() != stamp:
+        raise BundleValidationError("Artifacts changed while loading (publish in progress?)")
+    if manifest is not None:
+        check_manifest(manifest)
+    version = manifest["version"] if manifest is not None else bundle_version()
+    return ModelBundle(model, scaler, encoders, fused, version=version,
+                       stamp=stamp, load_seconds=time.perf_counter() - start, flat=flat)
+
+
+def canned_inputs(bundle: ModelBundle) -> dict:
+    """
+    Columnar inputs covering every known category with a few typical sizes.
+    """
+    n_rows = max(len(enc.classes_) for enc in bundle.encoders.values()) * 3
+    columns = {
+        "Bathroom": [1, 2, 3] * (n_rows // 3),
+        "Price_per_Sqft": [4000.0, 6500.0, 9000.0] * (n_rows // 3),
+        "Total_Area": [650.0, 1200.0, 1900.0] * (n_rows // 3),
+        "Covered_parking": [0, 1, 2] * (n_rows // 3),
+        "Open_parking": [0, 0, 1] * (n_rows // 3),
+        "BHK": [1, 2, 3] * (n_rows // 3),
+    }
+    for col, enc in bundle.encoders.items():
+        classes = [str(c) for c in enc.classes_]
+        columns[FEATURE_FIELDS[col]] = [classes[i % len(classes)] for i in range(n_rows)]
+    return columns
+
+
+def validate_bundle(bundle: ModelBundle):
+    # imported here to avoid a cycle: predict_model resolves bundles through this module
+    from src.models.predict_model import predict_price_batch
+
+    predictions, errors = predict_price_batch(canned_inputs(bundle), artifacts=bundle)
+    if errors:
+        raise BundleValidationError(f"Canned inputs rejected: {errors[:3]}")
+    if not np.all(np.isfinite(np.asarray(predictions, dtype=np.float64))):
+        raise BundleValidationError("Model produced non-finite predictions on canned inputs")
+
+
+class ModelHolder:
+    """
+    Holds the active ModelBundle and swaps it atomically.
+
+    A reload builds and validates the new bundle off to the side and then
+    replaces a single reference; requests that already picked up the old
+    bundle finish on it.
+    """
+
+    def __init__(self):
+        self._bundle = None
+        self._rejected_stamp = None
+        self._reload_lock = threading.Lock()
+
+    @property
+    def current(self) -> ModelBundle:
+        bundle = self._bundle
+        if bundle is None:
+            bundle = self.reload()
+        return bundle
+
+    @property
+    def loaded(self) -> bool:
+        return self._bundle is not None
+
+    def reload(self, force: bool = False) -> ModelBundle:
+        """
+        Load, validate and activate the bundle on disk. Without `force` this
+        is a no-op when no artifact changed since the active bundle was loaded.
+        """
+        with self._reload_lock:
+            active = self._bundle
+            stamp = bundle_stamp()
+            if not force and active is not None and stamp in (active.stamp, self._rejected_stamp):
+                return active
+
+            bundle = load_bundle()
+            try:
+                validate_bundle(bundle)
+            except BundleValidationError:
+                # keep serving the active bundle; retry once the files change again
+                self._rejected_stamp = stamp
+                raise
+            self._bundle = bundle
+            previous = active.version if active else None
+            logger.info(f"Model bundle {bundle.version} active (previous: {previous}).")
+            return bundle
+
+
+holder = ModelHolder()
+
+
+def get_serving_artifacts() -> ModelBundle:
+    return holder.current
+
+
+def warm() -> ModelBundle:
+    """
+    Load every serving artifact now (e.g. at server startup) instead of on the first request.
+    """
+    bundle = holder.current
+    logger.info("Serving artifacts warmed.")
+    return bundle
+
+
+def refresh() -> ModelBundle:
+    """
+    Swap in a new bundle if any artifact changed on disk. Meant to be polled
+    in the background so requests never pay for the reload.
+    """
+    return holder.reload()
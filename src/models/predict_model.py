@@ -1,31 +1,147 @@
-import joblib
 import numpy as np
 from src.models.schemas import PropertyFeatures
+from src.models.model_holder import get_serving_artifacts
+from src.models.prediction_cache import prediction_cache
+from src.config.model_config import FEATURE_FIELDS, FEATURE_COLUMNS, CONTINUOUS_COLUMNS, FLAT_MODEL_MAX_BATCH
 
-# Load model and transformers
-model = joblib.load("artifacts/model.pkl")
-transaction_encoder = joblib.load("artifacts/encoders/transaction_encoder.pkl")
-furnishing_encoder = joblib.load("artifacts/encoders/furnishing_encoder.pkl")
-possession_encoder = joblib.load("artifacts/encoders/possession_status_encoder.pkl")
-scaler = joblib.load("artifacts/scaler/minmax_scaler.pkl")
-
-def predict_price(data: PropertyFeatures) -> float:
-    encoded = [
-        transaction_encoder.transform([data.Transaction])[0],
-        furnishing_encoder.transform([data.Furnishing])[0],
-        data.Bathroom,
-        data.Price_per_Sqft,
-        data.Total_Area,
-        data.Covered_parking,
-        data.Open_parking,
-        possession_encoder.transform([data.Possession_Status])[0],
-        data.BHK,
+# Model, encoders and scaler come from the active bundle in src/models/model_holder.py
+
+SCALED_COLUMNS = [FEATURE_COLUMNS.index(col) for col in CONTINUOUS_COLUMNS]
+
+def predict_price(data: PropertyFeatures, artifacts=None) -> float:
+    artifacts = artifacts or get_serving_artifacts()
+    if prediction_cache is None:
+        return predict_encoded(encode_features(data, artifacts), artifacts)
+
+    # Repeated listing configurations are served from the LRU cache
+    features = prediction_cache.canonicalize(data)
+    cached = prediction_cache.get(artifacts.version, features)
+    if cached is not None:
+        return cached
+    prediction = predict_encoded(encode_features(features, artifacts), artifacts)
+    prediction_cache.put(artifacts.version, features, prediction)
+    return prediction
+
+
+def encode_features(data, artifacts) -> list:
+    """
+    Encode a PropertyFeatures (or a feature tuple in model column order) into a model row.
+    """
+    if isinstance(data, PropertyFeatures):
+        data = tuple(getattr(data, field) for field in FEATURE_FIELDS.values())
+    encoders = artifacts.encoders
+    return [
+        encoders[col].encode(value) if col in encoders else value
+        for col, value in zip(FEATURE_COLUMNS, data)
     ]
 
+
+def predict_encoded(encoded: list, artifacts) -> float:
+    # Scaler folded into the linear model, when an up-to-date export exists
+    if artifacts.fused is not None:
+        return round(artifacts.fused.predict_one(encoded), 2)
+
     # Normalize continuous columns (index 3 and 4)
-    norm_vals = scaler.transform([encoded[3:5]])[0]
+    norm_vals = artifacts.scaler.transform([encoded[3:5]])[0]
     encoded[3] = norm_vals[0]
     encoded[4] = norm_vals[1]
 
-    prediction = model.predict([encoded])[0]
+    # Flattened trees skip sklearn's per-call validation and per-tree dispatch
+    if artifacts.flat is not None:
+        return round(artifacts.flat.predict_one(encoded), 2)
+
+    prediction = artifacts.model.predict([encoded])[0]
     return round(prediction, 2)
+
+
+def records_to_columns(records: list) -> dict:
+    """
+    Turn a list of PropertyFeatures into the columnar form used by predict_price_batch.
+    """
+    return {field: [getattr(r, field) for r in records] for field in FEATURE_FIELDS.values()}
+
+
+def predict_price_batch(columns: dict, artifacts=None) -> tuple:
+    """
+    Score a whole batch with one scaler.transform and one model.predict call.
+
+    `columns` maps each PropertyFeatures field name to a list of values.
+    Returns (predictions, errors): predictions holds None for rows that could
+    not be encoded and errors lists one entry per offending row/field.
+    """
+    artifacts = artifacts or get_serving_artifacts()
+    n_rows = len(columns["Transaction"])
+    X = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+    valid = np.ones(n_rows, dtype=bool)
+    errors = []
+
+    for j, col in enumerate(FEATURE_COLUMNS):
+        field = FEATURE_FIELDS[col]
+        if col in artifacts.encoders:
+            encoder = artifacts.encoders[col]
+            codes, known = encoder.encode_many(columns[field])
+            X[:, j] = codes
+            if encoder.fallback_code is not None:
+                continue
+            for i in np.flatnonzero(~known):
+                errors.append({
+                    "index": int(i),
+                    "field": field,
+                    "value": columns[field][i],
+                    "message": f"Unknown category for {field}",
+                })
+            valid &= known
+        else:
+            X[:, j] = columns[field]
+
+    predictions = [None] * n_rows
+    if not valid.any():
+        return predictions, errors
+
+    rows = np.flatnonzero(valid)
+    X = X[rows] if len(rows) < n_rows else X
+    if artifacts.fused is not None:
+        scored = np.round(artifacts.fused.predict(X), 2)
+    else:
+        X[:, SCALED_COLUMNS] = artifacts.scaler.transform(X[:, SCALED_COLUMNS])
+        small = artifacts.flat is not None and len(X) <= FLAT_MODEL_MAX_BATCH
+        scored = np.round((artifacts.flat if small else artifacts.model).predict(X), 2)
+
+    for i, value in zip(rows.tolist(), scored.tolist()):
+        predictions[i] = value
+    errors.sort(key=lambda e: e["index"])
+    return predictions, errors
+
+
+def predict_records(records: list, artifacts=None) -> tuple:
+    """
+    predict_price_batch for a list of PropertyFeatures, going through the
+    prediction cache: hits are answered directly and only the misses are
+    scored, in one vectorized call. Same return shape as predict_price_batch.
+    """
+    artifacts = artifacts or get_serving_artifacts()
+    if prediction_cache is None:
+        return predict_price_batch(records_to_columns(records), artifacts)
+
+    predictions = [None] * len(records)
+    missing = []
+    for i, record in enumerate(records):
+        features = prediction_cache.canonicalize(record)
+        cached = prediction_cache.get(artifacts.version, features)
+        if cached is None:
+            missing.append((i, features))
+        else:
+            predictions[i] = cached
+    if not missing:
+        return predictions, []
+
+    fields = list(FEATURE_FIELDS.values())
+    columns = dict(zip(fields, map(list, zip(*(features for _, features in missing)))))
+    scored, errors = predict_price_batch(columns, artifacts)
+    for (i, features), value in zip(missing, scored):
+        predictions[i] = value
+        if value is not None:
+            prediction_cache.put(artifacts.version, features, value)
+    for err in errors:
+        err["index"] = missing[err["index"]][0]
+    return predictions, errors
@@ -0,0 +1,235 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from src.config.model_config import (
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL_SECONDS,
+    PREDICTION_CACHE_AREA_STEP,
+    PREDICTION_CACHE_PPSF_STEP,
+    PREDICTION_CACHE_SQLITE_PATH,
+    PREDICTION_CACHE_SQLITE_MAX_ROWS,
+    PREDICTION_CACHE_SQLITE_PRUNE_EVERY,
+)
+from src.models.schemas import PropertyFeatures
+from src.utils.logger import logger
+
+
+def bucket(value: float, step: float) -> float:
+    """
+    Round `value` to the nearest multiple of `step` (no-op when step is 0).
+    """
+    if not step:
+        return float(value)
+    return float(round(round(value / step) * step, 6))
+
+
+class SQLiteCacheBackend:
+    """
+    Shared second-level cache in a local SQLite file, so uvicorn workers on
+    the same host reuse each other's predictions.
+
+    Every `prune_every` writes a worker deletes the expired rows and those
+    of other model versions, then the oldest rows beyond `max_rows`, so the
+    file stays bounded however long the workers run.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_rows: int = PREDICTION_CACHE_SQLITE_MAX_ROWS,
+                 prune_every: int = PREDICTION_CACHE_SQLITE_PRUNE_EVERY):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.prune_every = max(1, prune_every)
+        self.pruned = 0
+        self._writes = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connect()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(predictions)")]
+        if columns and "version" not in columns:
+            # layout without a version column: it is only a cache, start over
+            conn.execute("DROP TABLE predictions")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(key TEXT PRIMARY KEY, value REAL NOT NULL, expires_at REAL NOT NULL, version TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_predictions_expires_at ON predictions (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connect().execute(
+            "SELECT value FROM predictions WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: float, version: str = ""):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO predictions (key, value, expires_at, version) VALUES (?, ?, ?, ?)",
+            (key, value, time.time() + self.ttl_seconds, version),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune(version)
+
+    def prune(self, version: str) -> int:
+        """
+        Delete expired rows and rows of other model versions, then the
+        soonest-expiring rows beyond max_rows. Returns the rows deleted.
+        """
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM predictions WHERE expires_at <= ? OR version != ?",
+                               (time.time(), version)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_rows
+        if excess > 0:
+            deleted += conn.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY expires_at LIMIT ?)", (excess,)
+            ).rowcount
+        self.pruned += deleted
+        return deleted
+
+    def clear(self):
+        self._connect().execute("DELETE FROM predictions")
+
+
+class PredictionCache:
+    """
+    LRU cache of predictions keyed on a canonical feature tuple.
+
+    Entries expire after `ttl_seconds`, the oldest entry is evicted once
+    `maxsize` is reached, and the whole cache is dropped as soon as a key
+    for a different model version shows up.
+    """
+
+    def __init__(self, maxsize: int = PREDICTION_CACHE_SIZE,
+                 ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS,
+                 area_step: float = PREDICTION_CACHE_AREA_STEP,
+                 ppsf_step: float = PREDICTION_CACHE_PPSF_STEP,
+                 backend: SQLiteCacheBackend = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.area_step = area_step
+        self.ppsf_step = ppsf_step
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def canonicalize(self, data: PropertyFeatures) -> tuple:
+        """
+        Feature values in model column order, with area and price per sqft
+        bucketed. Predictions are computed from these values, so every
+        request that maps to a key gets the same answer.
+        """
+        return (
+            data.Transaction,
+            data.Furnishing,
+            data.Bathroom,
+            bucket(data.Price_per_Sqft, self.ppsf_step),
+            bucket(data.Total_Area, self.area_step),
+            data.Covered_parking,
+            data.Open_parking,
+            data.Possession_Status,
+            data.BHK,
+        )
+
+    def _check_version(self, version: str):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, version: str, features: tuple):
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(features)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(features)
+                    self.hits += 1
+                    return value
+                del self._entries[features]
+                self.expirations += 1
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(json.dumps([version, *features]))
+            except sqlite3.Error as e:
+                logger.warning(f"Shared prediction cache read failed: {e}")
+                value = None
+            if value is not None:
+                self.shared_hits += 1
+                self._store(version, features, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, version: str, features: tuple, value: float):
+        self._store(version, features, value)
+        if self.backend is not None:
+            try:
+                self.backend.put(json.dumps([version, *features]), value, version)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared prediction cache write failed: {e}")
+
+    def _store(self, version: str, features: tuple, value: float):
+        with self._lock:
+            self._check_version(version)
+            self._entries[features] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(features)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "model_version": self._version,
+        }
+
+
+def build_prediction_cache():
+    if PREDICTION_CACHE_SIZE <= 0:
+        return None
+    backend = None
+    if PREDICTION_CACHE_SQLITE_PATH:
+        backend = SQLiteCacheBackend(PREDICTION_CACHE_SQLITE_PATH, PREDICTION_CACHE_TTL_SECONDS)
+    return PredictionCache(backend=backend)
+
+
+prediction_cache = build_prediction_cache()
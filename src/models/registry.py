@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+import joblib
+from src.config.model_config import ARTIFACT_FINGERPRINT
+from src.utils.logger import logger
+
+
+def publish_artifact(obj, path: str, compress: int = 0):
+    """
+    Write an artifact atomically: dump to a temp file next to `path`, then
+    os.replace it, so readers only ever see the old or the new file.
+
+    Artifacts are uncompressed by default: joblib then stores numpy arrays
+    as aligned raw buffers that mmap_load can map instead of copy.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(obj, tmp_path, compress=compress)
+    os.replace(tmp_path, path)
+    logger.info(f"💾 Published artifact: {path}")
+
+
+def publish_manifest(paths, manifest_path: str) -> dict:
+    """
+    Record the digest of every artifact in `paths` (None when absent) and a
+    version id over them, written atomically after the artifacts themselves.
+    A loader that finds files not matching the manifest is looking at a
+    publish still in progress.
+    """
+    files = {path: file_digest(path) if os.path.exists(path) else None for path in paths}
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:12]
+    manifest = {"version": version, "files": files}
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, manifest_path)
+    logger.info(f"💾 Published bundle {version}: {manifest_path}")
+    return manifest
+
+
+def read_manifest(manifest_path: str):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def mmap_load(path: str):
+    """
+    joblib.load with the numpy arrays memory-mapped read-only, so processes
+    loading the same file share those pages instead of holding private copies.
+    """
+    return joblib.load(path, mmap_mode="r")
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _Entry:
+    def __init__(self, stamp, value, digest=None):
+        self.stamp = stamp
+        self.value = value
+        self.digest = digest
+
+
+class ArtifactRegistry:
+    """
+    Process-wide cache of loaded artifacts.
+
+    Nothing is loaded until first use. Each entry remembers the file's
+    (mtime, size) stamp, so a newer artifact on disk is picked up on the
+    next access; with fingerprint="hash" a changed stamp only triggers a
+    reload when the content hash changed too.
+    """
+
+    def __init__(self, fingerprint: str = ARTIFACT_FINGERPRINT):
+        if fingerprint not in ("mtime", "hash"):
+            raise ValueError(f"fingerprint must be 'mtime' or 'hash', got {fingerprint!r}")
+        self.fingerprint = fingerprint
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def stamp(path: str):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, path: str, loader=joblib.load):
+        """
+        Return the artifact at `path`, loading it with `loader` on first use
+        or when the file changed since it was cached.
+        """
+        key = (path, loader)
+        stamp = self.stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(f"Artifact not found: {path}")
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.stamp == stamp:
+            return entry.value
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                return entry.value
+
+            digest = file_digest(path) if self.fingerprint == "hash" else None
+            if entry is not None and digest is not None and digest == entry.digest:
+                entry.stamp = stamp
+                return entry.value
+
+            value = loader(path)
+            self._entries[key] = _Entry(stamp, value, digest)
+            logger.info(f"Loaded artifact: {path}")
+            return value
+
+    def discard(self, path: str):
+        """
+        Drop every cached entry for `path`, whichever loader produced it.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+registry = ArtifactRegistry()
+
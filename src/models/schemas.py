@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import List
+from pydantic import BaseModel, model_validator
 
 class PropertyFeatures(BaseModel):
     Transaction: str
@@ -10,3 +11,25 @@ class PropertyFeatures(BaseModel):
     Open_parking: int
     Possession_Status: str
     BHK: int
+
+
+class PropertyColumns(BaseModel):
+    """
+    Columnar form of a batch: one list per feature, all of the same length.
+    """
+    Transaction: List[str]
+    Furnishing: List[str]
+    Bathroom: List[int]
+    Price_per_Sqft: List[float]
+    Total_Area: List[float]
+    Covered_parking: List[int]
+    Open_parking: List[int]
+    Possession_Status: List[str]
+    BHK: List[int]
+
+    @model_validator(mode="after")
+    def check_equal_lengths(self):
+        lengths = {len(getattr(self, field)) for field in type(self).model_fields}
+        if len(lengths) > 1:
+            raise ValueError("All feature columns must have the same length")
+        return self
@@ -1,24 +1,33 @@
 import os 
-import pandas as pd 
-import joblib
+import argparse
+import json
 import mlflow
 from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import LabelEncoder, MinMaxScaler
 from src.utils.logger import logger
+from src.ml_pipeline.processed_data import load_training_data
+from src.config.model_config import CATEGORY_COUNTS_PATH, FEATURE_COLUMNS
+from src.models.backends import BACKENDS, fit_params, make_regressor
+from src.models.flat_model import can_flatten, export_flat_model
+from src.models.fused_model import export_fused_model
+from src.models.model_holder import publish_bundle_manifest
+from src.models.registry import publish_artifact
 
 
 def train_model(data_path: str = "notebooks/data/processed/clean_df.csv", 
-                model_path: str = "artifacts/model/model.pkl"):
+                model_path: str = "artifacts/model/model.pkl",
+                backend: str = "linear"):
     
     logger.info("📦 Loading dataset...")
-    df = pd.read_csv(data_path)
+    df = load_training_data(data_path, columns=FEATURE_COLUMNS + ["Price_INR_Numeric"])
 
     # === 1. Encode categorical columns ===
     label_encoders = {}
+    category_counts = {}
     categorical_cols = ["Transaction", "Furnishing", "Possession_Status"]
     for col in categorical_cols:
+        category_counts[col] = df[col].astype(str).value_counts().to_dict()
         le = LabelEncoder()
         df[col] = le.fit_transform(df[col].astype(str))
         label_encoders[col] = le
@@ -41,9 +50,9 @@ def train_model(data_path: str = "notebooks/data/processed/clean_df.csv",
     )
 
     # === 4. Train model ===
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    logger.info("✅ Linear Regression model trained.")
+    model = make_regressor(backend)
+    model.fit(X_train, y_train, **fit_params(backend))
+    logger.info(f"✅ {type(model).__name__} model trained ({backend} backend).")
 
     # === 5. Evaluate ===
     y_pred = model.predict(X_test)
@@ -56,8 +65,7 @@ def train_model(data_path: str = "notebooks/data/processed/clean_df.csv",
     logger.info(f"📊 R2 Score: {r2:.2f}")
 
     # === 6. Save model ===
-    os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(model, model_path)
+    publish_artifact(model, model_path)
     logger.info(f"💾 Model saved to: {model_path}")
 
     # === 7. Save encoders and scaler ===
@@ -65,15 +73,29 @@ def train_model(data_path: str = "notebooks/data/processed/clean_df.csv",
     os.makedirs("artifacts/scaler", exist_ok=True)
 
     for col, le in label_encoders.items():
-        joblib.dump(le, f"artifacts/encoders/{col.lower()}_encoder.pkl")
+        publish_artifact(le, f"artifacts/encoders/{col.lower()}_encoder.pkl")
 
-    joblib.dump(scaler, "artifacts/scaler/minmax_scaler.pkl")
+    # Category frequencies back the "most_frequent" unseen-category policy
+    with open(CATEGORY_COUNTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(category_counts, f, indent=4)
+
+    publish_artifact(scaler, "artifacts/scaler/minmax_scaler.pkl")
     logger.info("💾 Encoders and scaler saved.")
 
+    # Scaler folded into the coefficients for the serving fast path
+    if hasattr(model, "coef_"):
+        export_fused_model(model, scaler)
+    # Tree models are flattened into a memory-mappable array file instead
+    elif can_flatten(model):
+        export_flat_model(model)
+    # Written last: servers only load the artifacts above once it matches them
+    publish_bundle_manifest()
+
     # === 8. MLflow tracking ===
     mlflow.set_experiment("real_estate_price_prediction")
     with mlflow.start_run():
-        mlflow.log_param("model_type", "LinearRegression")
+        mlflow.log_param("model_type", type(model).__name__)
+        mlflow.log_param("backend", backend)
         mlflow.log_metric("rmse", rmse)
         mlflow.log_metric("mae", mae)
         mlflow.log_metric("r2_score", r2)
@@ -81,3 +103,20 @@ def train_model(data_path: str = "notebooks/data/processed/clean_df.csv",
         logger.info("📈 MLflow tracking completed.")
 
 
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the serving model and its preprocessing artifacts.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--model-path", default="artifacts/model/model.pkl")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="linear")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fold only rows appended since the last run into the model (see src/models/incremental.py)")
+    parser.add_argument("--full", action="store_true", help="with --incremental: retrain from scratch")
+    args = parser.parse_args()
+
+    if args.incremental:
+        from src.models.incremental import train_incremental
+        train_incremental(args.data_path, args.model_path, args.backend, args.full)
+    else:
+        train_model(args.data_path, args.model_path, args.backend)
@@ -1,70 +1,42 @@
 
-import os 
-import pandas as pd 
-import joblib
+import argparse
 import mlflow
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor
-from sklearn.linear_model import LinearRegression
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score , mean_squared_error
-from sklearn.pipeline import Pipeline
 from src.utils.logger import logger
+from src.ml_pipeline.normalize import TARGET_COLUMN
+from src.ml_pipeline.processed_data import load_training_data
+from src.models.incremental import fit_preprocessing, publish
+from src.models.registry import publish_artifact
+from src.models.tuning import STRATEGIES, TUNING_CACHE_DIR, tune_ensemble
+from src.config.model_config import MODEL_PATH, FEATURE_COLUMNS
 import mlflow.sklearn
 from mlflow.models.signature import infer_signature
 
 
-def train_ensemble_model (data_path: str = "notebooks/data/processed/clean_df.csv", model_path: str = "artifacts/model_ensemble.pkl"):
+def train_ensemble_model (data_path: str = "notebooks/data/processed/clean_df.csv", model_path: str = "artifacts/model_ensemble.pkl",
+                          tuning: str = "none", n_jobs: int = -1, budget: int = 20, cache_dir: str = None):
     logger.info(f"Loading Cleaned Data....")
-    df=pd.read_csv(data_path)
-    
-    X = df[["Transaction", "Furnishing", "Bathroom", "Price per Sqft",
-            "Total Area", "Covered_parking", "Open_parking", "Possession_Status", "BHK"]]
-    y = df["Price_INR_Numeric"]
+    df = load_training_data(data_path, columns=FEATURE_COLUMNS + [TARGET_COLUMN])
 
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    logger.info("Defining Base regressor ...")
-    models = {
-        "lr": LinearRegression(),
-        "rf":RandomForestRegressor(random_state=42),
-        "gbr":GradientBoostingRegressor(random_state=42)
-
-    }
-
-    param_grid = {
-        "rf__n_estimators":[100,200],
-        "rf__max_depth":[5,10,None],
-        "gbr__n_estimators":[100,200],
-        "gbr__learning_rate": [0.05, 0.1],
-
-    }
-
-    pipeline = Pipeline([
-        ("lr" , models["lr"]),
-    ])
-
-    #define Estimators and votingRegressor
+    # Same encoders and scaler as train_model, so the ensemble sees the inputs the serving path builds
+    X, artifacts = fit_preprocessing(df)
+    y = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
 
-    estimators = [
-        ("lr", models["lr"]),
-        ("rf", models["rf"]),
-        ("gbr", models["gbr"])
-
-    ]
-
-    ensemble = VotingRegressor(estimators=estimators)
-
-    logger.info("Tuning GradientBoost and RandomForest...")
-    grid =GridSearchCV(estimator=ensemble, param_grid={}, cv=3,n_jobs=-1)
-    grid.fit(X_train, y_train)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    best_model = grid.best_estimator_
+    logger.info(f"Training ensemble (tuning: {tuning}, n_jobs={n_jobs})...")
+    best_model, tuning_info = tune_ensemble(X_train, y_train, strategy=tuning, n_jobs=n_jobs, budget=budget,
+                                             cache_dir=cache_dir)
     y_pred = best_model.predict(X_test)
 
     rmse = mean_squared_error(y_test , y_pred)
     mae = mean_absolute_error(y_test, y_pred)
     r2 = r2_score(y_test, y_pred)
-    signature = infer_signature(X_test, y_pred)
+    X_example = pd.DataFrame(X_test, columns=FEATURE_COLUMNS)
+    signature = infer_signature(X_example, y_pred)
 
     logger.info(f"RMSE {rmse:.2f} , MAE {mae:.2f} , R2 {r2:.2f}")
 
@@ -73,7 +45,36 @@ def train_ensemble_model (data_path: str = "notebooks/data/processed/clean_df.cs
         mlflow.log_metric("rmse", rmse)
         mlflow.log_metric("mae", mae)
         mlflow.log_metric("r2_score", r2)
-        mlflow.sklearn.log_model(best_model, "ensemble_model", signature=signature, input_example=X_test.iloc[0:1])
-
-
-    logger.info("Training Complete with Ensemble Model.")
\ No newline at end of file
+        mlflow.log_param("tuning", tuning)
+        mlflow.log_params(tuning_info["params"])
+        mlflow.log_metric("tuning_seconds", tuning_info["seconds"])
+        mlflow.sklearn.log_model(best_model, "ensemble_model", signature=signature, input_example=X_example.iloc[0:1])
+
+
+    # Atomic writes: running API servers pick the new bundle up without a restart.
+    # The serving path gets the encoders and scaler the model was fit on with it.
+    if model_path == MODEL_PATH:
+        artifacts.model = best_model
+        publish(artifacts, model_path)
+    else:
+        publish_artifact(best_model, model_path)
+
+    logger.info("Training Complete with Ensemble Model.")
+    return best_model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the ensemble model outside the API server.")
+    parser.add_argument("--data-path", default="notebooks/data/processed/clean_df.csv")
+    parser.add_argument("--model-path", default="artifacts/model_ensemble.pkl")
+    parser.add_argument("--publish", action="store_true",
+                        help=f"write the trained model to the serving path ({MODEL_PATH})")
+    parser.add_argument("--tuning", choices=STRATEGIES, default="none")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel candidate/fold fits")
+    parser.add_argument("--budget", type=int, default=20, help="candidates for random search (3x for halving)")
+    parser.add_argument("--cache-dir", default=TUNING_CACHE_DIR,
+                        help="reuse fitted candidates across runs from this directory (off by default)")
+    args = parser.parse_args()
+
+    train_ensemble_model(args.data_path, MODEL_PATH if args.publish else args.model_path,
+                         args.tuning, args.n_jobs, args.budget, args.cache_dir)
\ No newline at end of file
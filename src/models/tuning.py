@@ -0,0 +1,166 @@
+import os
+import time
+import numpy as np
+from joblib import Memory
+from scipy.stats import loguniform, randint
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, VotingRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import GridSearchCV, HalvingRandomSearchCV, RandomizedSearchCV
+from src.utils.logger import logger
+
+STRATEGIES = ("none", "grid", "random", "halving")
+
+# Exhaustive grid (the space train_model_ensemble always declared)
+PARAM_GRID = {
+    "rf_n_estimators": [100, 200],
+    "rf_max_depth": [5, 10, None],
+    "gbr_n_estimators": [100, 200],
+    "gbr_learning_rate": [0.05, 0.1],
+}
+
+# Wider space sampled by the randomized and successive-halving searches
+PARAM_DISTRIBUTIONS = {
+    "rf_n_estimators": randint(50, 300),
+    "rf_max_depth": [5, 10, 20, None],
+    "gbr_n_estimators": randint(50, 300),
+    "gbr_learning_rate": loguniform(0.02, 0.3),
+    "gbr_max_depth": [2, 3, 4],
+}
+
+# Opt-in fit cache for the searches (e.g. artifacts/cache/tuning); unset means every fit trains
+TUNING_CACHE_DIR = os.getenv("TUNING_CACHE_DIR") or None
+# After each tuning run the cache is pruned, least recently used first, back to this size
+TUNING_CACHE_MAX_BYTES = int(os.getenv("TUNING_CACHE_MAX_BYTES", str(512 * 1024 ** 2)))
+
+
+def build_ensemble(rf_n_estimators=100, rf_max_depth=None, gbr_n_estimators=100,
+                   gbr_learning_rate=0.1, gbr_max_depth=3, random_state=42) -> VotingRegressor:
+    """
+    The LinearRegression + RandomForest + GradientBoosting voting ensemble.
+
+    RandomForest is pinned to n_jobs=1: parallelism lives in the search
+    (one candidate/fold per worker), so the two never multiply into
+    n_jobs x n_jobs threads.
+    """
+    return VotingRegressor(estimators=[
+        ("lr", LinearRegression()),
+        ("rf", RandomForestRegressor(n_estimators=rf_n_estimators, max_depth=rf_max_depth,
+                                     random_state=random_state, n_jobs=1)),
+        ("gbr", GradientBoostingRegressor(n_estimators=gbr_n_estimators, learning_rate=gbr_learning_rate,
+                                          max_depth=gbr_max_depth, random_state=random_state)),
+    ])
+
+
+def _fit_ensemble(params: dict, X, y) -> VotingRegressor:
+    return build_ensemble(**params).fit(X, y)
+
+
+class CachedEnsembleRegressor(RegressorMixin, BaseEstimator):
+    """
+    Search-friendly wrapper around build_ensemble.
+
+    Hyperparameters are flat (rf_max_depth rather than rf__max_depth) so the
+    sklearn searchers can set them directly. With `cache_dir` set, each fit
+    is memoized on disk by (params, training rows): repeated folds across
+    strategies, re-runs and the final refit load the fitted ensemble instead
+    of training it again.
+    """
+
+    def __init__(self, rf_n_estimators=100, rf_max_depth=None, gbr_n_estimators=100,
+                 gbr_learning_rate=0.1, gbr_max_depth=3, random_state=42, cache_dir=None):
+        self.rf_n_estimators = rf_n_estimators
+        self.rf_max_depth = rf_max_depth
+        self.gbr_n_estimators = gbr_n_estimators
+        self.gbr_learning_rate = gbr_learning_rate
+        self.gbr_max_depth = gbr_max_depth
+        self.random_state = random_state
+        self.cache_dir = cache_dir
+
+    def fit(self, X, y):
+        params = self.get_params()
+        params.pop("cache_dir")
+        fit = _fit_ensemble
+        if self.cache_dir:
+            fit = Memory(self.cache_dir, verbose=0).cache(_fit_ensemble)
+        self.model_ = fit(params, X, y)
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(X)
+
+
+def prune_cache(cache_dir: str, max_bytes: int = TUNING_CACHE_MAX_BYTES):
+    """
+    Drop the least recently used fits until the cache is under `max_bytes`.
+    """
+    Memory(cache_dir, verbose=0).reduce_size(bytes_limit=max_bytes)
+
+
+def make_search(strategy: str, n_jobs: int = -1, cv: int = 3, budget: int = 20,
+                cache_dir: str = None, random_state: int = 42):
+    """
+    Build the searcher for `strategy`:
+        "grid"    -> GridSearchCV over PARAM_GRID (every candidate, all rows)
+        "random"  -> RandomizedSearchCV, `budget` candidates from PARAM_DISTRIBUTIONS
+        "halving" -> HalvingRandomSearchCV starting from 3 x `budget` candidates on
+                     a slice of the rows, keeping the best third each round
+    """
+    estimator = CachedEnsembleRegressor(cache_dir=cache_dir, random_state=random_state)
+    common = dict(scoring="neg_root_mean_squared_error", cv=cv, n_jobs=n_jobs)
+    if strategy == "grid":
+        return GridSearchCV(estimator, PARAM_GRID, **common)
+    if strategy == "random":
+        return RandomizedSearchCV(estimator, PARAM_DISTRIBUTIONS, n_iter=budget,
+                                  random_state=random_state, **common)
+    if strategy == "halving":
+        return HalvingRandomSearchCV(estimator, PARAM_DISTRIBUTIONS, n_candidates=3 * budget, factor=3,
+                                     min_resources="exhaust", random_state=random_state, **common)
+    raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+
+
+def tune_ensemble(X_train, y_train, strategy: str = "halving", n_jobs: int = -1, cv: int = 3,
+                  budget: int = 20, cache_dir: str = None):
+    """
+    Fit the ensemble with the given tuning strategy. Returns (model, info):
+    the fitted VotingRegressor and the chosen params, CV RMSE, fit count and
+    wall-clock time.
+
+    With `cache_dir` fits are memoized there (see CachedEnsembleRegressor)
+    and the cache is pruned to TUNING_CACHE_MAX_BYTES afterwards.
+
+    n_jobs parallelises candidates x folds in joblib worker processes; joblib
+    also caps BLAS/OpenMP threads inside each worker, and RandomForest itself
+    runs single-threaded (see build_ensemble).
+    """
+    start = time.perf_counter()
+    if strategy == "none":
+        model = CachedEnsembleRegressor(cache_dir=cache_dir).fit(X_train, y_train)
+        info = {"params": {}, "cv_rmse": None, "n_fits": 1}
+    else:
+        search = make_search(strategy, n_jobs, cv, budget, cache_dir).fit(X_train, y_train)
+        model = search.best_estimator_
+        n_candidates = len(search.cv_results_["params"])
+        info = {"params": search.best_params_, "cv_rmse": -search.best_score_,
+                "n_fits": n_candidates * cv + 1}
+    model = model.model_
+    if cache_dir:
+        prune_cache(cache_dir)
+    info["strategy"] = strategy
+    info["seconds"] = time.perf_counter() - start
+    logger.info(f"🔎 Tuning ({strategy}): {info['n_fits']} fits in {info['seconds']:.1f}s, params {info['params']}")
+    return model, info
+
+
+def compare_strategies(X_train, y_train, X_test, y_test, strategies=STRATEGIES, **kwargs) -> list:
+    """
+    Run each strategy and report wall-clock time against held-out RMSE.
+    """
+    report = []
+    for strategy in strategies:
+        model, info = tune_ensemble(X_train, y_train, strategy, **kwargs)
+        info["test_rmse"] = float(np.sqrt(mean_squared_error(y_test, model.predict(X_test))))
+        report.append(info)
+    return report
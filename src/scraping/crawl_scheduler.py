@@ -0,0 +1,206 @@
+import argparse
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from src.config.scraping_config import (
+    CRAWL_BACKOFF_SECONDS,
+    CRAWL_HOST_INTERVAL_SECONDS,
+    CRAWL_MAX_RETRIES,
+    CRAWL_POOL_SIZE,
+)
+from src.utils.logger import logger
+
+
+def paginate(url: str, pages: int) -> list:
+    """
+    "https://host/flats-in-hyderabad-for-sale-pppfs", 3 -> the same URL with page=1, 2, 3.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "page"]
+    return [urlunsplit(parts._replace(query=urlencode(query + [("page", str(p))]))) for p in range(1, pages + 1)]
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable browser drivers, launched lazily up to `size`.
+
+    A driver is handed to one worker at a time. One that raised while in use
+    is quit rather than returned (its page state is unknown), and a fresh one
+    is launched the next time a worker needs it.
+    """
+
+    def __init__(self, factory, size: int = CRAWL_POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self.launched = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.factory()
+                with self._lock:
+                    self.launched += 1
+            try:
+                yield driver
+            except BaseException:
+                with suppress(Exception):
+                    driver.quit()
+                raise
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            with suppress(Exception):
+                driver.quit()
+
+
+class HostRateLimiter:
+    """
+    Spaces page loads on the same host at least `interval` seconds apart.
+    Each caller reserves the next free slot under the lock and sleeps outside
+    it (asyncio callers sleep on reserve() themselves).
+    """
+
+    def __init__(self, interval: float = CRAWL_HOST_INTERVAL_SECONDS):
+        self.interval = interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        """
+        Claim the next slot on the URL's host; returns the seconds to wait for it.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CrawlScheduler:
+    """
+    Crawls a list of URLs with `pool_size` workers sharing a DriverPool.
+
+    `fetch(driver, url)` loads one page and returns a dict (its "cards"
+    count is totalled). Failed pages are retried up to `max_retries` times
+    with exponential backoff and jitter; the worker gives its driver back
+    while it waits.
+    """
+
+    def __init__(self, fetch, driver_factory, pool_size: int = CRAWL_POOL_SIZE,
+                 host_interval: float = CRAWL_HOST_INTERVAL_SECONDS, max_retries: int = CRAWL_MAX_RETRIES,
+                 backoff: float = CRAWL_BACKOFF_SECONDS):
+        self.fetch = fetch
+        self.pool = DriverPool(driver_factory, pool_size)
+        self.limiter = HostRateLimiter(host_interval)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def crawl_one(self, url: str) -> dict:
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait(url)
+            try:
+                with self.pool.driver() as driver:
+                    result = self.fetch(driver, url) or {}
+                return {"url": url, "ok": True, "attempts": attempt + 1, "cards": result.get("cards", 0)}
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up on {url} after {attempt + 1} attempts: {e!r}")
+                    return {"url": url, "ok": False, "attempts": attempt + 1, "cards": 0, "error": repr(e)}
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                logger.warning(f"Attempt {attempt + 1} on {url} failed ({e!r}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def run(self, urls) -> dict:
+        """
+        Crawl every URL and return totals with pages/min and cards/min.
+        """
+        urls = list(urls)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            results = list(executor.map(self.crawl_one, urls))
+        seconds = time.perf_counter() - start
+
+        pages = sum(r["ok"] for r in results)
+        cards = sum(r["cards"] for r in results)
+        stats = {
+            "pages": pages,
+            "failed": len(results) - pages,
+            "retries": sum(r["attempts"] - 1 for r in results),
+            "cards": cards,
+            "drivers_launched": self.pool.launched,
+            "seconds": seconds,
+            "pages_per_min": pages / seconds * 60 if seconds else 0.0,
+            "cards_per_min": cards / seconds * 60 if seconds else 0.0,
+            "results": results,
+        }
+        logger.info(f"Crawled {pages}/{len(results)} pages, {cards} cards in {seconds:.1f}s "
+                    f"({stats['pages_per_min']:.1f} pages/min, {stats['cards_per_min']:.0f} cards/min)")
+        return stats
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def crawl(urls, pages: int = 1, sink=None, pool_size: int = CRAWL_POOL_SIZE, scroll_limit: int = 50,
+          timeout: float = 10.0, **scheduler_options) -> dict:
+    """
+    Harvest every search URL (and its first `pages` result pages) into one
+    shared CardSink, with headless drivers reused across pages.
+    """
+    # selenium is only needed once a real crawl starts
+    from src.scraping.scroll_magicbricks import CardSink, harvest_property_cards, make_driver, resolve_chromedriver
+
+    # resolve (and cache) the driver binary once, before the workers race to launch
+    resolve_chromedriver()
+    sink = sink or CardSink()
+    targets = [page for url in urls for page in (paginate(url, pages) if pages > 1 else [url])]
+
+    def fetch(driver, url):
+        return harvest_property_cards(url, scroll_limit=scroll_limit, timeout=timeout, driver=driver, sink=sink)
+
+    with CrawlScheduler(fetch, make_driver, pool_size=pool_size, **scheduler_options) as scheduler:
+        return scheduler.run(targets)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl search URLs with a pool of headless browsers.")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--pages", type=int, default=1, help="result pages per search URL")
+    parser.add_argument("--pool-size", type=int, default=CRAWL_POOL_SIZE)
+    parser.add_argument("--host-interval", type=float, default=CRAWL_HOST_INTERVAL_SECONDS)
+    parser.add_argument("--scroll-limit", type=int, default=50)
+    args = parser.parse_args()
+
+    stats = crawl(args.urls, args.pages, pool_size=args.pool_size, scroll_limit=args.scroll_limit,
+                  host_interval=args.host_interval)
+    print({k: v for k, v in stats.items() if k != "results"})
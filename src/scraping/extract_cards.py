@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+from lxml import html as lxml_html
+from src.config.data_config import HTML_DATA_CSV
+from src.scraping.extract_from_html_cards import (
+    html_features,
+    iter_card_records,
+    iter_html_records,
+    json_ld_entry,
+    list_html_cards,
+    listing_id,
+    store_cards,
+)
+from src.scraping.parse_clean_cards import CLEANED_DATA_PATH, property_record
+from src.scraping.raw_store import RawCardStore
+from src.scraping.streaming import Checkpoint, make_writer, write_in_batches
+from src.utils.logger import logger
+
+HTML_COLUMNS = ["Title", "Price (INR)", "Description", "Carpet Area", "Super Area", "Transaction", "Furnishing",
+                "Bathroom", "Possession", "Car Parking", "Price per Sqft", "Society"]
+JSON_COLUMNS = list(property_record({}))
+
+
+def extract_card(html_content):
+    """
+    One parse of a card's markup into a merged record: listing_id, the HTML
+    fields of html_data.csv and, when the card embeds JSON-LD, the fields of
+    cleaned_property_data.csv (has_json_ld says which). Cards without a
+    listing id are keyed by a hash of their markup, as the harvester does.
+    """
+    try:
+        root = lxml_html.fromstring(html_content)
+        record = html_features(root, html_content)
+        entry = json_ld_entry(root)
+    except Exception as e:
+        logger.warning(f"Failed to parse HTML block: {e}")
+        return {}
+
+    record["listing_id"] = listing_id(entry) or hashlib.sha1(html_content.encode("utf-8")).hexdigest()[:24]
+    record["has_json_ld"] = entry is not None
+    record.update(property_record(entry or {}))
+    return record
+
+
+class SplitWriter:
+    """
+    Routes merged card records to the html_data and cleaned_property_data
+    writers, each row carrying listing_id so the two can be joined.
+    """
+
+    def __init__(self, html_writer, json_writer):
+        self.html_writer = html_writer
+        self.json_writer = json_writer
+
+    def write(self, records):
+        self.html_writer.write([{"listing_id": r["listing_id"], **{c: r[c] for c in HTML_COLUMNS}}
+                                for r in records])
+        with_json = [{"listing_id": r["listing_id"], **{c: r[c] for c in JSON_COLUMNS}}
+                     for r in records if r["has_json_ld"]]
+        if with_json:
+            self.json_writer.write(with_json)
+
+    def position(self):
+        return [self.html_writer.position(), self.json_writer.position()]
+
+    def truncate(self, position):
+        self.html_writer.truncate(position[0])
+        self.json_writer.truncate(position[1])
+
+    def reset(self):
+        self.html_writer.reset()
+        self.json_writer.reset()
+
+    def close(self):
+        self.html_writer.close()
+        self.json_writer.close()
+
+
+def extract_all_cards(input_dir="data/raw/html", html_output=HTML_DATA_CSV, json_output=CLEANED_DATA_PATH,
+                      workers=1, chunk_size=64, batch_size=1000, resume=True):
+    """
+    Single pass over the raw cards producing both html_data and
+    cleaned_property_data (CSV files, or Parquet dataset directories for
+    .parquet paths), checkpointed and resumable like parse_all_html_cards.
+    input_dir may be a card directory or a RawCardStore.
+    """
+    writer = SplitWriter(make_writer(html_output, ["listing_id"] + HTML_COLUMNS),
+                         make_writer(json_output, ["listing_id"] + JSON_COLUMNS))
+    checkpoint = Checkpoint(f"{html_output}.checkpoint.json")
+    if resume and checkpoint.exists:
+        logger.info(f"Resuming after {checkpoint.last_file} ({checkpoint.records} records already written)")
+    else:
+        checkpoint.clear()
+        writer.reset()
+
+    if RawCardStore.is_store(input_dir):
+        logger.info(f"Extracting cards from store {input_dir} in one pass ({workers} worker(s))")
+        records = iter_card_records(store_cards(RawCardStore(input_dir), checkpoint.last_file),
+                                    extract_card, workers, chunk_size)
+    else:
+        paths = list_html_cards(input_dir)
+        if checkpoint.exists:
+            paths = [p for p in paths if p > checkpoint.last_file]
+        logger.info(f"Extracting {len(paths)} cards from {input_dir} in one pass ({workers} worker(s))")
+        records = iter_html_records(paths, extract_card, workers, chunk_size)
+    written = write_in_batches(records, writer, checkpoint, batch_size)
+    checkpoint.clear()
+    print(f"{written} cards written to {html_output} and {json_output}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract HTML fields and JSON-LD from raw cards in one pass.")
+    parser.add_argument("--input-dir", default="data/raw/html")
+    parser.add_argument("--html-output", default=HTML_DATA_CSV)
+    parser.add_argument("--json-output", default=CLEANED_DATA_PATH)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    extract_all_cards(args.input_dir, args.html_output, args.json_output, workers=args.workers,
+                      batch_size=args.batch_size, resume=not args.no_resume)
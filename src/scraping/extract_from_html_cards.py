@@ -1,9 +1,36 @@
+import json
 import os
-import pandas as pd
+import re
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from src.scraping.manifest import ParseManifest, incremental_update
+from src.scraping.raw_store import RawCardStore
+from src.scraping.streaming import Checkpoint, make_writer, write_in_batches
 from src.utils.logger import logger
 
-from src.database.connection import engine
+# listing id in the JSON-LD url (".../propertyDetails/...&id=4d4238..."), the key the harvester de-duplicates on
+_LISTING_ID = re.compile(r"[?&]id=([0-9A-Za-z]+)")
+
+
+def _first_json_object(texts):
+    # first JSON object among a card's JSON-LD script bodies, or None
+    for text in texts:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            logger.warning(f"Error Parsing JSON_LD: {e}")
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def listing_id(entry):
+    match = _LISTING_ID.search(str(entry.get("url") or "")) if entry else None
+    return match.group(1) if match else None
 
 
 def extract_features_from_html(html_content):
@@ -44,7 +71,9 @@ def extract_features_from_html(html_content):
         society_tag = soup.find("a", class_="mb-srp__card__society--name")
         society = society_tag.text.strip() if society_tag else None
 
+        scripts = soup.find_all("script", type="application/ld+json")
         return {
+            "listing_id": listing_id(_first_json_object(script.string or "" for script in scripts)),
             "Title": title,
             "Price (INR)": price,
             "Description": description,
@@ -63,26 +92,243 @@ def extract_features_from_html(html_content):
         logger.warning(f"Failed to parse HTML block: {e}")
         return {}
 
-def parse_all_html_cards(input_dir="data/raw/extracted_html", output_csv="data/processed/html_data.csv"):
-    all_data = []
-
-    logger.info(f"Parsing HTML cards from {input_dir}")
-    for filename in os.listdir(input_dir):
-        if filename.endswith(".html"):
-            path = os.path.join(input_dir, filename)
-            with open(path, "r", encoding="utf-8") as f:
-                html = f.read()
-                features = extract_features_from_html(html)
-                if features:
-                    all_data.append(features)
-
-    df = pd.DataFrame(all_data)
-    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-    df.to_csv(output_csv, index=False)
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath expressions compiled once per process for the lxml extractor
+_XP_TITLE = etree.XPath(f"(//h2[{_has_class('mb-srp__card--title')}])[1]")
+_XP_PRICE = etree.XPath(f"(//div[{_has_class('mb-srp__card__price--amount')}])[1]")
+_XP_DESCRIPTION = etree.XPath(f"(//div[{_has_class('mb-srp__card--desc--text')}])[1]")
+_XP_FIRST_P = etree.XPath("(.//p)[1]")
+_XP_SUMMARY = etree.XPath(f"(//div[{_has_class('mb-srp__card__summary__list')}])[1]")
+_XP_SUMMARY_ITEMS = etree.XPath(f".//div[{_has_class('mb-srp__card__summary__list--item')}]")
+_XP_LABEL = etree.XPath(f"(.//div[{_has_class('mb-srp__card__summary--label')}])[1]")
+_XP_VALUE = etree.XPath(f"(.//div[{_has_class('mb-srp__card__summary--value')}])[1]")
+_XP_POSSESSION = etree.XPath("//div[contains(., 'Poss.')]")
+_XP_PRICE_PER_SQFT = etree.XPath(f"(//div[{_has_class('mb-srp__card__price--size')}])[1]")
+_XP_SOCIETY = etree.XPath(f"(//a[{_has_class('mb-srp__card__society--name')}])[1]")
+_XP_JSON_LD = etree.XPath('//script[@type="application/ld+json"]/text()')
+
+
+def _first_text(xpath, node):
+    found = xpath(node)
+    return found[0].text_content().strip() if found else None
+
+
+def _single_string(el):
+    """
+    lxml equivalent of BeautifulSoup's Tag.string: the text of an element whose
+    only child is one string (following single-child elements down).
+    """
+    children = list(el)
+    if not children:
+        return el.text
+    if len(children) == 1 and not el.text and not children[0].tail:
+        return _single_string(children[0])
+    return None
+
+
+def json_ld_entry(root):
+    """
+    The card's JSON-LD listing entry from an lxml tree, or None.
+    """
+    return _first_json_object(_XP_JSON_LD(root))
+
+
+def html_features(root, html_content):
+    """
+    Card fields from an already-parsed lxml tree of `html_content`.
+    """
+    price = _first_text(_XP_PRICE, root)
+    price = price.replace("\u20b9", "").replace(",", "") if price else None
+
+    description_tag = _XP_DESCRIPTION(root)
+    description = _first_text(_XP_FIRST_P, description_tag[0]) if description_tag else None
+
+    summary = _XP_SUMMARY(root)
+    summary_dict = {}
+    for item in _XP_SUMMARY_ITEMS(summary[0]) if summary else []:
+        label = _first_text(_XP_LABEL, item)
+        value = _first_text(_XP_VALUE, item)
+        if label is not None and value is not None:
+            summary_dict[label] = value
+
+    possession = None
+    if "Under Construction" in html_content:
+        for div in _XP_POSSESSION(root):
+            text = _single_string(div)
+            if text and "Poss." in text:
+                possession = text.strip()
+                break
+
+    price_per_sqft = _first_text(_XP_PRICE_PER_SQFT, root)
+    price_per_sqft = price_per_sqft.replace("₹", "").replace(",", "") if price_per_sqft else None
+
+    return {
+        "Title": _first_text(_XP_TITLE, root),
+        "Price (INR)": price,
+        "Description": description,
+        "Carpet Area": summary_dict.get("Carpet Area"),
+        "Super Area": summary_dict.get("Super Area"),
+        "Transaction": summary_dict.get("Transaction"),
+        "Furnishing": summary_dict.get("Furnishing"),
+        "Bathroom": summary_dict.get("Bathroom"),
+        "Possession": possession,
+        "Car Parking": summary_dict.get("Car Parking"),
+        "Price per Sqft": price_per_sqft,
+        "Society": _first_text(_XP_SOCIETY, root),
+    }
+
+
+def extract_features_lxml(html_content):
+    """
+    Same record as extract_features_from_html, built with lxml and
+    precompiled XPath instead of a BeautifulSoup tree.
+    """
+    try:
+        root = lxml_html.fromstring(html_content)
+        return {"listing_id": listing_id(json_ld_entry(root)), **html_features(root, html_content)}
+    except Exception as e:
+        logger.warning(f"Failed to parse HTML block: {e}")
+        return {}
+
+
+EXTRACTORS = {
+    "html.parser": extract_features_from_html,
+    "lxml": extract_features_lxml,
+}
+
+
+def list_html_cards(input_dir="data/raw/extracted_html"):
+    # sorted so a checkpointed run can tell which files it has already done
+    return sorted(os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.endswith(".html"))
+
+
+def parse_html_file(path, parser="html.parser"):
+    # parser: a name in EXTRACTORS or an extractor function (picklable, for pool workers)
+    extract = parser if callable(parser) else EXTRACTORS[parser]
+    with open(path, "r", encoding="utf-8") as f:
+        return extract(f.read())
+
+
+def _parse_chunk(paths, parser):
+    return [(path, parse_html_file(path, parser)) for path in paths]
+
+
+def _extract_chunk(cards, parser):
+    extract = parser if callable(parser) else EXTRACTORS[parser]
+    return [(source, extract(html)) for source, html in cards]
+
+
+def _iter_chunked(items, work, parser, workers, chunk_size):
+    """
+    Yield work(chunk, parser) results in input order. With workers > 1 the
+    chunks run on a process pool with at most two chunks per worker in
+    flight, so memory stays bounded however many cards there are.
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from work(chunk, parser)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(work, chunk, parser))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_html_records(paths, parser="html.parser", workers=1, chunk_size=64):
+    """
+    Yield (path, record) for each card file, in input order, parsing in
+    chunks of `chunk_size` files on a process pool when workers > 1.
+    """
+    return _iter_chunked(paths, _parse_chunk, parser, workers, chunk_size)
+
+
+def iter_card_records(cards, parser="html.parser", workers=1, chunk_size=64):
+    """
+    Same as iter_html_records for (source, html) pairs already read, e.g.
+    (position, record["html"]) from a RawCardStore scan.
+    """
+    return _iter_chunked(cards, _extract_chunk, parser, workers, chunk_size)
+
+
+def store_cards(store, after=None):
+    # (position, html) for the cards of a RawCardStore that have markup
+    return ((position, record["html"]) for position, record in store.scan(after) if record["html"])
+
+
+def parse_html_files(paths, parser="html.parser", workers=1, chunk_size=64):
+    """
+    Parse card files into a list of record dicts, in input order.
+    """
+    return [record for _, record in iter_html_records(paths, parser, workers, chunk_size)]
+
+
+def parse_all_html_cards(input_dir="data/raw/extracted_html", output_csv="data/processed/html_data.csv",
+                         parser="html.parser", workers=1, chunk_size=64, batch_size=1000, resume=True,
+                         incremental=False):
+    """
+    Stream parsed cards to `output_csv` (or a Parquet dataset directory if the
+    path ends in .parquet) in batches of `batch_size` records.
+
+    Progress is checkpointed next to the output after every batch; with
+    resume=True a crashed run picks up after the last flushed file, otherwise
+    the output is rebuilt from scratch. The checkpoint is removed once the
+    run completes.
+
+    With incremental=True a manifest next to the output keeps each card's
+    content hash and output row; only new or changed cards are parsed and
+    appended, the rows of changed and removed cards are dropped, and the
+    add/change/remove stats are returned.
+
+    input_dir may also be a RawCardStore directory, streamed in append order.
+    """
+    writer = make_writer(output_csv)
+    from_store = RawCardStore.is_store(input_dir)
+    if incremental and from_store:
+        raise ValueError("incremental=True needs a directory of card files; a raw card store is append-only")
+    if incremental:
+        manifest = ParseManifest(f"{output_csv}.manifest.json")
+        stats = incremental_update(list_html_cards(input_dir), EXTRACTORS[parser], manifest, writer,
+                                   lambda records: write_in_batches(((None, r) for r in records), writer,
+                                                                    batch_size=batch_size))
+        print(f"Incremental parse of {input_dir}: {stats}")
+        return stats
+
+    checkpoint = Checkpoint(f"{output_csv}.checkpoint.json")
+    if resume and checkpoint.exists:
+        logger.info(f"Resuming after {checkpoint.last_file} ({checkpoint.records} records already written)")
+    else:
+        checkpoint.clear()
+        writer.reset()
+
+    if from_store:
+        logger.info(f"Parsing HTML cards from store {input_dir} ({parser}, {workers} worker(s))")
+        cards = store_cards(RawCardStore(input_dir), checkpoint.last_file)
+        records = iter_card_records(cards, parser, workers, chunk_size)
+    else:
+        paths = list_html_cards(input_dir)
+        if checkpoint.exists:
+            paths = [p for p in paths if p > checkpoint.last_file]
+        logger.info(f"Parsing {len(paths)} HTML cards from {input_dir} ({parser}, {workers} worker(s))")
+        records = iter_html_records(paths, parser, workers, chunk_size)
+    written = write_in_batches(records, writer, checkpoint, batch_size)
+    checkpoint.clear()
     logger.info(f"Saved parsed HTML data to: {output_csv}")
-    print(df.head())
+    print(f"{written} records written to {output_csv}")
 
 def save_to_mysql(df, table_name="properties"):
-    df.to_sql(name=table_name, con=engine, if_exists="replace", index=False)
+    # imported lazily so parsing (and pool workers) never open a DB engine
+    from src.database.bulk_writer import upsert_dataframe
+
+    upsert_dataframe(df, table_name)
     print(f"SQL DATA INSERTED SUCEESSFULLY ")
     logger.info(f"SQL data inserted")
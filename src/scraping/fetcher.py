@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+import pandas as pd
+from lxml import html as lxml_html
+from src.config.scraping_config import (
+    CRAWL_BACKOFF_SECONDS,
+    CRAWL_MAX_RETRIES,
+    FETCH_CACHE_DIR,
+    FETCH_CONCURRENCY,
+    FETCH_HOST_INTERVAL_SECONDS,
+    FETCH_PER_HOST,
+    FETCH_TIMEOUT_SECONDS,
+    SCRAPER_USER_AGENT,
+)
+from src.scraping.crawl_scheduler import HostRateLimiter
+from src.scraping.parse_clean_cards import property_record
+from src.scraping.streaming import make_writer
+from src.utils.logger import logger
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DETAIL_DATA_PATH = os.path.join("data", "processed", "detail_data.csv")
+
+
+class ResponseCache:
+    """
+    On-disk cache of response bodies keyed by URL hash: <key>.body holds the
+    bytes and <key>.json the URL with its ETag / Last-Modified. Only
+    responses carrying a validator are kept, since nothing else can be
+    revalidated. The metadata file is written last, so an entry is either
+    complete or absent.
+    """
+
+    def __init__(self, directory: str = FETCH_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple:
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, url: str):
+        """
+        (meta, body) for `url`, or None.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return (meta, body) if meta.get("url") == url else None
+
+    def put(self, url: str, headers, body: bytes) -> bool:
+        meta = {"url": url, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        if not meta["etag"] and not meta["last_modified"]:
+            return False
+        for path, data, mode in zip(self._paths(url)[::-1], (body, json.dumps(meta)), ("wb", "w")):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return True
+
+    @staticmethod
+    def validators(meta: dict) -> dict:
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+
+class FetchResult:
+    """
+    Outcome of one URL. `cached` is True when the server answered 304 and
+    the body came from the ResponseCache; `status` is None when every
+    attempt failed.
+    """
+
+    def __init__(self, url: str, status, body: bytes = b"", cached: bool = False, attempts: int = 1,
+                 error: str = None):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.cached = cached
+        self.attempts = attempts
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+
+def _retry_after(value) -> float:
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AsyncFetcher:
+    """
+    asyncio HTTP fetcher over one shared keep-alive connection pool.
+
+    At most `concurrency` requests are in flight (`per_host` per host), and
+    request starts on one host are spaced `host_interval` seconds apart.
+    With a ResponseCache, URLs fetched before are re-requested with
+    If-None-Match / If-Modified-Since and a 304 is served from disk.
+    Connection errors, timeouts and 429/5xx are retried with exponential
+    backoff and jitter (honouring Retry-After).
+
+        async with AsyncFetcher(cache=ResponseCache()) as fetcher:
+            async for result, record in fetcher.stream(urls, parse_detail_page):
+                ...
+    """
+
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY, per_host: int = FETCH_PER_HOST,
+                 host_interval: float = FETCH_HOST_INTERVAL_SECONDS, timeout: float = FETCH_TIMEOUT_SECONDS,
+                 max_retries: int = CRAWL_MAX_RETRIES, backoff: float = CRAWL_BACKOFF_SECONDS,
+                 cache: ResponseCache = None, headers: dict = None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.limiter = HostRateLimiter(host_interval)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        self.headers = {"User-Agent": SCRAPER_USER_AGENT, **(headers or {})}
+        self.session = None
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0, "retries": 0, "bytes": 0}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def fetch(self, url: str) -> FetchResult:
+        cached = self.cache.get(url) if self.cache else None
+        headers = ResponseCache.validators(cached[0]) if cached else {}
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            retry_after = 0.0
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status == 304 and cached:
+                        self.stats["not_modified"] += 1
+                        return FetchResult(url, 200, cached[1], cached=True, attempts=attempt + 1)
+                    if response.status in RETRY_STATUSES:
+                        retry_after = _retry_after(response.headers.get("Retry-After"))
+                        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                          status=response.status, message=response.reason)
+                    body = await response.read()
+                    self.stats["fetched"] += 1
+                    self.stats["bytes"] += len(body)
+                    if response.status == 200 and self.cache:
+                        self.cache.put(url, response.headers, body)
+                    return FetchResult(url, response.status, body, attempts=attempt + 1)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    logger.error(f"Giving up on {url} after {attempt + 1} attempts: {e!r}")
+                    return FetchResult(url, None, attempts=attempt + 1, error=repr(e))
+                self.stats["retries"] += 1
+                delay = max(retry_after, self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+                logger.warning(f"Attempt {attempt + 1} on {url} failed ({e!r}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def stream(self, urls, parse=None):
+        """
+        Async-iterate (result, record) in completion order. `concurrency`
+        workers pull URLs from a queue and run parse(result) on each
+        successful response as soon as it lands, in a worker thread so the
+        event loop keeps serving the downloads still in flight; at most a
+        few pages sit in memory.
+        record is None when the fetch or the parse failed.
+        """
+        urls = list(urls)
+        pending = asyncio.Queue()
+        for url in urls:
+            pending.put_nowait(url)
+        done = asyncio.Queue(maxsize=2 * self.concurrency)
+
+        async def worker():
+            while True:
+                try:
+                    url = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await self.fetch(url)
+                record = None
+                if parse is not None and result.ok:
+                    try:
+                        record = await asyncio.to_thread(parse, result)
+                    except Exception as e:
+                        logger.warning(f"Failed to parse {url}: {e!r}")
+                await done.put((result, record))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(urls)))]
+        try:
+            for _ in urls:
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+def _json_ld_entries(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_entries(item)
+    elif isinstance(data, dict):
+        if "@graph" in data:
+            yield from _json_ld_entries(data["@graph"])
+        else:
+            yield data
+
+
+def parse_detail_page(result: FetchResult):
+    """
+    Listing fields (as in cleaned_property_data.csv) from the JSON-LD of a
+    listing-detail page, or None when the page has no listing entry.
+    """
+    root = lxml_html.fromstring(result.body)
+    for text in root.xpath('//script[@type="application/ld+json"]/text()'):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        for entry in _json_ld_entries(data):
+            if "geo" in entry or "offers" in entry or "address" in entry:
+                record = property_record(entry)
+                record["url"] = record["url"] or result.url
+                return record
+    return None
+
+
+async def fetch_into(urls, writer, parse=parse_detail_page, batch_size: int = 200, **fetcher_options) -> dict:
+    """
+    Fetch `urls` and write the parsed records to `writer` every
+    `batch_size` records. Returns the fetcher stats plus records and timing.
+    """
+    batch = []
+    records = 0
+    start = time.perf_counter()
+    async with AsyncFetcher(**fetcher_options) as fetcher:
+        async for _, record in fetcher.stream(urls, parse):
+            if record:
+                batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write(batch)
+                records += len(batch)
+                batch = []
+    if batch:
+        writer.write(batch)
+        records += len(batch)
+    writer.close()
+    seconds = time.perf_counter() - start
+    stats = {**fetcher.stats, "records": records, "seconds": seconds,
+             "pages_per_sec": len(urls) / seconds if seconds else 0.0}
+    logger.info(f"Fetched {len(urls)} URLs in {seconds:.1f}s: {stats}")
+    return stats
+
+
+def load_detail_urls(path: str = os.path.join("data", "processed", "cleaned_property_data.csv")) -> list:
+    return pd.read_csv(path, usecols=["url"])["url"].dropna().drop_duplicates().tolist()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch listing-detail pages and parse their JSON-LD.")
+    parser.add_argument("--urls-from", default=os.path.join("data", "processed", "cleaned_property_data.csv"))
+    parser.add_argument("--output", default=DETAIL_DATA_PATH, help=".csv file or .parquet directory")
+    parser.add_argument("--concurrency", type=int, default=FETCH_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=FETCH_PER_HOST)
+    parser.add_argument("--host-interval", type=float, default=FETCH_HOST_INTERVAL_SECONDS)
+    parser.add_argument("--cache-dir", default=FETCH_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    writer = make_writer(args.output)
+    writer.reset()
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    asyncio.run(fetch_into(load_detail_urls(args.urls_from), writer, concurrency=args.concurrency,
+                           per_host=args.per_host, host_interval=args.host_interval, cache=cache))
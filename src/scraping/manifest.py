@@ -0,0 +1,146 @@
+import bisect
+import hashlib
+import json
+import os
+import time
+from src.utils.logger import logger
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ParseManifest:
+    """
+    Maps each source file to the hash of its content and the output row its
+    record was written to (None when it produced no record), so a re-run
+    only parses files that are new or have changed. The records themselves
+    live in the output only.
+
+    The manifest also remembers the output's row count, whether the last
+    update of the output completed, and the average parse time per file,
+    used to estimate how much time skipping unchanged files saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.rows = 0
+        self.complete = True
+        self.avg_parse_seconds = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            # the old layout kept records instead of rows; it is rebuilt from scratch
+            self.entries = state.get("entries", {}) if "rows" in state else {}
+            self.rows = state.get("rows", 0)
+            self.complete = state.get("complete", True)
+            self.avg_parse_seconds = state.get("avg_parse_seconds")
+
+    def reset(self):
+        self.entries, self.rows, self.complete = {}, 0, True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"avg_parse_seconds": self.avg_parse_seconds, "rows": self.rows, "complete": self.complete,
+                       "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def incremental_parse(paths, parse, manifest: ParseManifest):
+    """
+    Compare `paths` with `manifest` by content hash, calling parse(text)
+    only for files that are new or changed. The manifest is not modified.
+
+    Returns (parsed, stale, stats): parsed is [(path, hash, record)] for the
+    new and changed files in `paths` order, stale the manifest entries of
+    the changed and removed files (their output rows are out of date), and
+    stats the added/changed/unchanged/removed counts with timings.
+    """
+    start = time.perf_counter()
+    stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+    parse_seconds = 0.0
+    parsed, stale = [], {}
+    seen = set()
+
+    for path in paths:
+        seen.add(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = content_hash(data)
+        previous = manifest.entries.get(path)
+        if previous is not None and previous["hash"] == digest:
+            stats["unchanged"] += 1
+            continue
+
+        t0 = time.perf_counter()
+        parsed.append((path, digest, parse(data.decode("utf-8"))))
+        parse_seconds += time.perf_counter() - t0
+        if previous is not None:
+            stale[path] = previous
+        stats["changed" if previous is not None else "added"] += 1
+
+    removed = {path: entry for path, entry in manifest.entries.items() if path not in seen}
+    stale.update(removed)
+    stats["removed"] = len(removed)
+    if parsed:
+        manifest.avg_parse_seconds = parse_seconds / len(parsed)
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["estimated_seconds_saved"] = round(stats["unchanged"] * (manifest.avg_parse_seconds or 0.0), 3)
+    logger.info(
+        f"Incremental parse: {stats['added']} added, {stats['changed']} changed, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed in {stats['seconds']}s "
+        f"(~{stats['estimated_seconds_saved']}s saved)"
+    )
+    return parsed, stale, stats
+
+
+def incremental_update(paths, parse, manifest: ParseManifest, writer, write_records):
+    """
+    Bring an output written by `writer` (see src/scraping/streaming.py) up
+    to date with `paths`: the rows of changed and removed files are dropped
+    with writer.drop_rows, and only the new and changed records are
+    appended with write_records(records). Unchanged rows are never rewritten
+    (nor is anything when files were only added).
+
+    The manifest is saved as incomplete before the output is touched, so a
+    run that dies halfway is followed by a full rebuild. Returns the stats.
+    """
+    if not manifest.complete or not writer.exists():
+        manifest.reset()
+        writer.reset()
+    parsed, stale, stats = incremental_parse(paths, parse, manifest)
+    if not parsed and not stale:
+        manifest.save()
+        return stats
+
+    manifest.complete = False
+    manifest.save()
+    dropped = sorted(entry["row"] for entry in stale.values() if entry["row"] is not None)
+    for path in stale:
+        del manifest.entries[path]
+    if dropped:
+        writer.drop_rows(dropped)
+        for entry in manifest.entries.values():
+            if entry["row"] is not None:
+                # rows after a dropped one move up
+                entry["row"] -= bisect.bisect_left(dropped, entry["row"])
+
+    rows = manifest.rows - len(dropped)
+    records = []
+    for path, digest, record in parsed:
+        manifest.entries[path] = {"hash": digest, "row": rows if record else None}
+        if record:
+            records.append(record)
+            rows += 1
+    write_records(records)
+
+    manifest.rows = rows
+    manifest.complete = True
+    manifest.save()
+    stats["rows_dropped"] = len(dropped)
+    stats["rows_appended"] = len(records)
+    return stats
@@ -2,6 +2,9 @@
 import os 
 import json
 import pandas as pd
+from src.scraping.manifest import ParseManifest, incremental_update
+from src.scraping.raw_store import RawCardStore
+from src.scraping.streaming import make_writer, write_in_batches
 from src.utils.logger import logger
 
 #path to raw json files
@@ -9,15 +12,30 @@ RAW_JSON_DIR = "data/raw/extracted_json"
 
 #cleaned Data path for cleaned CSV 
 
-CLEANED_DATA_PATH = "data\processed\cleaned_property_data.csv"
+CLEANED_DATA_PATH = os.path.join("data", "processed", "cleaned_property_data.csv")
 os.makedirs(os.path.dirname(CLEANED_DATA_PATH), exist_ok=True)
 
 
+def _load_json(text):
+    try:
+        return json.loads(text)
+    except Exception as e:
+        logger.warning(f"Error reading JSON card: {e}")
+        return None
+
+
 def load_all_json_files(directory):
     """
     Load all JSON files from a directory into list of dictss
 
+    A RawCardStore directory is streamed instead (JSON-LD is already
+    decoded there). See update_cleaned_data for the incremental variant.
     """
+    if RawCardStore.is_store(directory):
+        json_data = [record["json"] for record in RawCardStore(directory) if record["json"] is not None]
+        logger.info(f"Loaded {len(json_data)} JSON records from store {directory}")
+        return json_data
+
     json_data = []
     for filename in os.listdir(directory):
         if filename.endswith(".json"):
@@ -30,6 +48,26 @@ def load_all_json_files(directory):
     logger.info(f"Loaded {len(json_data)} JSON files from {directory}")
     return json_data
 
+def property_record(entry):
+    """
+    Extract Important fields from one JSON-LD entry
+    """
+    return {
+        "title" : entry.get("name"),
+        "description": entry.get("description"),
+        "address": entry.get("address" , {}).get("streetAddress"),
+        "locality": entry.get("address" , {}).get("addressLocality"),
+        "region": entry.get("address", {}).get("addressRegion"),
+        "latitude": entry.get("geo", {}).get("latitude"),
+        "longitude": entry.get("geo", {}).get("longitude"),
+        "price": entry.get("offers", {}).get("price"),
+        "currency": entry.get("offers", {}).get("priceCurrency"),
+        "propertyType": entry.get("@type"),
+        "postedBy": entry.get("seller", {}).get("@type"),
+        "sellerName": entry.get("seller", {}).get("name"),
+        "url": entry.get("url")
+    }
+
 def parse_property_data(json_records):
     """
     Extract Important records from json records
@@ -37,24 +75,7 @@ def parse_property_data(json_records):
     cleaned_data=[]
     for entry in json_records:
         try:
-            property_data ={
-
-                "title" : entry.get("name"),
-                "description": entry.get("description"),
-                "address": entry.get("address" , {}).get("streetAddress"),
-                "locality": entry.get("address" , {}).get("addressLocality"),
-                "region": entry.get("address", {}).get("addressRegion"),
-                "latitude": entry.get("geo", {}).get("latitude"),
-                "longitude": entry.get("geo", {}).get("longitude"),
-                "price": entry.get("offers", {}).get("price"),
-                "currency": entry.get("offers", {}).get("priceCurrency"),
-                "propertyType": entry.get("@type"),
-                "postedBy": entry.get("seller", {}).get("@type"),
-                "sellerName": entry.get("seller", {}).get("name"),
-                "url": entry.get("url")
-                
-            }
-            cleaned_data.append(property_data)
+            cleaned_data.append(property_record(entry))
         except Exception as e:
             logger.warning(f"FAILED to PARSE ENTRY : {e}")
     return pd.DataFrame(cleaned_data)
@@ -66,3 +87,34 @@ def save_cleaned_data(df):
     df.to_csv(CLEANED_DATA_PATH, index=False)
     logger.info(f"Saved Cleaned Data to {CLEANED_DATA_PATH} with {len(df)} records")
 
+
+def _card_record(text):
+    # one JSON card file -> its cleaned record ({} when it cannot be read)
+    data = _load_json(text)
+    if data is None:
+        return {}
+    try:
+        return property_record(data)
+    except Exception as e:
+        logger.warning(f"FAILED to PARSE ENTRY : {e}")
+        return {}
+
+
+def update_cleaned_data(directory=RAW_JSON_DIR, output=CLEANED_DATA_PATH, batch_size=1000):
+    """
+    Incremental counterpart of load_all_json_files + parse_property_data +
+    save_cleaned_data: a manifest next to `output` keeps each JSON file's
+    content hash and output row, so only new or changed files are parsed,
+    their records appended and the rows of changed and removed files
+    dropped. Returns the added/changed/unchanged/removed stats.
+    """
+    if RawCardStore.is_store(directory):
+        raise ValueError("incremental updates need a directory of JSON files; a raw card store is append-only")
+    paths = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".json"))
+    writer = make_writer(output, list(property_record({})))
+    manifest = ParseManifest(f"{output}.manifest.json")
+    stats = incremental_update(paths, _card_record, manifest, writer,
+                               lambda records: write_in_batches(((None, r) for r in records), writer,
+                                                                batch_size=batch_size))
+    logger.info(f"Updated {output} from {directory}: {stats}")
+    return stats
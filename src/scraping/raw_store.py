@@ -0,0 +1,449 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from src.config.scraping_config import RAW_STORE_BLOCK_KB, RAW_STORE_CODEC, RAW_STORE_DIR, RAW_STORE_SHARD_MB
+from src.utils.logger import logger
+
+STORE_FILE = "store.json"
+INDEX_FILE = "index.tsv"
+LOCK_FILE = "writer.lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory lock, one writer per store is assumed
+    fcntl = None
+
+_JSON_LD = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+_LISTING_ID = re.compile(r"[?&]id=([0-9A-Za-z]+)")
+_CARD_NUMBER = re.compile(r"card_(\d+)\.(html|json)$")
+
+
+class _Gzip:
+    extension = ".jsonl.gz"
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=6, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+class _Zstd:
+    extension = ".jsonl.zst"
+
+    def __init__(self):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("The 'zstd' raw store codec needs the zstandard package (pip install zstandard)") from e
+        self._zstd = zstandard
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.ZstdCompressor(level=3).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._zstd.ZstdDecompressor().decompress(data)
+
+
+CODECS = {"gzip": _Gzip, "zstd": _Zstd}
+
+
+def card_id(html: str = None, json_ld=None) -> str:
+    """
+    Listing id from the JSON-LD url (the id the harvester de-duplicates on);
+    cards without one are keyed by a hash of their markup.
+    """
+    url = json_ld.get("url") if isinstance(json_ld, dict) else None
+    match = _LISTING_ID.search(url or "")
+    if match:
+        return match.group(1)
+    return hashlib.sha1((html or json.dumps(json_ld, sort_keys=True)).encode("utf-8")).hexdigest()[:24]
+
+
+class RawCardStore:
+    """
+    Append-only store of raw cards ({"id", "name", "html", "json"} records).
+
+    Records are buffered into blocks of ~block_kb of JSONL, each block
+    compressed on its own and appended to the current shard file, which is
+    rolled once it would pass shard_mb. A shard is therefore a valid
+    .jsonl.gz / .jsonl.zst stream on its own. index.tsv gets one line per
+    record (id, shard, block offset, block length, line in block) after its
+    block is written, so:
+
+    - get(id) decompresses a single block (the latest record for that id);
+    - scan() streams every record in append order, block by block;
+    - a crash loses at most the unflushed block. Readers skip a torn index
+      line (and never look past the last indexed block); the first write
+      takes an exclusive lock on the store and only then cuts the torn line
+      and any unindexed shard bytes off.
+
+    Records still buffered are not visible to readers until flush().
+    """
+
+    def __init__(self, root: str = RAW_STORE_DIR, codec: str = RAW_STORE_CODEC,
+                 shard_mb: float = RAW_STORE_SHARD_MB, block_kb: float = RAW_STORE_BLOCK_KB):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        store_path = os.path.join(root, STORE_FILE)
+        if os.path.exists(store_path):
+            with open(store_path, encoding="utf-8") as f:
+                codec = json.load(f)["codec"]
+        else:
+            tmp_path = f"{store_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": 1, "codec": codec}, f)
+            os.replace(tmp_path, store_path)
+        self.codec_name = codec
+        self.codec = CODECS[codec]()
+        self.shard_bytes = int(shard_mb * 2**20)
+        self.block_bytes = int(block_kb * 1024)
+        self.index_path = os.path.join(root, INDEX_FILE)
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self._pending_bytes = 0
+        self._shard_file = None
+        self._index_file = None
+        self._lock_file = None
+        self._cached_block = (None, None)
+        self._shard = self._shard_end = None
+        self._load_index()
+
+    @staticmethod
+    def is_store(path: str) -> bool:
+        return os.path.exists(os.path.join(path, STORE_FILE))
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.root, f"shard-{shard:05d}{self.codec.extension}")
+
+    def _load_index(self) -> tuple:
+        # (block end per shard, committed bytes, index bytes); a torn last line is skipped, not cut
+        self._index = {}
+        self.records = 0
+        ends = {}
+        if not os.path.exists(self.index_path):
+            return ends, 0, 0
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        committed = data[:data.rfind(b"\n") + 1]
+        for line in committed.decode("utf-8").splitlines():
+            key, shard, offset, length, row = line.split("\t")
+            entry = (int(shard), int(offset), int(length), int(row))
+            self._index[key] = entry
+            ends[entry[0]] = max(ends.get(entry[0], 0), entry[1] + entry[2])
+            self.records += 1
+        return ends, len(committed), len(data)
+
+    def _open_for_writing(self):
+        # first write: take the writer lock, then repair what a crashed writer left behind
+        self._lock_file = open(os.path.join(self.root, LOCK_FILE), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                self._lock_file = None
+                raise RuntimeError(f"{self.root} is already open for writing by another process")
+        self._shard, self._shard_end = self._recover()
+
+    def _recover(self) -> tuple:
+        # only called with the writer lock held; no reader ever truncates
+        ends, committed, size = self._load_index()
+        if committed < size:
+            logger.warning(f"Dropping a torn index line in {self.index_path}")
+            with open(self.index_path, "r+b") as f:
+                f.truncate(committed)
+
+        shards = sorted(int(name[6:11]) for name in os.listdir(self.root)
+                        if name.startswith("shard-") and name.endswith(self.codec.extension))
+        for shard in shards:
+            path = self._shard_path(shard)
+            if os.path.getsize(path) > ends.get(shard, 0):
+                logger.warning(f"Truncating unindexed tail of {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(ends.get(shard, 0))
+        last = max(ends) if ends else 0
+        return last, ends.get(last, 0)
+
+    # -- writing ---------------------------------------------------------
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            self._pending.append((record["id"], line))
+            self._pending_bytes += len(line)
+            if self._pending_bytes >= self.block_bytes:
+                self._write_block()
+
+    def append_card(self, html: str = None, json_ld=None, name: str = None, listing_id: str = None) -> str:
+        """
+        Append one card; its JSON-LD is taken from the markup when not given.
+        Returns the id it was stored under.
+        """
+        if json_ld is None and html:
+            match = _JSON_LD.search(html)
+            if match:
+                try:
+                    json_ld = json.loads(match.group(1))
+                except ValueError as e:
+                    logger.warning(f"Error Parsing JSON_LD: {e}")
+        key = listing_id or card_id(html, json_ld)
+        self.append({"id": key, "name": name, "html": html, "json": json_ld})
+        return key
+
+    def _write_block(self):
+        if not self._pending:
+            return
+        if self._lock_file is None:
+            self._open_for_writing()
+        block = self.codec.compress(b"".join(line for _, line in self._pending))
+        if self._shard_end and self._shard_end + len(block) > self.shard_bytes:
+            if self._shard_file is not None:
+                self._shard_file.close()
+                self._shard_file = None
+            self._shard += 1
+            self._shard_end = 0
+        if self._shard_file is None:
+            self._shard_file = open(self._shard_path(self._shard), "ab")
+        if self._index_file is None:
+            self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+        offset = self._shard_end
+        self._shard_file.write(block)
+        self._shard_file.flush()
+        self._shard_end += len(block)
+        entries = [(key, (self._shard, offset, len(block), row)) for row, (key, _) in enumerate(self._pending)]
+        self._index_file.write("".join(f"{key}\t{s}\t{o}\t{n}\t{r}\n" for key, (s, o, n, r) in entries))
+        self._index_file.flush()
+        self._index.update(entries)
+        self.records += len(entries)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def flush(self):
+        """
+        Write the buffered block and fsync shard and index.
+        """
+        with self._lock:
+            self._write_block()
+            for f in (self._shard_file, self._index_file):
+                if f is not None:
+                    os.fsync(f.fileno())
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for f in (self._shard_file, self._index_file, self._lock_file):
+                if f is not None:
+                    f.close()
+            self._shard_file = self._index_file = self._lock_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- reading ---------------------------------------------------------
+
+    def _read_block(self, shard: int, offset: int, length: int, f=None) -> list:
+        key = (shard, offset)
+        if self._cached_block[0] == key:
+            return self._cached_block[1]
+        if f is None:
+            with open(self._shard_path(shard), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        else:
+            f.seek(offset)
+            data = f.read(length)
+        lines = self.codec.decompress(data).split(b"\n")
+        self._cached_block = (key, lines)
+        return lines
+
+    def get(self, listing_id: str):
+        """
+        Latest record stored under `listing_id`, or None.
+        """
+        entry = self._index.get(listing_id)
+        if entry is None:
+            return None
+        shard, offset, length, row = entry
+        return json.loads(self._read_block(shard, offset, length)[row])
+
+    def __contains__(self, listing_id: str) -> bool:
+        return listing_id in self._index
+
+    def __len__(self) -> int:
+        return self.records
+
+    def ids(self):
+        return self._index.keys()
+
+    def _blocks(self):
+        # (shard, offset, length, rows) in append order, from the committed index lines
+        if not os.path.exists(self.index_path):
+            return
+        block, rows = None, 0
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                _, shard, offset, length, _ = line.split("\t")
+                key = (int(shard), int(offset), int(length))
+                if key != block:
+                    if block is not None:
+                        yield (*block, rows)
+                    block, rows = key, 0
+                rows += 1
+        if block is not None:
+            yield (*block, rows)
+
+    def last_position(self):
+        """
+        Position of the last committed record (None for an empty store), from the index alone.
+        """
+        last = None
+        for shard, offset, _, rows in self._blocks():
+            last = f"{shard:05d}:{offset:012d}:{rows - 1:05d}"
+        return last
+
+    def scan(self, after: str = None):
+        """
+        Yield (position, record) for every record in append order, one
+        block in memory at a time. Positions sort in append order, so a
+        caller can checkpoint one and resume with scan(after=position).
+        """
+        shard_file, open_shard = None, None
+        try:
+            for shard, offset, length, rows in self._blocks():
+                block_position = f"{shard:05d}:{offset:012d}"
+                if after is not None and f"{block_position}:{rows - 1:05d}" <= after:
+                    continue
+                if shard != open_shard:
+                    if shard_file is not None:
+                        shard_file.close()
+                    shard_file, open_shard = open(self._shard_path(shard), "rb"), shard
+                lines = self._read_block(shard, offset, length, shard_file)
+                for row in range(rows):
+                    position = f"{block_position}:{row:05d}"
+                    if after is None or position > after:
+                        yield position, json.loads(lines[row])
+        finally:
+            if shard_file is not None:
+                shard_file.close()
+
+    def __iter__(self):
+        return (record for _, record in self.scan())
+
+    def stats(self) -> dict:
+        shards = [name for name in os.listdir(self.root) if name.startswith("shard-")]
+        size = sum(os.path.getsize(os.path.join(self.root, name)) for name in os.listdir(self.root))
+        return {"records": self.records, "ids": len(self._index), "shards": len(shards),
+                "files": len(os.listdir(self.root)), "bytes": size, "codec": self.codec_name}
+
+
+def _numbered_files(directory: str) -> dict:
+    files = {}
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = _CARD_NUMBER.match(name)
+            if match:
+                files[int(match.group(1))] = os.path.join(directory, name)
+    return files
+
+
+def _read_json(path: str):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def migrate_card_dirs(html_dir: str, json_dir: str, store: RawCardStore, remove: bool = False) -> dict:
+    """
+    Append every card_<n>.html of html_dir, with card_<n>.json of json_dir
+    as its JSON-LD, to `store` in n order (JSON files without markup become
+    json-only records). With remove=True, once the store is flushed, a
+    source file is deleted only if its record reads back equal to it;
+    unparseable JSON files and anything that does not match are kept.
+    """
+    html_files, json_files = _numbered_files(html_dir), _numbered_files(json_dir)
+    store.flush()
+    start = store.last_position()
+    stats = {"cards": 0, "json_only": 0, "bad_json": 0, "removed": 0, "kept": 0}
+    # n -> the source files its record was built from
+    sources = {}
+
+    for n in sorted(set(html_files) | set(json_files)):
+        html = json_ld = None
+        used = []
+        if n in html_files:
+            with open(html_files[n], encoding="utf-8") as f:
+                html = f.read()
+            used.append(html_files[n])
+        if n in json_files:
+            try:
+                json_ld = _read_json(json_files[n])
+                used.append(json_files[n])
+            except ValueError as e:
+                logger.warning(f"Error reading {json_files[n]}: {e}")
+                stats["bad_json"] += 1
+        if html is None and json_ld is None:
+            continue
+        store.append_card(html, json_ld, name=f"card_{n}")
+        sources[n] = used
+        stats["cards"] += 1
+        stats["json_only"] += html is None
+    store.flush()
+    logger.info(f"Migrated {stats['cards']} cards from {html_dir} and {json_dir} into {store.root}: {stats}")
+
+    if remove:
+        verified = []
+        for _, record in store.scan(after=start):
+            n = int(record["name"][5:])
+            for path in sources.pop(n, []):
+                if path.endswith(".html"):
+                    with open(path, encoding="utf-8") as f:
+                        matches = f.read() == record["html"]
+                else:
+                    matches = _read_json(path) == record["json"]
+                if matches:
+                    verified.append(path)
+                else:
+                    logger.warning(f"{path} does not match its stored record; kept")
+        for path in verified:
+            os.remove(path)
+        stats["removed"] = len(verified)
+        stats["kept"] = len(html_files) + len(json_files) - len(verified)
+        logger.info(f"Removed {stats['removed']} verified card files, kept {stats['kept']}")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append-only sharded store for raw cards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="move card_<n>.html/.json directories into a store")
+    migrate.add_argument("--html-dir", default="data/raw/html")
+    migrate.add_argument("--json-dir", default="data/raw/json")
+    migrate.add_argument("--store", default=RAW_STORE_DIR)
+    migrate.add_argument("--codec", choices=sorted(CODECS), default=RAW_STORE_CODEC)
+    migrate.add_argument("--remove", action="store_true", help="delete the source files once verified")
+    stats = commands.add_parser("stats")
+    stats.add_argument("--store", default=RAW_STORE_DIR)
+    get = commands.add_parser("get", help="print the latest record for a listing id")
+    get.add_argument("listing_id")
+    get.add_argument("--store", default=RAW_STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        with RawCardStore(args.store, args.codec) as store:
+            print(migrate_card_dirs(args.html_dir, args.json_dir, store, remove=args.remove))
+            print(store.stats())
+    elif args.command == "stats":
+        print(RawCardStore(args.store).stats())
+    else:
+        print(json.dumps(RawCardStore(args.store).get(args.listing_id), indent=4, ensure_ascii=False))
@@ -1,6 +1,11 @@
+import hashlib
+import json
 import os
+import re
+import threading
 import time
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -8,28 +13,76 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from src.config.scraping_config import CHROMEDRIVER_CACHE_PATH, CHROMEDRIVER_PATH, SCRAPER_USER_AGENT
 from src.utils.logger import logger
 
+CARD_CLASS = "mb-srp__card"
+
+# One round trip per scroll: the cards from index `start` on (outerHTML and the
+# listing id from their JSON-LD url), then scroll to the bottom for the next batch
+HARVEST_JS = """
+const start = arguments[0];
+const cards = document.getElementsByClassName(arguments[1]);
+const batch = [];
+for (let i = start; i < cards.length; i++) {
+    const ld = cards[i].querySelector('script[type="application/ld+json"]');
+    const match = ld ? /[?&]id=([0-9A-Za-z]+)/.exec(ld.textContent) : null;
+    batch.push({html: cards[i].outerHTML, id: match ? match[1] : null});
+}
+window.scrollTo(0, document.body.scrollHeight);
+return {cards: batch, total: cards.length};
+"""
+
+CARD_COUNT_JS = "return document.getElementsByClassName(arguments[0]).length;"
+
+_JSON_LD = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+_LISTING_ID = re.compile(r"[?&]id=([0-9A-Za-z]+)")
+
+
+def resolve_chromedriver(cache_path: str = CHROMEDRIVER_CACHE_PATH) -> str:
+    """
+    Path of the chromedriver binary. CHROMEDRIVER_PATH wins; otherwise the
+    path webdriver_manager resolved last time is reused while the file still
+    exists, so only the first run does a network lookup.
+    """
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            path = json.load(f).get("path")
+        if path and os.path.exists(path):
+            return path
+
+    path = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path}, f)
+    os.replace(tmp_path, cache_path)
+    logger.info(f"Resolved chromedriver: {path}")
+    return path
 
-def scroll_and_collect_property_cards(url, scroll_limit=50, scroll_pause=2):
-    logger.info("Launching Broswer to scroll MagicBricks...")
 
-    # chrome_options = Options()
-    # #chrome_options.add_argument("--headless=new")
-    # chrome_options.add_argument("--disable-gpu")
-    # chrome_options.add_argument("--no-sandbox")
+def make_driver(headless: bool = True):
     options = Options()
-    options.add_argument("--headless=new")  # Enable headless mode (remove this line to disable)
+    if headless:
+        options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1920,1080")  # Optional but recommended for full rendering
     options.add_argument("--disable-dev-shm-usage")  # Avoid /dev/shm size issues in containers
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                     "AppleWebKit/537.36 (KHTML, like Gecko) "
-                     "Chrome/114.0.5735.199 Safari/537.36")
+    options.add_argument(f"user-agent={SCRAPER_USER_AGENT}")
+    return webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
 
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+def scroll_and_collect_property_cards(url, scroll_limit=50, scroll_pause=2, debug_dump=None):
+    """
+    Fixed-pause scrolling, then one BeautifulSoup pass over the final page.
+    harvest_property_cards is the event-driven alternative for long result lists.
+    """
+    logger.info("Launching Broswer to scroll MagicBricks...")
+
+    driver = make_driver()
     driver.get(url)
     time.sleep(5)
     cards = driver.find_elements(By.CLASS_NAME, "mb-srp__card")
@@ -45,8 +98,9 @@ def scroll_and_collect_property_cards(url, scroll_limit=50, scroll_pause=2):
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         time.sleep(scroll_pause)
         logger.info(f"Scrolled to height: {driver.execute_script('return document.body.scrollHeight')}")
-        with open("debug_full_page.html", "w", encoding="utf-8") as f:
-             f.write(driver.page_source)
+        if debug_dump:
+            with open(debug_dump, "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
 
 
 
@@ -83,3 +137,126 @@ def scroll_and_collect_property_cards(url, scroll_limit=50, scroll_pause=2):
 
     driver.quit()
     return cards
+
+
+class card_count_exceeds:
+    """
+    WebDriverWait condition: more than `count` result cards are in the DOM.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __call__(self, driver):
+        return driver.execute_script(CARD_COUNT_JS, CARD_CLASS) > self.count
+
+
+class CardSink:
+    """
+    Writes each harvested card as soon as it arrives: card_<n>.html and, when
+    the card embeds one, its JSON-LD as card_<n>.json (the layout
+    scroll_and_collect_property_cards produces and the parsers read).
+
+    Cards are de-duplicated by key across everything written to the sink,
+    and one sink can be shared by several crawl workers. With a
+    RawCardStore the cards are appended to its shards instead of being
+    written as one file each (call store.close() when the crawl is done).
+    """
+
+    def __init__(self, html_dir: str = "data/raw/html", json_dir: str = "data/raw/json", store=None):
+        self.html_dir = html_dir
+        self.json_dir = json_dir
+        self.store = store
+        self.count = 0
+        self.seen = set()
+        self._lock = threading.Lock()
+        if store is None:
+            os.makedirs(html_dir, exist_ok=True)
+            os.makedirs(json_dir, exist_ok=True)
+
+    def write(self, html: str, key: str = None) -> bool:
+        """
+        Write a card unless its key was written before. Returns whether it was new.
+        """
+        with self._lock:
+            if key is not None:
+                if key in self.seen:
+                    return False
+                self.seen.add(key)
+            self.count += 1
+            index = self.count
+        if self.store is not None:
+            self.store.append_card(html, name=f"card_{index}", listing_id=key)
+            return True
+        with open(os.path.join(self.html_dir, f"card_{index}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        match = _JSON_LD.search(html)
+        if match:
+            with open(os.path.join(self.json_dir, f"card_{index}.json"), "w", encoding="utf-8") as f:
+                f.write(match.group(1).strip())
+        return True
+
+
+def card_from_html(html: str) -> dict:
+    """
+    The {"html", "id"} record HARVEST_JS returns, built from saved card markup.
+    """
+    ld = _JSON_LD.search(html)
+    match = _LISTING_ID.search(ld.group(1)) if ld else None
+    return {"html": html, "id": match.group(1) if match else None}
+
+
+def card_key(card: dict) -> str:
+    # listing id from the JSON-LD url; cards without one are keyed by their markup
+    return card["id"] or hashlib.sha1(card["html"].encode("utf-8")).hexdigest()[:24]
+
+
+def harvest_property_cards(url, scroll_limit=50, timeout=10.0, driver=None, sink=None, debug_dump=None) -> dict:
+    """
+    Event-driven scrolling: after each scroll, wait until the card count
+    grows (instead of a fixed pause), pull only the cards added since the
+    previous scroll in the same JS call that scrolls, and stream the ones
+    with an unseen listing id to `sink` (shared sinks de-duplicate across
+    pages). Stops when no new cards appear
+    within `timeout` seconds or after `scroll_limit` scrolls.
+
+    The page is never re-serialized or re-parsed as a whole; `debug_dump`
+    (a path) opts into writing page_source after every scroll.
+    """
+    own_driver = driver is None
+    driver = driver or make_driver()
+    sink = sink or CardSink()
+    stats = {"cards": 0, "duplicates": 0, "scrolls": 0}
+    try:
+        driver.get(url)
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CLASS_NAME, CARD_CLASS)))
+        in_dom = 0
+        while True:
+            result = driver.execute_script(HARVEST_JS, in_dom, CARD_CLASS)
+            in_dom = result["total"]
+            for card in result["cards"]:
+                if sink.write(card["html"], card_key(card)):
+                    stats["cards"] += 1
+                else:
+                    stats["duplicates"] += 1
+            logger.info(f"Scroll {stats['scrolls']}: {len(result['cards'])} new in DOM, "
+                        f"{stats['cards']} unique so far")
+
+            if debug_dump:
+                with open(debug_dump, "w", encoding="utf-8") as f:
+                    f.write(driver.page_source)
+            if stats["scrolls"] >= scroll_limit:
+                break
+            try:
+                WebDriverWait(driver, timeout, poll_frequency=0.2).until(card_count_exceeds(in_dom))
+            except TimeoutException:
+                logger.info("No more new Content loaded on scroll.")
+                break
+            stats["scrolls"] += 1
+    finally:
+        if own_driver:
+            driver.quit()
+
+    logger.info(f"Harvested {stats['cards']} unique cards ({stats['duplicates']} duplicates) "
+                f"in {stats['scrolls']} scrolls")
+    return stats
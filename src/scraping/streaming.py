@@ -0,0 +1,210 @@
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.logger import logger
+
+
+class CSVBatchWriter:
+    """
+    Appends record batches to a CSV file; the header is written only when
+    the file is created, so a resumed run keeps extending the same file.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, records):
+        if self.columns is None:
+            self.columns = list(records[0])
+        df = pd.DataFrame(records, columns=self.columns)
+        header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        df.to_csv(self.path, mode="a", header=header, index=False)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def drop_rows(self, rows):
+        """
+        Rewrite the file without the given 0-based data rows, streaming it
+        in chunks; values are copied through as text.
+        """
+        drop = set(rows)
+        tmp_path = f"{self.path}.tmp"
+        start = 0
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            for i, chunk in enumerate(pd.read_csv(self.path, dtype=str, keep_default_na=False, chunksize=50_000)):
+                keep = [row not in drop for row in range(start, start + len(chunk))]
+                chunk[keep].to_csv(out, header=(i == 0), index=False)
+                start += len(chunk)
+        os.replace(tmp_path, self.path)
+
+    def position(self):
+        # bytes written so far; a checkpoint stores it so a resume can cut back to it
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def truncate(self, position):
+        if os.path.exists(self.path) and os.path.getsize(self.path) > position:
+            logger.warning(f"Dropping {os.path.getsize(self.path) - position} bytes written after the checkpoint "
+                           f"from {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(position)
+
+    def reset(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        pass
+
+
+class ParquetBatchWriter:
+    """
+    Writes each batch as a numbered part file under `path` (a directory), so
+    batches are durable as soon as they are flushed and a resumed run just
+    adds parts. pd.read_parquet(path) reads the whole dataset back.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns
+        os.makedirs(path, exist_ok=True)
+        self._part = len(self._parts())
+
+    def _parts(self):
+        return sorted(f for f in os.listdir(self.path) if f.startswith("part-") and f.endswith(".parquet"))
+
+    def write(self, records):
+        if self.columns is None:
+            self.columns = list(records[0])
+        # scraped fields are kept as strings here; typing happens downstream
+        arrays = [pa.array([None if r.get(c) is None else str(r.get(c)) for r in records], pa.string())
+                  for c in self.columns]
+        table = pa.Table.from_arrays(arrays, names=self.columns)
+        tmp_path = os.path.join(self.path, f".part-{self._part:05d}.parquet.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, os.path.join(self.path, f"part-{self._part:05d}.parquet"))
+        self._part += 1
+
+    def exists(self):
+        return bool(self._parts())
+
+    def drop_rows(self, rows):
+        """
+        Rewrite only the part files holding the given 0-based rows (dataset
+        order). Emptied parts are kept, so part numbers never repeat.
+        """
+        drop = sorted(rows)
+        start = 0
+        for name in self._parts():
+            path = os.path.join(self.path, name)
+            n_rows = pq.read_metadata(path).num_rows
+            hits = {row - start for row in drop if start <= row < start + n_rows}
+            if hits:
+                table = pq.read_table(path)
+                keep = pa.array([i not in hits for i in range(n_rows)])
+                tmp_path = os.path.join(self.path, f".{name}.tmp")
+                pq.write_table(table.filter(keep), tmp_path)
+                os.replace(tmp_path, path)
+            start += n_rows
+
+    def position(self):
+        return self._part
+
+    def truncate(self, position):
+        for f in self._parts()[position:]:
+            logger.warning(f"Dropping {f}, written after the checkpoint, from {self.path}")
+            os.remove(os.path.join(self.path, f))
+        self._part = min(self._part, position)
+
+    def reset(self):
+        for f in self._parts():
+            os.remove(os.path.join(self.path, f))
+        self._part = 0
+
+    def close(self):
+        pass
+
+
+def make_writer(path, columns=None):
+    if path.endswith(".parquet"):
+        return ParquetBatchWriter(path, columns)
+    return CSVBatchWriter(path, columns)
+
+
+class Checkpoint:
+    """
+    Remembers the last input file whose record has been flushed, the
+    running record count and the writer's output position at that point
+    (see write_in_batches), in a small JSON file written atomically.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.last_file = None
+        self.records = 0
+        self.output = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.last_file = state.get("last_file")
+            self.records = state.get("records", 0)
+            self.output = state.get("output")
+
+    @property
+    def exists(self):
+        return self.last_file is not None
+
+    def save(self, last_file, records, output=None):
+        self.last_file, self.records, self.output = last_file, records, output
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"last_file": last_file, "records": records, "output": output}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.last_file, self.records, self.output = None, 0, None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_in_batches(items, writer, checkpoint=None, batch_size=1000):
+    """
+    Drain an iterator of (source_file, record) pairs into `writer`, flushing
+    every `batch_size` records. After each flush the checkpoint is moved to
+    the last source file consumed, together with writer.position(). A batch
+    written just before a crash, but not yet checkpointed, is cut off again
+    with writer.truncate() on resume, so it is redone rather than
+    duplicated. Empty records (failed parses) are dropped but still advance
+    the checkpoint. Returns the number of records written in this run.
+    """
+    batch = []
+    last_file = None
+    written = 0
+    total = checkpoint.records if checkpoint else 0
+    if checkpoint is not None and checkpoint.exists and checkpoint.output is not None:
+        writer.truncate(checkpoint.output)
+
+    def flush():
+        nonlocal written, total
+        if batch:
+            writer.write(batch)
+            written += len(batch)
+            total += len(batch)
+            batch.clear()
+        if checkpoint is not None and last_file is not None:
+            checkpoint.save(last_file, total, writer.position())
+
+    for source, record in items:
+        last_file = source
+        if record:
+            batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    writer.close()
+    logger.info(f"Wrote {written} records ({total} in total)")
+    return written
@@ -0,0 +1,213 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from src.utils.logger import logger
+
+# Infinite-scroll stand-in for a MagicBricks results page: the first batch of
+# saved cards is in the markup, the rest is appended `batch` at a time, after
+# `delay` ms, whenever the window is scrolled to the bottom
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Saved results</title>
+<style>.mb-srp__card {{ min-height: 300px; border-bottom: 1px solid #ccc; }}</style></head>
+<body>
+<div id="results">{first}</div>
+<script type="application/json" id="pending">{pending}</script>
+<script>
+const pending = JSON.parse(document.getElementById("pending").textContent);
+const batch = {batch}, delay = {delay};
+let next = 0, loading = false;
+window.addEventListener("scroll", () => {{
+    if (loading || next >= pending.length) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 10) return;
+    loading = true;
+    setTimeout(() => {{
+        const results = document.getElementById("results");
+        for (const html of pending.slice(next, next + batch)) results.insertAdjacentHTML("beforeend", html);
+        next += batch;
+        loading = false;
+    }}, delay);
+}});
+</script>
+</body></html>
+"""
+
+_DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Listing</title>
+<script type="application/ld+json">{json_ld}</script></head>
+<body>{body}</body></html>
+"""
+
+_JSON_LD = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+
+
+def load_saved_cards(html_dir: str = "data/raw/html", limit: int = None) -> list:
+    paths = sorted(glob.glob(os.path.join(html_dir, "card_*.html")),
+                   key=lambda p: int(os.path.basename(p)[5:-5]))
+    cards = []
+    for path in paths[:limit]:
+        with open(path, encoding="utf-8") as f:
+            cards.append(f.read())
+    return cards
+
+
+def build_results_page(cards: list, batch: int = 30, delay_ms: int = 300, repeat_every: int = 0) -> str:
+    """
+    Results page for `cards`. With repeat_every=n, every n-th appended card is
+    a copy of an earlier one, the way the live site re-inserts promoted
+    listings, so de-duplication is exercised too.
+    """
+    cards = list(cards)
+    if repeat_every:
+        for i in range(len(cards) - 1, batch, -repeat_every):
+            cards.insert(i, cards[i - batch])
+    # "</" inside the JSON would end the <script> element early (cards embed JSON-LD scripts)
+    pending = json.dumps(cards[batch:]).replace("</", "<\\/")
+    return _PAGE.format(first="\n".join(cards[:batch]), pending=pending, batch=batch, delay=delay_ms)
+
+
+def build_site(cards: list, searches: int = 4, pages: int = 3, per_page: int = 60, **page_options) -> dict:
+    """
+    Stand-in for several search URLs with paginated results:
+    {"/search-<s>?page=<p>": html}, each page holding its own slice of `cards`
+    (wrapping around when there are fewer cards than slots).
+    """
+    site = {}
+    for s in range(searches):
+        for p in range(1, pages + 1):
+            start = ((s * pages + p - 1) * per_page) % max(len(cards), 1)
+            chunk = (cards[start:] + cards[:start])[:per_page]
+            site[f"/search-{s}?page={p}"] = build_results_page(chunk, **page_options)
+    return site
+
+
+def build_detail_site(cards: list, page_kb: int = 0) -> dict:
+    """
+    Stand-in listing-detail pages: {path of the card's JSON-LD url: html},
+    each page carrying that JSON-LD and the card markup, repeated up to
+    about `page_kb` KiB to mimic the weight of a real detail page.
+    """
+    site = {}
+    for html in cards:
+        match = _JSON_LD.search(html)
+        if not match:
+            continue
+        try:
+            url = json.loads(match.group(1)).get("url")
+        except ValueError:
+            continue
+        if not url:
+            continue
+        parts = urlsplit(url)
+        body = html * max(1, page_kb * 1024 // len(html))
+        site[parts.path + (f"?{parts.query}" if parts.query else "")] = _DETAIL_PAGE.format(
+            json_ld=match.group(1), body=body)
+    return site
+
+
+def serve_pages(pages: dict, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> tuple:
+    """
+    Serve {path (with query): html} from a background thread; the "*" entry,
+    if any, answers every other path. Connections are kept alive (HTTP/1.1),
+    every page has an ETag and If-None-Match is answered with 304, and each
+    response is delayed by `latency` seconds. server.counts tallies the
+    status codes sent. Returns (server, base_url); call server.shutdown()
+    when done.
+    """
+    bodies = {path: html.encode("utf-8") for path, html in pages.items()}
+    etags = {path: f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"' for path, body in bodies.items()}
+    counts = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            path = self.path if self.path in bodies else "*"
+            body = bodies.get(path)
+            if body is None:
+                self._count(404)
+                self.send_error(404)
+                return
+            if self.headers.get("If-None-Match") == etags[path]:
+                self._count(304)
+                self.send_response(304)
+                self.send_header("ETag", etags[path])
+                self.end_headers()
+                return
+            self._count(200)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etags[path])
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _count(self, status):
+            with lock:
+                counts[status] = counts.get(status, 0) + 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.counts = counts
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def serve_page(html: str, host: str = "127.0.0.1", port: int = 0) -> tuple:
+    """
+    Serve `html` at every path. Returns (server, url).
+    """
+    server, base_url = serve_pages({"*": html}, host, port)
+    return server, f"{base_url}/results"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve saved cards as a scrolling results page "
+                                                 "and optionally harvest it.")
+    parser.add_argument("--html-dir", default="data/raw/html")
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=30)
+    parser.add_argument("--delay-ms", type=int, default=300)
+    parser.add_argument("--repeat-every", type=int, default=7)
+    parser.add_argument("--harvest", action="store_true", help="run harvest_property_cards against the page")
+    parser.add_argument("--headed", action="store_true", help="show the browser while harvesting")
+    args = parser.parse_args()
+
+    cards = load_saved_cards(args.html_dir, args.limit)
+    server, url = serve_page(build_results_page(cards, args.batch, args.delay_ms, args.repeat_every))
+    logger.info(f"Serving {len(cards)} saved cards at {url}")
+    try:
+        if args.harvest:
+            from src.scraping.scroll_magicbricks import (
+                CardSink, card_from_html, card_key, harvest_property_cards, make_driver,
+            )
+
+            expected = len({card_key(card_from_html(c)) for c in cards})
+
+            with tempfile.TemporaryDirectory() as tmp:
+                sink = CardSink(os.path.join(tmp, "html"), os.path.join(tmp, "json"))
+                driver = make_driver(headless=not args.headed)
+                try:
+                    stats = harvest_property_cards(url, scroll_limit=10_000, timeout=5, driver=driver, sink=sink)
+                finally:
+                    driver.quit()
+            print(stats)
+            if stats["cards"] != expected:
+                raise SystemExit(f"Expected {expected} unique cards, harvested {stats['cards']}")
+        else:
+            input("Press Enter to stop.\n")
+    finally:
+        server.shutdown()
@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+from src.ml_pipeline.normalize import normalize_cards
+from src.ml_pipeline.processed_data import write_processed_dataset
+
+HTML_DATA_CSV = "data/processed/html_data.csv"
+CLEAN_DF_CSV = "notebooks/data/processed/clean_df.csv"
+
+
+@pytest.fixture(scope="session")
+def raw_cards():
+    return pd.read_csv(HTML_DATA_CSV, dtype=str)
+
+
+@pytest.fixture(scope="session")
+def parquet_dataset(raw_cards, tmp_path_factory):
+    root = tmp_path_factory.mktemp("processed") / "dataset"
+    write_processed_dataset(normalize_cards(raw_cards), str(root), crawl_date="2024-01-01")
+    return str(root)
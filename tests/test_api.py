@@ -0,0 +1,171 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+from src.api import batching, main
+from src.config.model_config import ENCODER_PATHS, FEATURE_COLUMNS, MODEL_PATH, SCALER_PATH
+from src.models.encoding import UnseenCategoryError
+from src.models.model_holder import holder
+from src.models.predict_model import SCALED_COLUMNS, predict_price_batch
+from src.models.registry import publish_artifact, registry
+from src.models.schemas import PropertyFeatures
+
+CLASSES = {
+    "Transaction": ["New Property", "Resale"],
+    "Furnishing": ["Furnished", "Semi-Furnished", "Unfurnished"],
+    "Possession_Status": ["Ready to Move", "Under Construction"],
+}
+ROWS = [
+    {"Transaction": "Resale", "Furnishing": "Furnished", "Bathroom": 2, "Price_per_Sqft": 6500.0,
+     "Total_Area": 1200.0, "Covered_parking": 1, "Open_parking": 0, "Possession_Status": "Ready to Move", "BHK": 2},
+    {"Transaction": "New Property", "Furnishing": "Unfurnished", "Bathroom": 3, "Price_per_Sqft": 7200.0,
+     "Total_Area": 1800.0, "Covered_parking": 2, "Open_parking": 1, "Possession_Status": "Under Construction",
+     "BHK": 3},
+]
+
+
+@pytest.fixture
+def serving(tmp_path, monkeypatch):
+    # a small scaler + linear model bundle, activated in place of whatever the holder had
+    monkeypatch.chdir(tmp_path)
+    registry.clear()
+    rng = np.random.default_rng(0)
+    X = rng.random((200, len(FEATURE_COLUMNS))) * 3
+    publish_artifact(LinearRegression().fit(X, rng.random(200) * 1e6), MODEL_PATH)
+    publish_artifact(MinMaxScaler().fit(X[:, SCALED_COLUMNS] * 5000), SCALER_PATH)
+    for col, path in ENCODER_PATHS.items():
+        publish_artifact(LabelEncoder().fit(CLASSES[col]), path)
+    monkeypatch.setattr(holder, "_bundle", None)
+    yield holder.current
+    registry.clear()
+
+
+def _columns(rows):
+    return {field: [row[field] for row in rows] for field in ROWS[0]}
+
+
+def test_poller_retries_warm_until_ready(monkeypatch):
+    calls = []
+
+    def warm():
+        calls.append("warm")
+        if len(calls) < 3:
+            raise FileNotFoundError("artifacts/model/model.pkl")
+
+    monkeypatch.setattr(main, "warm", warm)
+    monkeypatch.setattr(main, "refresh", lambda: calls.append("refresh"))
+    monkeypatch.setattr(main, "ARTIFACT_POLL_SECONDS", 0)
+    app = SimpleNamespace(state=SimpleNamespace(ready=False))
+
+    async def run():
+        await main.warm_artifacts(app)
+        poller = asyncio.create_task(main.poll_artifacts(app))
+        while "refresh" not in calls:
+            await asyncio.sleep(0.01)
+        poller.cancel()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert app.state.ready
+    assert calls[:4] == ["warm", "warm", "warm", "refresh"]
+
+
+def test_predict_batch_records_and_columns_agree(serving):
+    client = TestClient(main.app)
+    expected, _ = predict_price_batch(_columns(ROWS), artifacts=serving)
+
+    by_records = client.post("/predict/batch", json=ROWS)
+    by_columns = client.post("/predict/batch", json=_columns(ROWS))
+    assert by_records.status_code == by_columns.status_code == 200
+    assert by_records.json() == by_columns.json() == {"predicted_prices": expected, "errors": []}
+    assert client.post("/predict/batch", json=[]).json() == {"predicted_prices": [], "errors": []}
+
+
+def test_predict_batch_reports_unknown_categories_per_row(serving):
+    rows = [ROWS[0], {**ROWS[1], "Furnishing": "Fully Loaded"}]
+    response = TestClient(main.app).post("/predict/batch", json=rows)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["predicted_prices"][0] is not None and body["predicted_prices"][1] is None
+    assert [(e["index"], e["field"], e["value"]) for e in body["errors"]] == [(1, "Furnishing", "Fully Loaded")]
+
+
+@pytest.mark.parametrize("payload", [
+    {**_columns(ROWS), "BHK": [2]},  # ragged columns
+    [{k: v for k, v in ROWS[0].items() if k != "Total_Area"}],  # missing field
+    [{**ROWS[0], "Bathroom": "two"}],  # wrong type
+    {"rows": ROWS},  # neither records nor columns
+])
+def test_predict_batch_rejects_malformed_payloads(payload):
+    assert TestClient(main.app).post("/predict/batch", json=payload).status_code == 422
+
+
+def _run_batcher(batcher, submit):
+    async def run():
+        await batcher.start()
+        try:
+            return await submit()
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def _fake_predict(calls, errors=()):
+    def predict_records(records):
+        calls.append(len(records))
+        return [float(r.BHK) for r in records], [e for e in errors if e["index"] < len(records)]
+    return predict_records
+
+
+def test_microbatcher_flushes_when_full(monkeypatch):
+    calls = []
+    monkeypatch.setattr(batching, "predict_records", _fake_predict(calls))
+    batcher = batching.MicroBatcher(max_batch_size=3, max_wait_ms=60_000)
+    rows = [PropertyFeatures(**{**ROWS[0], "BHK": i}) for i in range(3)]
+
+    start = time.perf_counter()
+    results = _run_batcher(batcher, lambda: asyncio.gather(*(batcher.submit(r) for r in rows)))
+    assert time.perf_counter() - start < 1
+    assert results == [0.0, 1.0, 2.0]
+    assert calls == [3]
+
+
+def test_microbatcher_flushes_after_max_wait(monkeypatch):
+    calls = []
+    monkeypatch.setattr(batching, "predict_records", _fake_predict(calls))
+    batcher = batching.MicroBatcher(max_batch_size=64, max_wait_ms=20)
+
+    async def submit():
+        first = await asyncio.gather(*(batcher.submit(PropertyFeatures(**ROWS[0])) for _ in range(2)))
+        return first, await batcher.submit(PropertyFeatures(**ROWS[1]))
+
+    assert _run_batcher(batcher, submit) == ([2.0, 2.0], 3.0)
+    assert calls == [2, 1]
+
+
+def test_microbatcher_propagates_errors(monkeypatch):
+    def broken(records):
+        raise RuntimeError("model exploded")
+
+    batcher = batching.MicroBatcher(max_batch_size=2, max_wait_ms=20)
+
+    async def submit():
+        monkeypatch.setattr(batching, "predict_records", broken)
+        failed = await asyncio.gather(*(batcher.submit(PropertyFeatures(**ROWS[0])) for _ in range(2)),
+                                      return_exceptions=True)
+        # the consumer survives a failed batch; row errors only fail their own caller
+        monkeypatch.setattr(batching, "predict_records",
+                            _fake_predict([], [{"index": 1, "field": "Furnishing", "value": "Fully Loaded"}]))
+        mixed = await asyncio.gather(*(batcher.submit(PropertyFeatures(**row)) for row in ROWS),
+                                     return_exceptions=True)
+        return failed, mixed
+
+    failed, mixed = _run_batcher(batcher, submit)
+    assert all(isinstance(e, RuntimeError) for e in failed)
+    assert mixed[0] == 2.0
+    assert isinstance(mixed[1], UnseenCategoryError)
@@ -0,0 +1,36 @@
+import pickle
+import joblib
+import numpy as np
+import pytest
+from src.config.model_config import FEATURE_COLUMNS
+from src.models.backends import fit_params, make_regressor
+from src.models.registry import publish_artifact
+
+
+def _training_data(rows=300):
+    rng = np.random.default_rng(0)
+    X = rng.random((rows, len(FEATURE_COLUMNS)))
+    for col in ("Transaction", "Furnishing", "Possession_Status"):
+        X[:, FEATURE_COLUMNS.index(col)] = rng.integers(0, 3, rows)
+    y = 1e7 + 5e7 * X[:, FEATURE_COLUMNS.index("Total Area")] + rng.normal(0, 1e5, rows)
+    return X, y
+
+
+@pytest.mark.parametrize("backend", ["linear", "hist_gb", "lightgbm"])
+def test_fitted_backend_round_trips(backend, tmp_path):
+    if backend == "lightgbm":
+        pytest.importorskip("lightgbm")
+    X, y = _training_data()
+    model = make_regressor(backend).fit(X, y, **fit_params(backend))
+
+    path = tmp_path / "model.pkl"
+    publish_artifact(model, str(path))
+    loaded = joblib.load(path)
+    np.testing.assert_allclose(loaded.predict(X[:20]), model.predict(X[:20]))
+    np.testing.assert_allclose(pickle.loads(pickle.dumps(model)).predict(X[:20]), model.predict(X[:20]))
+
+
+def test_lightgbm_fit_params_name_categoricals():
+    categorical = fit_params("lightgbm")["categorical_feature"]
+    assert [FEATURE_COLUMNS[i] for i in categorical] == ["Transaction", "Furnishing", "Possession_Status"]
+    assert fit_params("linear") == {}
@@ -0,0 +1,92 @@
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+from src.database.bulk_writer import KEY_COLUMN, keyed_rows, upsert_dataframe
+
+
+def _cards():
+    return pd.DataFrame({
+        "listing_id": ["4d423830363231353233", "4d423830373431383431"],
+        "Title": ["3 BHK Flat in Kondapur", "2 BHK Flat in Gachibowli"],
+        "Price (INR)": ["₹1.2 Cr", "₹85 Lac"],
+        "Society": ["My Home Avatar", None],
+        "Carpet Area": ["1650 sqft", "1100 sqft"],
+        "Super Area": [None, None],
+        "Price per Sqft": ["₹7,272 per sqft", "₹7,727 per sqft"],
+    })
+
+
+def test_same_society_and_area_listings_stay_distinct(tmp_path):
+    twins = pd.DataFrame({
+        "listing_id": ["4d423830363231353233", "4d423830363231353234", None],
+        "Title": ["3 BHK Flat in Kondapur"] * 3,
+        "Price (INR)": ["₹1.2 Cr", "₹1.35 Cr", "₹1.2 Cr"],
+        "Furnishing": ["Unfurnished", "Semi-Furnished", "Unfurnished"],
+        "Society": ["My Home Avatar"] * 3,
+        "Carpet Area": ["1650 sqft"] * 3,
+    })
+    keyed, unkeyed = keyed_rows(twins)
+    assert keyed[KEY_COLUMN].tolist() == ["4d423830363231353233", "4d423830363231353234"]
+    assert unkeyed == 1
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    assert upsert_dataframe(twins, "properties", engine) == 2
+    rows = pd.read_sql_table("properties", engine)
+    assert sorted(rows["Price (INR)"]) == ["₹1.2 Cr", "₹1.35 Cr"]
+
+
+def test_key_filled_from_url():
+    cleaned = pd.DataFrame({"url": ["https://www.magicbricks.com/propertyDetails/3-BHK&id=4d4238", None]})
+    keyed, unkeyed = keyed_rows(cleaned)
+    assert keyed[KEY_COLUMN].tolist() == ["4d4238"]
+    assert unkeyed == 1
+
+
+def test_upsert_updates_in_place(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    upsert_dataframe(_cards(), "properties", engine)
+    upsert_dataframe(_cards().assign(**{"Price (INR)": ["₹1.3 Cr", "₹90 Lac"]}), "properties", engine)
+
+    rows = pd.read_sql_table("properties", engine)
+    assert len(rows) == 2
+    assert sorted(rows["Price (INR)"]) == ["₹1.3 Cr", "₹90 Lac"]
+
+
+def test_legacy_table_is_migrated(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    # layout written by the old to_sql(if_exists="replace") path: no listing_id, no key
+    legacy = pd.DataFrame({"url": ["https://x/p&id=4d01", "https://x/p&id=4d02", "https://x/p&id=4d01"],
+                           "price": [1, 2, 3]})
+    legacy.to_sql("properties", engine, index=False)
+
+    upsert_dataframe(pd.DataFrame({"url": ["https://x/p&id=4d03"], "price": [4]}), "properties", engine)
+
+    assert inspect(engine).get_pk_constraint("properties")["constrained_columns"] == [KEY_COLUMN]
+    assert not inspect(engine).has_table("properties_legacy")
+    rows = pd.read_sql_table("properties", engine).sort_values(KEY_COLUMN)
+    assert rows[KEY_COLUMN].tolist() == ["4d01", "4d02", "4d03"]
+    assert rows["price"].tolist() == [3, 2, 4]
+
+
+def test_legacy_rows_without_id_are_kept(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    # the old html_data layout had no url either: those rows cannot be keyed
+    pd.concat([_cards().drop(columns=[KEY_COLUMN])] * 2).to_sql("properties", engine, index=False)
+
+    upsert_dataframe(_cards(), "properties", engine)
+
+    assert len(pd.read_sql_table("properties", engine)) == 2
+    assert len(pd.read_sql_table("properties_legacy", engine)) == 4
+
+
+def test_delete_insert_fallback(tmp_path, monkeypatch):
+    from src.database import bulk_writer
+
+    # dialects without a native upsert get delete-then-insert
+    monkeypatch.setattr(bulk_writer, "_upsert_statement", lambda engine, table: None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    upsert_dataframe(_cards(), "properties", engine)
+    upsert_dataframe(_cards().iloc[:1].assign(**{"Price (INR)": "₹1.3 Cr"}), "properties", engine)
+
+    rows = pd.read_sql_table("properties", engine)
+    assert len(rows) == 2
+    assert "₹1.3 Cr" in rows["Price (INR)"].tolist()
@@ -0,0 +1,23 @@
+import asyncio
+import threading
+from src.scraping.fetcher import AsyncFetcher, FetchResult
+
+
+def test_stream_parses_off_the_event_loop():
+    fetcher = AsyncFetcher(concurrency=2)
+    loop_thread = threading.get_ident()
+
+    async def fetch(url):
+        await asyncio.sleep(0)
+        return FetchResult(url, 200, b"page")
+
+    def parse(result):
+        return {"url": result.url, "thread": threading.get_ident()}
+
+    async def run():
+        fetcher.fetch = fetch
+        return [record async for _, record in fetcher.stream(["a", "b", "c"], parse)]
+
+    records = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert sorted(r["url"] for r in records) == ["a", "b", "c"]
+    assert all(r["thread"] != loop_thread for r in records)
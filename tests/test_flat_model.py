@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from src.config.model_config import FEATURE_COLUMNS
+from src.models.flat_model import FlatTreeModel, export_flat_model, load_flat_model
+from src.models.tuning import build_ensemble
+
+
+@pytest.fixture(scope="module")
+def ensemble():
+    rng = np.random.default_rng(0)
+    X = rng.random((400, len(FEATURE_COLUMNS)))
+    y = 1e7 + 4e7 * X[:, 3] * X[:, 4] + 1e6 * X[:, 2] + rng.normal(0, 1e5, 400)
+    model = build_ensemble(rf_n_estimators=10, rf_max_depth=6, gbr_n_estimators=20).fit(X, y)
+    return model, rng.random((300, len(FEATURE_COLUMNS)))
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_flat_matches_voting_regressor(ensemble, tmp_path, mmap):
+    model, X = ensemble
+    path = str(tmp_path / "flat_model.bin")
+    export_flat_model(model, path)
+    flat = FlatTreeModel.load(path, mmap=mmap)
+
+    expected = model.predict(X)
+    assert np.allclose(flat.predict(X), expected, rtol=1e-9)
+    assert np.allclose([flat.predict_one(row) for row in X[:50]], expected[:50], rtol=1e-9)
+
+
+def test_stale_flat_model_is_ignored(ensemble, tmp_path):
+    model, _ = ensemble
+    path = str(tmp_path / "flat_model.bin")
+    export_flat_model(model, path)
+    assert load_flat_model(model, path) is not None
+
+    X = np.random.default_rng(1).random((100, len(FEATURE_COLUMNS)))
+    retrained = build_ensemble(rf_n_estimators=5, gbr_n_estimators=5).fit(X, X[:, 0])
+    assert load_flat_model(retrained, path) is None
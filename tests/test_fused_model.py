@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.preprocessing import MinMaxScaler
+from src.config.model_config import FEATURE_COLUMNS
+from src.models.fused_model import (
+    SCALED_COLUMNS,
+    FusedLinearModel,
+    export_fused_model,
+    load_fused_model,
+    sample_raw_features,
+)
+
+
+def _fitted(model_class=LinearRegression, rows=400):
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 5, size=(rows, len(FEATURE_COLUMNS))).astype(np.float64)
+    X[:, SCALED_COLUMNS] = rng.uniform([2000, 500], [20000, 4000], size=(rows, len(SCALED_COLUMNS)))
+    y = X[:, SCALED_COLUMNS[0]] * X[:, SCALED_COLUMNS[1]] + rng.normal(0, 1e5, rows)
+
+    scaler = MinMaxScaler().fit(X[:, SCALED_COLUMNS])
+    X_scaled = X.copy()
+    X_scaled[:, SCALED_COLUMNS] = scaler.transform(X[:, SCALED_COLUMNS])
+    return model_class().fit(X_scaled, y), scaler
+
+
+@pytest.mark.parametrize("model_class", [LinearRegression, Ridge])
+def test_fused_matches_scaler_plus_model(model_class, tmp_path):
+    model, scaler = _fitted(model_class)
+    path = str(tmp_path / "fused_model.npz")
+    export_fused_model(model, scaler, path)
+    fused = load_fused_model(model, scaler, path)
+    assert fused is not None
+
+    X_raw = sample_raw_features(scaler, n_rows=500)
+    X_scaled = X_raw.copy()
+    X_scaled[:, SCALED_COLUMNS] = scaler.transform(X_raw[:, SCALED_COLUMNS])
+    expected = model.predict(X_scaled)
+
+    assert np.allclose(fused.predict(X_raw), expected, rtol=1e-9)
+    assert np.allclose([fused.predict_one(row.tolist()) for row in X_raw], expected, rtol=1e-9)
+    assert np.allclose([fused.predict_one(row) for row in X_raw], expected, rtol=1e-9)
+
+
+def test_stale_fused_model_is_ignored(tmp_path):
+    model, scaler = _fitted()
+    path = str(tmp_path / "fused_model.npz")
+    export_fused_model(model, scaler, path)
+    retrained, _ = _fitted(Ridge)
+    assert load_fused_model(retrained, scaler, path) is None
+    assert isinstance(FusedLinearModel.load(path), FusedLinearModel)
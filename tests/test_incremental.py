@@ -0,0 +1,106 @@
+import json
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from src.config.model_config import ENCODER_PATHS, FEATURE_COLUMNS, INCREMENTAL_STATE_PATH, MANIFEST_PATH, MODEL_PATH
+from src.ml_pipeline.normalize import TARGET_COLUMN
+from src.models.encoding import VocabularyEncoder, compile_encoder
+from src.models.incremental import append_rows, train_incremental
+from src.models.registry import registry
+
+
+def _rows(n, seed, transactions=("New Property", "Resale")):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(500, 3000, n)
+    return pd.DataFrame({
+        "Transaction": rng.choice(transactions, n),
+        "Furnishing": rng.choice(["Furnished", "Semi-Furnished", "Unfurnished"], n),
+        "Bathroom": rng.integers(1, 4, n).astype(float),
+        "Price per Sqft": rng.uniform(4000, 9000, n),
+        "Total Area": area,
+        "Covered_parking": rng.integers(0, 3, n),
+        "Open_parking": rng.integers(0, 2, n),
+        "Possession_Status": rng.choice(["Ready to Move", "Under Construction"], n),
+        "BHK": rng.integers(1, 5, n).astype(float),
+        TARGET_COLUMN: area * 6500 + rng.normal(0, 1e5, n),
+    })[FEATURE_COLUMNS + [TARGET_COLUMN]]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry.clear()
+    yield tmp_path
+    registry.clear()
+
+
+def test_new_categories_keep_codes_and_transform(workdir):
+    append_rows(_rows(200, 0), "data.csv")
+    assert train_incremental("data.csv")["mode"] == "full"
+
+    # "Builder Floor" sorts before the existing classes; it must get the next code instead
+    append_rows(_rows(50, 1, transactions=("Resale", "Builder Floor")), "data.csv")
+    assert train_incremental("data.csv")["mode"] == "incremental"
+
+    encoder = joblib.load(ENCODER_PATHS["Transaction"])
+    assert isinstance(encoder, VocabularyEncoder)
+    assert encoder.classes_.tolist() == ["New Property", "Resale", "Builder Floor"]
+    assert encoder.transform(["Builder Floor", "New Property", "Resale"]).tolist() == [2, 0, 1]
+    assert compile_encoder(encoder, "Transaction").encode("Builder Floor") == 2
+
+
+def test_state_out_of_step_with_bundle_forces_full_retrain(workdir):
+    append_rows(_rows(200, 0), "data.csv")
+    train_incremental("data.csv")
+    # as if the next run had published a bundle and died before saving its state
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] = "0" * 12
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    append_rows(_rows(20, 1), "data.csv")
+    info = train_incremental("data.csv")
+    assert info["mode"] == "full"
+    with open(INCREMENTAL_STATE_PATH, encoding="utf-8") as f:
+        assert json.load(f)["rows_total"] == 220
+
+
+def test_published_preprocessing_matches_the_fit(workdir):
+    from src.config.model_config import FEATURE_FIELDS
+    from src.models.incremental import fit_preprocessing, publish
+    from src.models.model_holder import load_bundle
+    from src.models.predict_model import predict_price_batch
+    from src.models.tuning import build_ensemble
+
+    df = _rows(300, 0)
+    X, artifacts = fit_preprocessing(df)
+    artifacts.model = build_ensemble(rf_n_estimators=10, gbr_n_estimators=10).fit(X, df[TARGET_COLUMN])
+    publish(artifacts)
+
+    columns = {FEATURE_FIELDS[col]: df[col].tolist() for col in FEATURE_COLUMNS}
+    predictions, errors = predict_price_batch(columns, artifacts=load_bundle())
+    assert not errors
+    np.testing.assert_allclose(predictions, artifacts.model.predict(X), rtol=1e-6)
+
+
+def test_ensemble_publishes_its_own_preprocessing(workdir):
+    pytest.importorskip("mlflow")
+    from src.models.model_holder import load_bundle
+    from src.models.predict_model import predict_price_batch
+    from src.models.train_model_ensemble import train_ensemble_model
+
+    df = _rows(300, 1)
+    df.to_csv("data.csv", index=False)
+    train_ensemble_model("data.csv", MODEL_PATH)
+
+    bundle = load_bundle()
+    assert bundle.scaler.data_max_[1] == pytest.approx(df["Total Area"].max())
+    predictions, errors = predict_price_batch({"Transaction": ["Resale"], "Furnishing": ["Furnished"],
+                                               "Bathroom": [2], "Price_per_Sqft": [6500.0],
+                                               "Total_Area": [1200.0], "Covered_parking": [1],
+                                               "Open_parking": [0], "Possession_Status": ["Ready to Move"],
+                                               "BHK": [2]}, artifacts=bundle)
+    assert not errors
+    assert 2e6 < predictions[0] < 1.2e7
@@ -0,0 +1,65 @@
+import os
+import pandas as pd
+import pytest
+from src.scraping.extract_from_html_cards import parse_all_html_cards
+from src.scraping.parse_clean_cards import load_all_json_files, update_cleaned_data
+
+
+def _card(title, price):
+    return (f'<div class="mb-srp__card"><h2 class="mb-srp__card--title">{title}</h2>'
+            f'<div class="mb-srp__card__price--amount">{price}</div></div>')
+
+
+def _read(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=str)
+
+
+@pytest.mark.parametrize("name", ["html_data.csv", "html_data.parquet"])
+def test_incremental_parse_touches_only_changed_rows(tmp_path, name):
+    cards, output = tmp_path / "cards", str(tmp_path / name)
+    cards.mkdir()
+    for n in range(6):
+        (cards / f"card_{n}.html").write_text(_card(f"{n} BHK Flat", f"₹{n} Cr"), encoding="utf-8")
+
+    stats = parse_all_html_cards(str(cards), output, incremental=True)
+    assert stats["added"] == 6
+    assert sorted(_read(output)["Title"]) == [f"{n} BHK Flat" for n in range(6)]
+
+    (cards / "card_2.html").write_text(_card("2 BHK Flat", "₹9 Cr"), encoding="utf-8")
+    os.remove(cards / "card_4.html")
+    (cards / "card_6.html").write_text(_card("6 BHK Flat", "₹6 Cr"), encoding="utf-8")
+    stats = parse_all_html_cards(str(cards), output, incremental=True)
+    assert (stats["added"], stats["changed"], stats["removed"], stats["unchanged"]) == (1, 1, 1, 4)
+    assert (stats["rows_dropped"], stats["rows_appended"]) == (2, 2)
+
+    df = _read(output)
+    assert sorted(df["Title"]) == [f"{n} BHK Flat" for n in (0, 1, 2, 3, 5, 6)]
+    assert df.loc[df["Title"] == "2 BHK Flat", "Price (INR)"].tolist() == ["9 Cr"]
+
+    with open(f"{output}.manifest.json", encoding="utf-8") as f:
+        assert "record" not in f.read()
+    assert parse_all_html_cards(str(cards), output, incremental=True)["unchanged"] == 6
+
+
+def test_cleaned_data_update_parses_only_the_diff(tmp_path, monkeypatch):
+    from src.scraping import parse_clean_cards
+
+    cards, output = tmp_path / "json", str(tmp_path / "cleaned_property_data.csv")
+    cards.mkdir()
+    (cards / "a.json").write_text('{"name": "a"}', encoding="utf-8")
+    (cards / "b.json").write_text("{broken", encoding="utf-8")
+
+    stats = update_cleaned_data(str(cards), output)
+    assert (stats["added"], stats["rows_appended"]) == (2, 1)
+    assert load_all_json_files(str(cards)) == [{"name": "a"}]
+
+    (cards / "c.json").write_text('{"name": "c"}', encoding="utf-8")
+    parsed = []
+    monkeypatch.setattr(parse_clean_cards, "_load_json",
+                        lambda text: parsed.append(text) or parse_clean_cards.json.loads(text))
+    stats = update_cleaned_data(str(cards), output)
+    assert parsed == ['{"name": "c"}']
+    assert (stats["added"], stats["unchanged"]) == (1, 2)
+    assert pd.read_csv(output)["title"].tolist() == ["a", "c"]
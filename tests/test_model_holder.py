@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+from src.config.model_config import ENCODER_PATHS, FEATURE_COLUMNS, MODEL_PATH, SCALER_PATH
+from src.models.fused_model import SCALED_COLUMNS, export_fused_model
+from src.models.model_holder import BundleValidationError, estimate_memory, load_bundle, publish_bundle_manifest
+from src.models.registry import publish_artifact, registry
+
+CLASSES = {
+    "Transaction": ["New Property", "Resale"],
+    "Furnishing": ["Furnished", "Semi-Furnished", "Unfurnished"],
+    "Possession_Status": ["Ready to Move", "Under Construction"],
+}
+
+
+def _publish(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.random((200, len(FEATURE_COLUMNS)))
+    scaler = MinMaxScaler().fit(X[:, SCALED_COLUMNS])
+    model = LinearRegression().fit(X, rng.random(200))
+    publish_artifact(model, MODEL_PATH)
+    publish_artifact(scaler, SCALER_PATH)
+    for col, path in ENCODER_PATHS.items():
+        publish_artifact(LabelEncoder().fit(CLASSES[col]), path)
+    export_fused_model(model, scaler)
+    return model
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry.clear()
+    yield tmp_path
+    registry.clear()
+
+
+def test_bundle_carries_manifest_version(artifact_dir):
+    _publish(0)
+    manifest = publish_bundle_manifest()
+    bundle = load_bundle()
+    assert bundle.version == manifest["version"]
+    assert bundle.fused is not None
+
+
+def test_half_published_bundle_is_rejected(artifact_dir):
+    _publish(0)
+    publish_bundle_manifest()
+    # a trainer has replaced the model but not yet the manifest
+    publish_artifact(LinearRegression().fit(np.eye(len(FEATURE_COLUMNS)), np.arange(len(FEATURE_COLUMNS))),
+                     MODEL_PATH)
+    with pytest.raises(BundleValidationError):
+        load_bundle()
+
+    _publish(1)
+    manifest = publish_bundle_manifest()
+    assert load_bundle().version == manifest["version"]
+
+
+def test_estimate_memory_sums_array_bytes():
+    model = LinearRegression().fit(np.random.default_rng(0).random((50, 9)), np.arange(50))
+    assert estimate_memory(model) >= model.coef_.nbytes
+    assert estimate_memory(model, model) == estimate_memory(model)
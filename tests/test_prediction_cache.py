@@ -0,0 +1,40 @@
+import sqlite3
+from src.models.prediction_cache import PredictionCache, SQLiteCacheBackend
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+def test_sqlite_backend_is_bounded(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = PredictionCache(maxsize=10, backend=SQLiteCacheBackend(path, 3600, max_rows=50, prune_every=10))
+    for i in range(500):
+        cache.put("v1", ("Resale", i), float(i))
+    assert _rows(path) <= 50 + 10
+    assert cache.get("v1", ("Resale", 499)) == 499.0
+
+
+def test_prune_drops_expired_and_old_versions(tmp_path):
+    path = str(tmp_path / "cache.db")
+    backend = SQLiteCacheBackend(path, 3600, prune_every=1000)
+    for i in range(20):
+        backend.put(f"old-{i}", 1.0, "v1")
+    expired = SQLiteCacheBackend(path, -1)
+    for i in range(5):
+        expired.put(f"expired-{i}", 1.0, "v2")
+    backend.put("current", 2.0, "v2")
+
+    assert backend.prune("v2") == 25
+    assert _rows(path) == 1
+    assert backend.get("current") == 2.0
+
+
+def test_legacy_table_is_rebuilt(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE predictions (key TEXT PRIMARY KEY, value REAL NOT NULL, expires_at REAL NOT NULL)")
+    backend = SQLiteCacheBackend(path, 3600)
+    backend.put("k", 1.0, "v1")
+    assert backend.get("k") == 1.0
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+from src.config.model_config import FEATURE_COLUMNS
+from src.ml_pipeline.normalize import TARGET_COLUMN
+from src.ml_pipeline.processed_data import load_training_data
+from src.models.backends import make_regressor
+from tests.conftest import CLEAN_DF_CSV
+
+COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+
+
+def test_parquet_matches_csv_contract(parquet_dataset):
+    csv = load_training_data(CLEAN_DF_CSV, columns=COLUMNS)
+    parquet = load_training_data(parquet_dataset, columns=COLUMNS)
+
+    assert list(parquet.columns) == COLUMNS
+    assert parquet.dtypes.to_dict() == csv[COLUMNS].dtypes.to_dict()
+    assert not parquet.isna().any().any()
+    assert (parquet["Total Area"] > 0).all()
+
+
+@pytest.mark.parametrize("backend", ["linear", "ensemble"])
+def test_backends_fit_on_parquet(parquet_dataset, backend):
+    df = load_training_data(parquet_dataset, columns=COLUMNS)
+    X_train, X_test, y_train, y_test = train_test_split(df[FEATURE_COLUMNS], df[TARGET_COLUMN],
+                                                        test_size=0.2, random_state=42)
+    model = make_regressor(backend)
+    model.fit(X_train, y_train)
+    assert pd.Series(model.predict(X_test)).notna().all()
+
+
+def test_train_model_end_to_end_on_parquet(parquet_dataset, tmp_path, monkeypatch):
+    pytest.importorskip("mlflow")
+    from src.models.train_model import train_model
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "artifacts" / "model").mkdir(parents=True)
+    train_model(parquet_dataset, str(tmp_path / "artifacts" / "model" / "model.pkl"), backend="linear")
+    assert (tmp_path / "artifacts" / "model" / "model.pkl").exists()
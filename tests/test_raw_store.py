@@ -0,0 +1,62 @@
+import json
+import os
+import pytest
+from src.scraping.raw_store import INDEX_FILE, RawCardStore, migrate_card_dirs
+
+
+def _card(n):
+    url = f"https://www.magicbricks.com/propertyDetails/{n}-BHK&id=4d42{n:04d}"
+    return f'<div class="mb-srp__card"><script type="application/ld+json">{{"url": "{url}"}}</script>{n}</div>'
+
+
+def _write_store(root, count):
+    with RawCardStore(root, block_kb=1) as store:
+        return [store.append_card(_card(n)) for n in range(count)]
+
+
+def test_reader_ignores_torn_tail_without_truncating(tmp_path):
+    root = str(tmp_path / "store")
+    ids = _write_store(root, 20)
+    index_path = os.path.join(root, INDEX_FILE)
+    with open(index_path, "ab") as f:
+        f.write(b"torn\t0\t")
+    size = os.path.getsize(index_path)
+
+    reader = RawCardStore(root)
+    assert len(reader) == 20
+    assert [r["id"] for r in reader] == ids
+    assert os.path.getsize(index_path) == size
+
+    with RawCardStore(root) as writer:
+        writer.append_card(_card(99))
+    assert len(RawCardStore(root)) == 21
+
+
+def test_second_writer_is_refused(tmp_path):
+    pytest.importorskip("fcntl")
+    root = str(tmp_path / "store")
+    with RawCardStore(root, block_kb=1) as first:
+        first.append_card(_card(1))
+        first.flush()
+        second = RawCardStore(root)
+        second.append_card(_card(2))
+        with pytest.raises(RuntimeError):
+            second.flush()
+
+
+def test_migrate_removes_only_verified_files(tmp_path):
+    html_dir, json_dir = tmp_path / "html", tmp_path / "json"
+    html_dir.mkdir()
+    json_dir.mkdir()
+    for n in range(3):
+        (html_dir / f"card_{n}.html").write_text(_card(n), encoding="utf-8")
+        (json_dir / f"card_{n}.json").write_text(json.dumps({"url": f"id={n}"}), encoding="utf-8")
+    (json_dir / "card_1.json").write_text("{not json", encoding="utf-8")
+    (json_dir / "card_7.json").write_text(json.dumps({"url": "id=7"}), encoding="utf-8")
+
+    with RawCardStore(str(tmp_path / "store")) as store:
+        stats = migrate_card_dirs(str(html_dir), str(json_dir), store, remove=True)
+
+    assert stats["cards"] == 4 and stats["bad_json"] == 1 and stats["json_only"] == 1
+    assert sorted(os.listdir(json_dir)) == ["card_1.json"]
+    assert os.listdir(html_dir) == []
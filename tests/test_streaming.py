@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from src.scraping.streaming import Checkpoint, make_writer, write_in_batches
+
+
+def _items(start, stop):
+    return ((f"card_{n:05d}.html", {"n": n, "title": f"{n} BHK"}) for n in range(start, stop))
+
+
+class Crash(Exception):
+    pass
+
+
+def _crash_after_write(items, writer, checkpoint, batch_size):
+    # the batch reaches the output, then the process dies before its checkpoint is saved
+    original = checkpoint.save
+
+    def save(*args):
+        if checkpoint.records >= batch_size:
+            raise Crash
+        original(*args)
+
+    checkpoint.save = save
+    with pytest.raises(Crash):
+        write_in_batches(items, writer, checkpoint, batch_size)
+
+
+@pytest.mark.parametrize("name", ["cards.csv", "cards.parquet"])
+def test_resume_after_crash_does_not_duplicate(tmp_path, name):
+    path = str(tmp_path / name)
+    checkpoint_path = f"{path}.checkpoint.json"
+    _crash_after_write(_items(0, 10), make_writer(path), Checkpoint(checkpoint_path), batch_size=4)
+
+    checkpoint = Checkpoint(checkpoint_path)
+    assert checkpoint.last_file == "card_00003.html"
+    resumed = (item for item in _items(0, 10) if item[0] > checkpoint.last_file)
+    write_in_batches(resumed, make_writer(path), checkpoint, batch_size=4)
+
+    df = pd.read_csv(path) if name.endswith(".csv") else pd.read_parquet(path)
+    assert sorted(df["n"].astype(int)) == list(range(10))
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+from src.models.tuning import prune_cache, tune_ensemble
+
+
+def _rows(n=60):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, (n, 3))
+    return X, X @ [3.0, 1.0, 2.0] + rng.normal(0, 0.1, n)
+
+
+def _cache_bytes(root):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+
+
+def test_fit_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _rows()
+    tune_ensemble(X, y, strategy="none", n_jobs=1)
+    assert os.listdir(tmp_path) == []
+
+
+def test_fit_cache_is_pruned(tmp_path):
+    X, y = _rows()
+    cache = str(tmp_path / "tuning")
+    tune_ensemble(X, y, strategy="random", n_jobs=1, budget=2, cache_dir=cache)
+    assert _cache_bytes(cache) > 0
+
+    prune_cache(cache, max_bytes=1)
+    assert _cache_bytes(cache) < 4096